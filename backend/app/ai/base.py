@@ -1,14 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Optional
+import asyncio
+from typing import Any, AsyncIterator, Optional, Sequence
 
 from app.models.cv import CVProfile
 from app.models.interview import Question, Answer, InterviewMode, Difficulty
-from app.models.results import AnswerScore, InterviewResults
+from app.models.results import AnswerScore, InterviewResults, ScoreSummary, narrative_fields
 
 
 class AIProvider(ABC):
     """Abstract base class for all AI provider implementations."""
 
+    @property
+    def model_id(self) -> str:
+        """Identifies the vendor and model; used to key cached AI outputs."""
+        return type(self).__name__
+
     @abstractmethod
     async def extract_cv_profile(self, raw_text: str) -> CVProfile:
         """Parse raw CV text into a structured CVProfile."""
@@ -21,10 +27,34 @@ class AIProvider(ABC):
         mode: InterviewMode,
         difficulty: Difficulty,
         count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
     ) -> list[Question]:
-        """Generate a personalised question bank for the interview."""
+        """Generate a personalised question bank for the interview.
+
+        `focus` narrows the set (e.g. a category or some of the candidate's
+        skills); `avoid` holds questions already chosen that must not be
+        repeated or closely paraphrased.
+        """
         ...
 
+    async def stream_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> AsyncIterator[Question]:
+        """Yield questions one by one as soon as each is available.
+
+        Providers that support token streaming override this; the default
+        falls back to waiting for the full set.
+        """
+        for question in await self.generate_questions(cv_profile, mode, difficulty, count, focus, avoid):
+            yield question
+
     @abstractmethod
     async def evaluate_answer(
         self,
@@ -32,17 +62,59 @@ class AIProvider(ABC):
         answer: Answer,
         mode: InterviewMode,
         cv_profile: CVProfile,
+        difficulty: Difficulty,
     ) -> AnswerScore:
         """Score a single answer and return structured feedback."""
         ...
 
+    async def evaluate_answers(
+        self,
+        pairs: list[tuple[Question, Answer]],
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> dict[str, AnswerScore]:
+        """Score several answers of one session, keyed by question_id.
+
+        Batching providers override this with a single call and may return
+        only the entries that came back well-formed; the caller re-scores any
+        that are missing. The default scores each answer separately.
+        """
+        scores = await asyncio.gather(
+            *(self.evaluate_answer(question, answer, mode, cv_profile, difficulty) for question, answer in pairs)
+        )
+        return {score.question_id: score for score in scores}
+
     @abstractmethod
     async def generate_overall_feedback(
         self,
         answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
         cv_profile: CVProfile,
         mode: InterviewMode,
         session_id: str,
     ) -> InterviewResults:
-        """Aggregate all answer scores into a complete InterviewResults report."""
+        """Write the report's narrative around the already computed `scores`."""
+        ...
+
+    async def stream_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        """Yield each (field, value) of the feedback narrative as soon as it is complete.
+
+        The fields are NARRATIVE_FIELDS. Providers that support token
+        streaming override this; the default waits for the full report.
+        """
+        results = await self.generate_overall_feedback(answer_scores, scores, cv_profile, mode, session_id)
+        for field, value in narrative_fields(results):
+            yield field, value
+
+    @abstractmethod
+    async def generate_coaching_overview(self, sessions_data: list[dict], candidate_name: str) -> str:
+        """Write the dashboard coaching narrative from a user's recent session summaries."""
         ...
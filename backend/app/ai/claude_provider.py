@@ -1,13 +1,52 @@
 import json
+from functools import partial
+from typing import Any, AsyncIterator, Optional, Sequence
+
 import anthropic
 
 from app.ai.base import AIProvider
+from app.ai.batch import BatchBackend, BatchRequest, BatchStatus
+from app.ai.usage import record_usage
+from app.ai.structured import (
+    ANSWER_SCORE,
+    ANSWER_SCORES,
+    COACHING_OVERVIEW,
+    CV_PROFILE,
+    OVERALL_FEEDBACK,
+    QUESTIONS,
+    OutputSpec,
+    StructuredOutputError,
+    answer_score_from_output,
+    coaching_from_data,
+    collect_questions,
+    cv_profile_from_data,
+    evaluations_from_data,
+    questions_from_data,
+    results_from_data,
+    retry_invalid,
+    stream_feedback_fields,
+    stream_question_items,
+)
 from app.config import get_settings
-from app.models.cv import CVProfile, WorkExperience, Education
+from app.models.cv import CVProfile
 from app.models.interview import Question, Answer, InterviewMode, Difficulty
-from app.models.results import AnswerScore, InterviewResults, CategoryScore, Resource, score_to_grade
-from app.prompts.question_prompts import build_question_prompt, build_evaluation_prompt
-from app.prompts.evaluation_prompts import build_overall_feedback_prompt, build_cv_extraction_prompt
+from app.models.results import AnswerScore, InterviewResults, ScoreSummary, answer_scores_from_batch
+from app.prompts.base import Prompt
+from app.prompts.question_prompts import (
+    build_question_prompt,
+    build_evaluation_prompt,
+    build_batch_evaluation_prompt,
+)
+from app.prompts.evaluation_prompts import (
+    build_overall_feedback_prompt,
+    build_cv_extraction_prompt,
+    build_overview_prompt,
+)
+
+# Anthropic only caches a prefix (tools + system) of at least this many tokens
+# (2048 for Haiku models); below it a cache_control marker does nothing
+_MIN_CACHEABLE_TOKENS = 1024
+_CHARS_PER_TOKEN = 4  # rough, and on the low side for prose and JSON schemas
 
 
 class ClaudeProvider(AIProvider):
@@ -16,27 +55,88 @@ class ClaudeProvider(AIProvider):
         self._client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
         self._model = settings.claude_model
 
-    async def _chat(self, prompt: str, max_tokens: int = 4096) -> str:
-        message = await self._client.messages.create(
+    @property
+    def model_id(self) -> str:
+        return f"claude:{self._model}"
+
+    @staticmethod
+    def _request(prompt: Prompt, spec: Optional[OutputSpec] = None) -> dict:
+        """Request body for `prompt`, forced to reply through `spec`'s tool if given.
+
+        The tools and system prompt form a static prefix. It is marked as a
+        cache breakpoint only when it is long enough to be cached, which in
+        practice means the evaluation prompts with their shared rubric; the
+        other prompts are short and are sent uncached.
+        anthropic==0.40 only accepts cache_control on the prompt-caching beta
+        client, which is why the calls below go through it.
+        """
+        system = {"type": "text", "text": prompt.system}
+        request: dict[str, Any] = {
+            "system": [system],
+            "messages": [{"role": "user", "content": prompt.user}],
+        }
+        prefix_chars = len(prompt.system)
+        if spec is not None:
+            # Forcing the single tool makes the reply a schema-shaped tool input
+            # instead of free text that has to be parsed
+            request["tools"] = [{"name": spec.name, "description": spec.description, "input_schema": spec.schema}]
+            request["tool_choice"] = {"type": "tool", "name": spec.name}
+            prefix_chars += len(spec.description) + len(json.dumps(spec.schema))
+        if prefix_chars / _CHARS_PER_TOKEN >= _MIN_CACHEABLE_TOKENS:
+            system["cache_control"] = {"type": "ephemeral"}
+        return request
+
+    @staticmethod
+    def _record_usage(call: str, usage) -> None:
+        cache_read = usage.cache_read_input_tokens or 0
+        cache_write = usage.cache_creation_input_tokens or 0
+        record_usage(
+            call,
+            usage.input_tokens + cache_read + cache_write,
+            usage.output_tokens,
+            cached_input_tokens=cache_read,
+            cache_write_tokens=cache_write,
+        )
+
+    async def _structured(
+        self, prompt: Prompt, spec: OutputSpec, max_tokens: int = 4096, call: str = "chat"
+    ) -> Any:
+        message = await self._client.beta.prompt_caching.messages.create(
             model=self._model,
             max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
+            **self._request(prompt, spec),
         )
-        return message.content[0].text
+        self._record_usage(call, message.usage)
+        if message.stop_reason == "max_tokens":
+            raise StructuredOutputError(f"{call} output was truncated at {max_tokens} tokens")
+        for block in message.content:
+            if block.type == "tool_use":
+                return block.input
+        raise StructuredOutputError(f"{call} output did not use {spec.name}")
+
+    async def _structured_stream(
+        self, prompt: Prompt, spec: OutputSpec, max_tokens: int = 4096, call: str = "chat"
+    ) -> AsyncIterator[str]:
+        """Yield the tool input's JSON text as it is generated."""
+        async with self._client.beta.prompt_caching.messages.stream(
+            model=self._model,
+            max_tokens=max_tokens,
+            **self._request(prompt, spec),
+        ) as stream:
+            async for event in stream:
+                if event.type == "content_block_delta" and event.delta.type == "input_json_delta":
+                    yield event.delta.partial_json
+            message = await stream.get_final_message()
+            self._record_usage(call, message.usage)
 
     async def extract_cv_profile(self, raw_text: str) -> CVProfile:
         prompt = build_cv_extraction_prompt(raw_text)
-        response = await self._chat(prompt)
-        data = json.loads(response.strip())
-        return CVProfile(
-            name=data.get("name", "Candidate"),
-            current_role=data.get("current_role", ""),
-            years_of_experience=float(data.get("years_of_experience", 0)),
-            skills=data.get("skills", []),
-            work_experience=[WorkExperience(**e) for e in data.get("work_experience", [])],
-            education=[Education(**e) for e in data.get("education", [])],
-            raw_text=raw_text,
-        )
+
+        async def attempt() -> CVProfile:
+            data = await self._structured(prompt, CV_PROFILE, call="extract_cv_profile")
+            return cv_profile_from_data(data, raw_text)
+
+        return await retry_invalid("extract_cv_profile", attempt)
 
     async def generate_questions(
         self,
@@ -44,18 +144,29 @@ class ClaudeProvider(AIProvider):
         mode: InterviewMode,
         difficulty: Difficulty,
         count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
     ) -> list[Question]:
-        prompt = build_question_prompt(cv_profile, mode, difficulty, count)
-        response = await self._chat(prompt)
-        items = json.loads(response.strip())
-        return [
-            Question(
-                text=item["text"],
-                category=item.get("category", "General"),
-                follow_up_hint=item.get("follow_up_hint"),
-            )
-            for item in items
-        ]
+        async def fetch(missing: int) -> list[Question]:
+            prompt = build_question_prompt(cv_profile, mode, difficulty, missing, focus, avoid)
+            return questions_from_data(await self._structured(prompt, QUESTIONS, call="generate_questions"))
+
+        return await collect_questions(count, fetch)
+
+    async def stream_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> AsyncIterator[Question]:
+        prompt = build_question_prompt(cv_profile, mode, difficulty, count, focus, avoid)
+        chunks = self._structured_stream(prompt, QUESTIONS, call="generate_questions")
+        top_up = partial(self.generate_questions, cv_profile, mode, difficulty, focus=focus, avoid=avoid)
+        async for question in stream_question_items(chunks, count, top_up):
+            yield question
 
     async def evaluate_answer(
         self,
@@ -63,6 +174,7 @@ class ClaudeProvider(AIProvider):
         answer: Answer,
         mode: InterviewMode,
         cv_profile: CVProfile,
+        difficulty: Difficulty,
     ) -> AnswerScore:
         prompt = build_evaluation_prompt(
             question_text=question.text,
@@ -70,38 +182,113 @@ class ClaudeProvider(AIProvider):
             category=question.category,
             mode=mode,
             candidate_name=cv_profile.name,
-        )
-        response = await self._chat(prompt)
-        data = json.loads(response.strip())
-        return AnswerScore(
-            question_id=question.question_id,
-            question_text=question.text,
-            transcript=answer.transcript,
-            score=int(data["score"]),
-            feedback=data["feedback"],
-            strengths=data.get("strengths", []),
-            improvements=data.get("improvements", []),
+            difficulty=difficulty,
         )
 
+        async def attempt() -> AnswerScore:
+            data = await self._structured(prompt, ANSWER_SCORE, call="evaluate_answer")
+            return answer_score_from_output(question, answer, data)
+
+        return await retry_invalid("evaluate_answer", attempt)
+
+    async def evaluate_answers(
+        self,
+        pairs: list[tuple[Question, Answer]],
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> dict[str, AnswerScore]:
+        prompt = build_batch_evaluation_prompt(pairs, mode, cv_profile.name, difficulty)
+        try:
+            data = await self._structured(
+                prompt, ANSWER_SCORES, max_tokens=1024 + 400 * len(pairs), call="evaluate_answers"
+            )
+        except StructuredOutputError:
+            return {}  # the caller re-scores every missing answer on its own
+        return answer_scores_from_batch(pairs, evaluations_from_data(data))
+
     async def generate_overall_feedback(
         self,
         answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
         cv_profile: CVProfile,
         mode: InterviewMode,
         session_id: str,
     ) -> InterviewResults:
-        prompt = build_overall_feedback_prompt(answer_scores, cv_profile, mode)
-        response = await self._chat(prompt, max_tokens=2048)
-        data = json.loads(response.strip())
-        overall_score = int(data.get("overall_score", 0))
-        return InterviewResults(
-            session_id=session_id,
-            overall_score=overall_score,
-            grade=data.get("grade", score_to_grade(overall_score)),
-            category_scores=[CategoryScore(**c) for c in data.get("category_scores", [])],
-            answer_reviews=answer_scores,
-            top_strengths=data.get("top_strengths", []),
-            top_improvements=data.get("top_improvements", []),
-            recommended_resources=[Resource(**r) for r in data.get("recommended_resources", [])],
-            summary=data.get("summary", ""),
+        prompt = build_overall_feedback_prompt(answer_scores, scores, cv_profile, mode)
+
+        async def attempt() -> InterviewResults:
+            data = await self._structured(prompt, OVERALL_FEEDBACK, max_tokens=1024, call="generate_overall_feedback")
+            return results_from_data(session_id, answer_scores, scores, data)
+
+        return await retry_invalid("generate_overall_feedback", attempt)
+
+    async def stream_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        prompt = build_overall_feedback_prompt(answer_scores, scores, cv_profile, mode)
+        chunks = self._structured_stream(prompt, OVERALL_FEEDBACK, max_tokens=1024, call="generate_overall_feedback")
+        regenerate = partial(self.generate_overall_feedback, answer_scores, scores, cv_profile, mode, session_id)
+        async for field in stream_feedback_fields(chunks, session_id, answer_scores, scores, regenerate):
+            yield field
+
+    async def generate_coaching_overview(self, sessions_data: list[dict], candidate_name: str) -> str:
+        prompt = build_overview_prompt(sessions_data, candidate_name)
+
+        async def attempt() -> str:
+            data = await self._structured(prompt, COACHING_OVERVIEW, max_tokens=512, call="generate_coaching_overview")
+            return coaching_from_data(data)
+
+        return await retry_invalid("generate_coaching_overview", attempt)
+
+
+class ClaudeBatchBackend(BatchBackend):
+    """Anthropic Message Batches: results within 24 hours at half the token price."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._client = anthropic.AsyncAnthropic(api_key=settings.anthropic_api_key)
+        self._model = settings.claude_model
+
+    @property
+    def model_id(self) -> str:
+        return f"claude:{self._model}"
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        batch = await self._client.beta.messages.batches.create(
+            requests=[
+                {
+                    "custom_id": request.custom_id,
+                    "params": {
+                        "model": self._model,
+                        "max_tokens": request.max_tokens,
+                        **ClaudeProvider._request(request.prompt),
+                    },
+                }
+                for request in requests
+            ],
+            betas=["prompt-caching-2024-07-31"],
         )
+        return batch.id
+
+    async def status(self, batch_id: str) -> BatchStatus:
+        try:
+            batch = await self._client.beta.messages.batches.retrieve(batch_id)
+        except anthropic.NotFoundError:
+            return BatchStatus.EXPIRED
+        # Requests that expired inside an ended batch are simply missing from its results
+        return BatchStatus.ENDED if batch.processing_status == "ended" else BatchStatus.IN_PROGRESS
+
+    async def results(self, batch_id: str, call: str) -> dict[str, str]:
+        texts = {}
+        async for entry in await self._client.beta.messages.batches.results(batch_id):
+            if entry.result.type == "succeeded":
+                message = entry.result.message
+                ClaudeProvider._record_usage(call, message.usage)
+                texts[entry.custom_id] = message.content[0].text
+        return texts
@@ -0,0 +1,298 @@
+import asyncio
+import math
+import time
+from collections import defaultdict, deque
+from typing import Any, AsyncIterator, Awaitable, Callable, Optional, Sequence, TypeVar
+
+from app.ai.base import AIProvider
+from app.config import get_settings
+from app.models.cv import CVProfile
+from app.models.interview import Question, Answer, InterviewMode, Difficulty
+from app.models.results import AnswerScore, InterviewResults, ScoreSummary
+from app.services.metrics import get_metrics
+
+T = TypeVar("T")
+
+# Successful calls needed before a member's own latency percentile is used as
+# the hedge delay, and how many recent calls that percentile is taken over
+_MIN_LATENCY_SAMPLES = 20
+_LATENCY_WINDOW = 200
+
+_END = object()  # first item of a stream that produced nothing
+
+
+class CircuitBreaker:
+    """Consecutive-failure circuit breaker.
+
+    Opens after `threshold` failures in a row. Once `reset_seconds` have
+    passed, a single trial call is let through: success closes the breaker,
+    failure re-opens it for another `reset_seconds`.
+    """
+
+    def __init__(self, name: str, threshold: int, reset_seconds: float):
+        self._name = name
+        self._threshold = threshold
+        self._reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_in_flight = False
+
+    def ready(self) -> bool:
+        """Whether `allow()` would let a call through now; claims nothing."""
+        if self._opened_at is None:
+            return True
+        return not self._trial_in_flight and time.monotonic() - self._opened_at >= self._reset_seconds
+
+    def allow(self) -> bool:
+        """Let a call through, claiming the single trial if the breaker is half-open.
+
+        Only call this for a call that is about to be made: a claimed trial is
+        released by that call's success, failure or `release()`.
+        """
+        if not self.ready():
+            return False
+        if self._opened_at is not None:
+            self._trial_in_flight = True
+        return True
+
+    def success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_in_flight = False
+        get_metrics().set_gauge(f"ai_composite.breaker_open.{self._name}", 0)
+
+    def failure(self) -> None:
+        self._failures += 1
+        self._trial_in_flight = False
+        if self._failures >= self._threshold:
+            if self._opened_at is None:
+                get_metrics().incr(f"ai_composite.breaker_trips.{self._name}")
+            self._opened_at = time.monotonic()
+            get_metrics().set_gauge(f"ai_composite.breaker_open.{self._name}", 1)
+
+    def release(self) -> None:
+        """The call was cancelled (e.g. lost a hedge race); it proves nothing either way."""
+        self._trial_in_flight = False
+
+
+class _Member:
+    def __init__(self, name: str, provider: AIProvider, breaker: CircuitBreaker):
+        self.name = name
+        self.provider = provider
+        self.breaker = breaker
+        self.latencies: dict[str, deque[float]] = defaultdict(lambda: deque(maxlen=_LATENCY_WINDOW))
+
+
+class CompositeProvider(AIProvider):
+    """Hedges and fails over across several providers, the first being the primary.
+
+    Each call goes to the first member whose circuit breaker is closed. If it
+    has not answered after its own `hedge_percentile` latency for that method
+    (or `initial_hedge_delay` until enough calls have been seen), the same call
+    is also sent to the next member; whichever succeeds first wins and the
+    other is cancelled. A member that fails outright is failed over to
+    immediately. Streaming calls are raced on their first item, then continue
+    with the winner.
+    """
+
+    def __init__(
+        self,
+        members: list[tuple[str, AIProvider]],
+        hedge_percentile: float,
+        initial_hedge_delay: float,
+        breaker_threshold: int,
+        breaker_reset_seconds: float,
+    ):
+        self._members = [
+            _Member(name, provider, CircuitBreaker(name, breaker_threshold, breaker_reset_seconds))
+            for name, provider in members
+        ]
+        self._hedge_percentile = hedge_percentile
+        self._initial_hedge_delay = initial_hedge_delay
+        self._metrics = get_metrics()
+
+    @property
+    def model_id(self) -> str:
+        return "composite:" + "+".join(m.provider.model_id for m in self._members)
+
+    # ── Racing ────────────────────────────────────────────────────────────────
+
+    def _available(self) -> list[_Member]:
+        available = [m for m in self._members if m.breaker.ready()]
+        # With every breaker open, keep trying the primary rather than failing fast
+        return available or self._members[:1]
+
+    def _hedge_delay(self, member: _Member, method: str) -> float:
+        samples = sorted(member.latencies[method])
+        if len(samples) < _MIN_LATENCY_SAMPLES:
+            return self._initial_hedge_delay
+        index = min(len(samples) - 1, math.ceil(self._hedge_percentile / 100 * len(samples)) - 1)
+        return samples[max(index, 0)]
+
+    async def _timed(self, member: _Member, method: str, call: Awaitable[T]) -> T:
+        start = time.perf_counter()
+        try:
+            result = await call
+        except asyncio.CancelledError:
+            member.breaker.release()
+            raise
+        except Exception:
+            member.breaker.failure()
+            raise
+        member.breaker.success()
+        member.latencies[method].append(time.perf_counter() - start)
+        return result
+
+    async def _race(self, method: str, start: Callable[[_Member], Awaitable[T]]) -> tuple[_Member, T]:
+        """Run `start(member)` on the primary, hedging or failing over to the next member."""
+        primary, *backups = self._available()
+        tasks: dict[asyncio.Task, _Member] = {}
+
+        def launch(member: _Member) -> None:
+            # Breakers are only claimed here, for a call actually being made;
+            # the fallback primary goes ahead even if its breaker is open
+            member.breaker.allow()
+            tasks[asyncio.create_task(self._timed(member, method, start(member)))] = member
+
+        def launch_backup(metric: str) -> None:
+            # The backups' state may have changed while the primary ran
+            backup = next((m for m in backups if m.breaker.allow()), None)
+            if backup is not None:
+                self._metrics.incr(f"ai_composite.{metric}.{method}")
+                tasks[asyncio.create_task(self._timed(backup, method, start(backup)))] = backup
+
+        launch(primary)
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self._hedge_delay(primary, method) if backups else None)
+            if backups and not done:
+                launch_backup("hedges")
+            elif backups and next(iter(done)).exception() is not None:
+                launch_backup("failovers")
+
+            pending = set(tasks)
+            error: Optional[BaseException] = None
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        winner = tasks[task]
+                        self._metrics.incr(f"ai_composite.wins.{winner.name}")
+                        return winner, task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            losers = [task for task in tasks if not task.done()]
+            for task in losers:
+                task.cancel()
+            await asyncio.gather(*losers, return_exceptions=True)
+
+    async def _call(self, method: str, *args: Any) -> Any:
+        _, result = await self._race(method, lambda member: getattr(member.provider, method)(*args))
+        return result
+
+    async def _stream(self, method: str, *args: Any) -> AsyncIterator[Any]:
+        streams: dict[_Member, AsyncIterator[Any]] = {}
+
+        def start(member: _Member) -> Awaitable[Any]:
+            streams[member] = getattr(member.provider, method)(*args)
+            return anext(streams[member], _END)
+
+        try:
+            winner, first = await self._race(method, start)
+            if first is _END:
+                return
+            yield first
+            try:
+                async for item in streams[winner]:
+                    yield item
+            except Exception:
+                # The race only saw the first item succeed
+                winner.breaker.failure()
+                raise
+        finally:
+            for stream in streams.values():
+                await stream.aclose()
+
+    # ── Provider API ──────────────────────────────────────────────────────────
+
+    async def extract_cv_profile(self, raw_text: str) -> CVProfile:
+        return await self._call("extract_cv_profile", raw_text)
+
+    async def generate_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> list[Question]:
+        return await self._call("generate_questions", cv_profile, mode, difficulty, count, focus, avoid)
+
+    async def stream_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> AsyncIterator[Question]:
+        async for question in self._stream("stream_questions", cv_profile, mode, difficulty, count, focus, avoid):
+            yield question
+
+    async def evaluate_answer(
+        self,
+        question: Question,
+        answer: Answer,
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> AnswerScore:
+        return await self._call("evaluate_answer", question, answer, mode, cv_profile, difficulty)
+
+    async def evaluate_answers(
+        self,
+        pairs: list[tuple[Question, Answer]],
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> dict[str, AnswerScore]:
+        return await self._call("evaluate_answers", pairs, mode, cv_profile, difficulty)
+
+    async def generate_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> InterviewResults:
+        return await self._call("generate_overall_feedback", answer_scores, scores, cv_profile, mode, session_id)
+
+    async def stream_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        async for field in self._stream(
+            "stream_overall_feedback", answer_scores, scores, cv_profile, mode, session_id
+        ):
+            yield field
+
+    async def generate_coaching_overview(self, sessions_data: list[dict], candidate_name: str) -> str:
+        return await self._call("generate_coaching_overview", sessions_data, candidate_name)
+
+
+def create_composite(members: list[tuple[str, AIProvider]]) -> CompositeProvider:
+    settings = get_settings()
+    return CompositeProvider(
+        members,
+        hedge_percentile=settings.ai_hedge_percentile,
+        initial_hedge_delay=settings.ai_hedge_initial_delay_seconds,
+        breaker_threshold=settings.ai_breaker_failure_threshold,
+        breaker_reset_seconds=settings.ai_breaker_reset_seconds,
+    )
@@ -1,18 +1,32 @@
 from functools import lru_cache
 from app.ai.base import AIProvider
+from app.ai.scheduler import with_scheduler
 from app.config import get_settings
 
 
-@lru_cache(maxsize=1)
-def get_ai_provider() -> AIProvider:
-    settings = get_settings()
-    provider = settings.ai_provider.lower()
-
-    if provider == "claude":
+def _create_provider(name: str) -> AIProvider:
+    if name == "claude":
         from app.ai.claude_provider import ClaudeProvider
         return ClaudeProvider()
-    elif provider == "openai":
+    elif name == "openai":
         from app.ai.openai_provider import OpenAIProvider
         return OpenAIProvider()
+    elif name == "mock":
+        from app.ai.mock_provider import MockProvider
+        return MockProvider()
     else:
-        raise ValueError(f"Unknown AI_PROVIDER: {provider!r}. Must be 'claude' or 'openai'.")
+        raise ValueError(f"Unknown AI_PROVIDER: {name!r}. Must be 'claude', 'openai' or 'mock'.")
+
+
+@lru_cache(maxsize=1)
+def get_ai_provider() -> AIProvider:
+    settings = get_settings()
+    name = settings.ai_provider.lower()
+    # Every call is admitted by priority within the rate limits (app/ai/scheduler.py);
+    # composite members each get their own scheduler, as each vendor has its own limits
+    if name == "composite":
+        from app.ai.composite import create_composite
+        return create_composite(
+            [(member, with_scheduler(_create_provider(member))) for member in settings.ai_composite_providers]
+        )
+    return with_scheduler(_create_provider(name))
@@ -0,0 +1,150 @@
+import json
+from typing import Iterator
+
+
+class JSONArrayStreamParser:
+    """Incrementally parse a streamed JSON array of objects.
+
+    Feed text chunks as they arrive from the provider; every top-level object
+    in the array is returned as soon as its closing brace has been seen.
+    Anything before the opening ``[`` (e.g. a stray markdown fence) is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._object_start: int | None = None
+
+    def feed(self, chunk: str) -> Iterator[dict]:
+        if self._finished:
+            return
+        self._buffer += chunk
+
+        while self._pos < len(self._buffer):
+            ch = self._buffer[self._pos]
+
+            if not self._started:
+                if ch == "[":
+                    self._started = True
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch in "{[":
+                if self._depth == 0 and ch == "{":
+                    self._object_start = self._pos
+                self._depth += 1
+            elif ch in "}]":
+                if self._depth == 0 and ch == "]":
+                    self._finished = True
+                    self._pos += 1
+                    return
+                self._depth -= 1
+                if self._depth == 0 and self._object_start is not None:
+                    item = json.loads(self._buffer[self._object_start : self._pos + 1])
+                    # Drop consumed text so the buffer stays small on long streams
+                    self._buffer = self._buffer[self._pos + 1 :]
+                    self._pos = 0
+                    self._object_start = None
+                    yield item
+                    continue
+
+            self._pos += 1
+
+    @property
+    def finished(self) -> bool:
+        """True once the closing ``]`` of the array has been consumed."""
+        return self._finished
+
+
+class JSONObjectStreamParser:
+    """Incrementally parse a streamed JSON object, member by member.
+
+    Feed text chunks as they arrive; each top-level ``(key, value)`` pair is
+    returned as soon as its value is complete (i.e. the following ``,`` or the
+    closing ``}`` has been seen). Anything before the opening ``{`` is ignored.
+    """
+
+    def __init__(self):
+        self._buffer = ""
+        self._pos = 0
+        self._started = False
+        self._finished = False
+        self._depth = 0
+        self._in_string = False
+        self._escape = False
+        self._member_start = 0
+        self._key: str | None = None
+        self._value_start: int | None = None
+
+    def feed(self, chunk: str) -> Iterator[tuple[str, object]]:
+        if self._finished:
+            return
+        self._buffer += chunk
+
+        while self._pos < len(self._buffer):
+            ch = self._buffer[self._pos]
+
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                    self._member_start = self._pos + 1
+                self._pos += 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+            elif ch == '"':
+                self._in_string = True
+            elif ch == ":" and self._depth == 1 and self._key is None:
+                self._key = json.loads(self._buffer[self._member_start : self._pos])
+                self._value_start = self._pos + 1
+            elif ch in "{[":
+                self._depth += 1
+            elif ch in "}]" and self._depth > 1:
+                self._depth -= 1
+            elif (ch == "," and self._depth == 1) or ch == "}":
+                member = None
+                if self._key is not None:
+                    value = json.loads(self._buffer[self._value_start : self._pos])
+                    member = (self._key, value)
+                # Drop consumed text so the buffer stays small on long streams
+                self._buffer = self._buffer[self._pos + 1 :]
+                self._pos = 0
+                self._member_start = 0
+                self._key = None
+                self._value_start = None
+                if ch == "}":
+                    self._depth = 0
+                    self._finished = True
+                if member is not None:
+                    yield member
+                if self._finished:
+                    return
+                continue
+
+            self._pos += 1
+
+    @property
+    def finished(self) -> bool:
+        """True once the closing ``}`` of the object has been consumed."""
+        return self._finished
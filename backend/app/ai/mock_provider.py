@@ -0,0 +1,342 @@
+import asyncio
+import hashlib
+import json
+import math
+import random
+import re
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from app.ai.base import AIProvider
+from app.config import get_settings
+from app.models.cv import CVProfile, WorkExperience, Education
+from app.models.interview import Question, Answer, InterviewMode, Difficulty
+from app.models.results import AnswerScore, InterviewResults, Resource, ScoreSummary, narrative_fields
+
+# z-score of the 99th percentile of a standard normal distribution
+_Z_P99 = 2.3263
+
+# Default (p50, p99) latency in seconds per method, roughly matching a hosted
+# frontier model. Override any of them with MOCK_LATENCY, e.g.
+# MOCK_LATENCY='{"evaluate_answer": [1.0, 3.0]}'
+DEFAULT_LATENCY: dict[str, tuple[float, float]] = {
+    "extract_cv_profile": (4.0, 12.0),
+    "generate_questions": (6.0, 18.0),
+    "evaluate_answer": (2.5, 8.0),
+    "evaluate_answers": (6.0, 16.0),
+    "generate_overall_feedback": (5.0, 14.0),
+    "generate_coaching_overview": (2.0, 6.0),
+}
+
+_MODE_CATEGORIES = {
+    "behavioral": ["Behavioral", "Situational"],
+    "technical": ["Technical"],
+    "system_design": ["System Design"],
+    "mixed": ["Behavioral", "Technical", "Situational", "System Design"],
+    "hr": ["HR"],
+}
+
+_QUESTION_TEMPLATES = {
+    "Behavioral": [
+        "Tell me about a time you used {skill} to resolve a disagreement within your team.",
+        "Describe a project at {company} that did not go as planned. What did you do?",
+        "Give an example of when you had to learn {skill} quickly to deliver on a deadline.",
+    ],
+    "Situational": [
+        "Imagine a stakeholder asks you to drop {skill} best practices to ship faster. How do you respond?",
+        "If you joined a team whose {skill} codebase had no tests, what would you do in your first month?",
+    ],
+    "Technical": [
+        "How would you debug a performance regression in a {skill} service?",
+        "Explain the trade-offs you weighed the last time you chose {skill} for a project.",
+        "Walk me through how {skill} handles concurrency and where it can go wrong.",
+    ],
+    "System Design": [
+        "Design a system like the one you built at {company} so it handles 10x today's traffic.",
+        "How would you design a rate limiter for an API that is built on {skill}?",
+    ],
+    "HR": [
+        "Why are you looking to move on from your role as {role}?",
+        "Where do you want your career to be in three years, and how does {skill} fit in?",
+    ],
+}
+
+_KNOWN_SKILLS = {
+    "python": "Python", "sql": "SQL", "react": "React", "typescript": "TypeScript", "aws": "AWS",
+    "docker": "Docker", "kubernetes": "Kubernetes", "go": "Go", "java": "Java", "postgres": "PostgreSQL",
+}
+_FALLBACK_SKILLS = ["Python", "SQL", "communication", "project planning", "testing"]
+_STAR_WORDS = ("situation", "task", "action", "result", "because", "impact", "measured")
+
+
+class MockProviderError(RuntimeError):
+    """Injected failure, raised at the configured error rate."""
+
+
+class MockProvider(AIProvider):
+    """Deterministic stand-in for a real vendor, for load testing and local dev.
+
+    Outputs are derived from a hash of the inputs and `MOCK_SEED`, so the same
+    request always produces the same schema-valid result. Latency and injected
+    errors are drawn from a single seeded RNG, so a run with the same call
+    order is reproducible. Each method's latency follows a lognormal
+    distribution fitted to its configured p50/p99.
+    """
+
+    def __init__(self):
+        settings = get_settings()
+        self._seed = settings.mock_seed
+        self._latency = {**DEFAULT_LATENCY, **settings.mock_latency}
+        self._latency_scale = settings.mock_latency_scale
+        self._error_rate = settings.mock_error_rate
+        self._error_rates = settings.mock_error_rates
+        self._stream = settings.mock_stream
+        self._rng = random.Random(settings.mock_seed)
+
+    @property
+    def model_id(self) -> str:
+        return f"mock:{self._seed}"
+
+    # ── Simulation helpers ────────────────────────────────────────────────────
+
+    def _output_rng(self, method: str, *parts: str) -> random.Random:
+        digest = hashlib.sha256("\x1f".join((str(self._seed), method, *parts)).encode()).digest()
+        return random.Random(int.from_bytes(digest[:8], "big"))
+
+    def _sample_latency(self, method: str) -> float:
+        p50, p99 = self._latency.get(method, DEFAULT_LATENCY["evaluate_answer"])
+        if self._latency_scale <= 0 or p50 <= 0:
+            return 0.0
+        mu = math.log(p50)
+        sigma = max(math.log(max(p99, p50)) - mu, 0.0) / _Z_P99
+        return self._rng.lognormvariate(mu, sigma) * self._latency_scale
+
+    def _maybe_fail(self, method: str) -> None:
+        rate = self._error_rates.get(method, self._error_rate)
+        if rate > 0 and self._rng.random() < rate:
+            raise MockProviderError(f"Injected {method} failure")
+
+    async def _simulate(self, method: str) -> None:
+        await asyncio.sleep(self._sample_latency(method))
+        self._maybe_fail(method)
+
+    # ── Provider API ──────────────────────────────────────────────────────────
+
+    async def extract_cv_profile(self, raw_text: str) -> CVProfile:
+        await self._simulate("extract_cv_profile")
+        rng = self._output_rng("extract_cv_profile", raw_text)
+        lines = [line.strip() for line in raw_text.splitlines() if line.strip()]
+        words = {w.strip(".,;:()").lower() for w in raw_text.split()}
+        skills = [name for key, name in _KNOWN_SKILLS.items() if key in words] or rng.sample(_FALLBACK_SKILLS, 3)
+        years = round(rng.uniform(1, 12), 1)
+        return CVProfile(
+            name=lines[0][:60] if lines else "Candidate",
+            current_role=rng.choice(["Software Engineer", "Data Analyst", "Product Manager", "DevOps Engineer"]),
+            years_of_experience=years,
+            skills=skills[:20],
+            work_experience=[
+                WorkExperience(
+                    company=rng.choice(["Acme Corp", "Globex", "Initech", "Umbrella"]),
+                    role="Engineer",
+                    duration=f"{int(years)} years",
+                    highlights=["Led a migration project", "Improved reliability"],
+                )
+            ],
+            education=[Education(institution="State University", degree="BSc", field="Computer Science")],
+            raw_text=raw_text,
+        )
+
+    def _make_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> list[Question]:
+        rng = self._output_rng(
+            "generate_questions",
+            cv_profile.name,
+            ",".join(cv_profile.skills),
+            mode.value,
+            difficulty.value,
+            *((focus,) if focus else ()),
+        )
+        skills = cv_profile.skills or _FALLBACK_SKILLS
+        company = cv_profile.work_experience[0].company if cv_profile.work_experience else "your last company"
+        categories = _MODE_CATEGORIES.get(mode.value, ["Behavioral"])
+        if focus:
+            # Honour a focus the way a model would: keep to the categories and skills it names
+            categories = [c for c in categories if c.lower() in focus.lower()] or categories
+            skills = [s for s in skills if s.lower() in focus.lower()] or skills
+        avoided = {text.lower() for text in avoid}
+        questions = []
+        for i in range(count):
+            category = categories[i % len(categories)]
+            for _ in range(10):  # a few draws to step around questions to avoid
+                text = rng.choice(_QUESTION_TEMPLATES[category]).format(
+                    skill=rng.choice(skills), company=company, role=cv_profile.current_role or "engineer"
+                )
+                if text.lower() not in avoided:
+                    break
+            avoided.add(text.lower())
+            questions.append(
+                Question(
+                    text=text,
+                    category=category,
+                    follow_up_hint="Look for a concrete example, the candidate's own actions, and a measurable result.",
+                )
+            )
+        return questions
+
+    async def generate_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> list[Question]:
+        await self._simulate("generate_questions")
+        return self._make_questions(cv_profile, mode, difficulty, count, focus, avoid)
+
+    async def stream_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> AsyncIterator[Question]:
+        if not self._stream:
+            for question in await self.generate_questions(cv_profile, mode, difficulty, count, focus, avoid):
+                yield question
+            return
+        # Time to first token is ~30% of the total; the rest is spread evenly
+        total = self._sample_latency("generate_questions")
+        self._maybe_fail("generate_questions")
+        questions = self._make_questions(cv_profile, mode, difficulty, count, focus, avoid)
+        await asyncio.sleep(total * 0.3)
+        for question in questions:
+            await asyncio.sleep(total * 0.7 / max(count, 1))
+            yield question
+
+    async def evaluate_answer(
+        self,
+        question: Question,
+        answer: Answer,
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> AnswerScore:
+        await self._simulate("evaluate_answer")
+        return self._score_answer(question, answer)
+
+    async def evaluate_answers(
+        self,
+        pairs: list[tuple[Question, Answer]],
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> dict[str, AnswerScore]:
+        await self._simulate("evaluate_answers")
+        scores = {}
+        for question, answer in pairs:
+            # Entries go missing at MOCK_ERROR_RATES["evaluate_answers.item"] (default MOCK_ERROR_RATE)
+            try:
+                self._maybe_fail("evaluate_answers.item")
+            except MockProviderError:
+                continue
+            scores[question.question_id] = self._score_answer(question, answer)
+        return scores
+
+    def _score_answer(self, question: Question, answer: Answer) -> AnswerScore:
+        rng = self._output_rng("evaluate_answer", question.text, answer.transcript)
+        words = re.findall(r"[a-zA-Z']+", answer.transcript.lower())
+        length_score = min(len(words) / 150, 1.0) * 60
+        structure_score = sum(w in words for w in _STAR_WORDS) / len(_STAR_WORDS) * 30
+        score = int(min(100, max(0, length_score + structure_score + rng.uniform(0, 10))))
+        return AnswerScore(
+            question_id=question.question_id,
+            question_text=question.text,
+            transcript=answer.transcript,
+            score=score,
+            feedback=(
+                "The answer addresses the question and gives some context. "
+                "It would be stronger with a specific example and a measurable outcome."
+            ),
+            strengths=["Clear structure", "Relevant experience"][: rng.randint(1, 2)],
+            improvements=["Quantify the impact", "Explain your own role more explicitly"][: rng.randint(1, 2)],
+            category=question.category,
+        )
+
+    async def generate_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> InterviewResults:
+        await self._simulate("generate_overall_feedback")
+        return self._make_results(answer_scores, scores, cv_profile, mode, session_id)
+
+    async def stream_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        if not self._stream:
+            async for field in super().stream_overall_feedback(answer_scores, scores, cv_profile, mode, session_id):
+                yield field
+            return
+        total = self._sample_latency("generate_overall_feedback")
+        self._maybe_fail("generate_overall_feedback")
+        results = self._make_results(answer_scores, scores, cv_profile, mode, session_id)
+        fields = narrative_fields(results)
+        await asyncio.sleep(total * 0.3)
+        for field, value in fields:
+            await asyncio.sleep(total * 0.7 / len(fields))
+            yield field, value
+
+    def _make_results(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> InterviewResults:
+        return InterviewResults(
+            session_id=session_id,
+            overall_score=scores.overall_score,
+            grade=scores.grade,
+            category_scores=scores.category_scores,
+            answer_reviews=answer_scores,
+            top_strengths=["Clear communication", "Relevant examples", "Calm delivery"],
+            top_improvements=["Quantify results", "Use the STAR structure", "Be more concise"],
+            recommended_resources=[
+                Resource(title="The STAR Interview Method", description="Structure behavioural answers."),
+                Resource(title="Cracking the Coding Interview", description="Practice technical questions."),
+            ],
+            summary=(
+                f"{cv_profile.name} completed {len(answer_scores)} questions with an overall score of "
+                f"{scores.overall_score}. Answers were relevant but would benefit from more concrete results."
+            ),
+        )
+
+    async def generate_coaching_overview(self, sessions_data: list[dict], candidate_name: str) -> str:
+        await self._simulate("generate_coaching_overview")
+        rng = self._output_rng("generate_coaching_overview", candidate_name, json.dumps(sessions_data))
+        focus = rng.choice(["structuring answers with STAR", "quantifying impact", "technical depth"])
+        return (
+            f"{candidate_name} communicates clearly and stays on topic across sessions. "
+            f"The most consistent gap is {focus}. "
+            "Before your next real interview, rehearse three stories end to end and time them. "
+            "Focus on one concrete metric per answer."
+        )
@@ -1,13 +1,50 @@
 import json
-from openai import AsyncOpenAI
+from functools import partial
+from typing import Any, AsyncIterator, Optional, Sequence
+
+from openai import AsyncOpenAI, NotFoundError
+from openai.types import CompletionUsage
 
 from app.ai.base import AIProvider
+from app.ai.batch import BatchBackend, BatchRequest, BatchStatus
+from app.ai.usage import record_usage
+from app.ai.structured import (
+    ANSWER_SCORE,
+    ANSWER_SCORES,
+    COACHING_OVERVIEW,
+    CV_PROFILE,
+    OVERALL_FEEDBACK,
+    QUESTIONS,
+    OutputSpec,
+    StructuredOutputError,
+    answer_score_from_output,
+    coaching_from_data,
+    collect_questions,
+    cv_profile_from_data,
+    evaluations_from_data,
+    parse_json,
+    questions_from_data,
+    results_from_data,
+    retry_invalid,
+    stream_feedback_fields,
+    stream_question_items,
+    strict_schema,
+)
 from app.config import get_settings
-from app.models.cv import CVProfile, WorkExperience, Education
+from app.models.cv import CVProfile
 from app.models.interview import Question, Answer, InterviewMode, Difficulty
-from app.models.results import AnswerScore, InterviewResults, CategoryScore, Resource, score_to_grade
-from app.prompts.question_prompts import build_question_prompt, build_evaluation_prompt
-from app.prompts.evaluation_prompts import build_overall_feedback_prompt, build_cv_extraction_prompt
+from app.models.results import AnswerScore, InterviewResults, ScoreSummary, answer_scores_from_batch
+from app.prompts.base import Prompt
+from app.prompts.question_prompts import (
+    build_question_prompt,
+    build_evaluation_prompt,
+    build_batch_evaluation_prompt,
+)
+from app.prompts.evaluation_prompts import (
+    build_overall_feedback_prompt,
+    build_cv_extraction_prompt,
+    build_overview_prompt,
+)
 
 
 class OpenAIProvider(AIProvider):
@@ -16,37 +53,79 @@ class OpenAIProvider(AIProvider):
         self._client = AsyncOpenAI(api_key=settings.openai_api_key)
         self._model = settings.openai_model
 
-    async def _chat(self, prompt: str, max_tokens: int = 4096) -> str:
+    @property
+    def model_id(self) -> str:
+        return f"openai:{self._model}"
+
+    @staticmethod
+    def _messages(prompt: Prompt) -> list[dict]:
+        # OpenAI caches long prompt prefixes automatically; keeping the static
+        # system message first is what makes them shareable across calls
+        return [
+            {"role": "system", "content": prompt.system},
+            {"role": "user", "content": prompt.user},
+        ]
+
+    @staticmethod
+    def _record_usage(call: str, usage) -> None:
+        details = usage.prompt_tokens_details
+        cached = (details.cached_tokens or 0) if details is not None else 0
+        record_usage(call, usage.prompt_tokens, usage.completion_tokens, cached_input_tokens=cached)
+
+    @staticmethod
+    def _response_format(spec: OutputSpec) -> dict:
+        # Without strict the schema is only a hint; with it, decoding is constrained to the schema
+        return {
+            "type": "json_schema",
+            "json_schema": {
+                "name": spec.name,
+                "description": spec.description,
+                "schema": strict_schema(spec.schema),
+                "strict": True,
+            },
+        }
+
+    async def _structured(
+        self, prompt: Prompt, spec: OutputSpec, max_tokens: int = 4096, call: str = "chat"
+    ) -> Any:
         response = await self._client.chat.completions.create(
             model=self._model,
             max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
-            response_format={"type": "json_object"},
+            messages=self._messages(prompt),
+            response_format=self._response_format(spec),
         )
-        return response.choices[0].message.content
+        self._record_usage(call, response.usage)
+        choice = response.choices[0]
+        if choice.finish_reason == "length":
+            raise StructuredOutputError(f"{call} output was truncated at {max_tokens} tokens")
+        return parse_json(choice.message.content or "")
 
-    async def _chat_text(self, prompt: str, max_tokens: int = 4096) -> str:
-        """For prompts that return JSON arrays (not objects), use plain text mode."""
-        response = await self._client.chat.completions.create(
+    async def _structured_stream(
+        self, prompt: Prompt, spec: OutputSpec, max_tokens: int = 4096, call: str = "chat"
+    ) -> AsyncIterator[str]:
+        """Yield the JSON text as it is generated."""
+        stream = await self._client.chat.completions.create(
             model=self._model,
             max_tokens=max_tokens,
-            messages=[{"role": "user", "content": prompt}],
+            messages=self._messages(prompt),
+            response_format=self._response_format(spec),
+            stream=True,
+            stream_options={"include_usage": True},
         )
-        return response.choices[0].message.content
+        async for chunk in stream:
+            if chunk.usage is not None:
+                self._record_usage(call, chunk.usage)
+            if chunk.choices and chunk.choices[0].delta.content:
+                yield chunk.choices[0].delta.content
 
     async def extract_cv_profile(self, raw_text: str) -> CVProfile:
         prompt = build_cv_extraction_prompt(raw_text)
-        response = await self._chat(prompt)
-        data = json.loads(response.strip())
-        return CVProfile(
-            name=data.get("name", "Candidate"),
-            current_role=data.get("current_role", ""),
-            years_of_experience=float(data.get("years_of_experience", 0)),
-            skills=data.get("skills", []),
-            work_experience=[WorkExperience(**e) for e in data.get("work_experience", [])],
-            education=[Education(**e) for e in data.get("education", [])],
-            raw_text=raw_text,
-        )
+
+        async def attempt() -> CVProfile:
+            data = await self._structured(prompt, CV_PROFILE, call="extract_cv_profile")
+            return cv_profile_from_data(data, raw_text)
+
+        return await retry_invalid("extract_cv_profile", attempt)
 
     async def generate_questions(
         self,
@@ -54,18 +133,29 @@ class OpenAIProvider(AIProvider):
         mode: InterviewMode,
         difficulty: Difficulty,
         count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
     ) -> list[Question]:
-        prompt = build_question_prompt(cv_profile, mode, difficulty, count)
-        response = await self._chat_text(prompt)
-        items = json.loads(response.strip())
-        return [
-            Question(
-                text=item["text"],
-                category=item.get("category", "General"),
-                follow_up_hint=item.get("follow_up_hint"),
-            )
-            for item in items
-        ]
+        async def fetch(missing: int) -> list[Question]:
+            prompt = build_question_prompt(cv_profile, mode, difficulty, missing, focus, avoid)
+            return questions_from_data(await self._structured(prompt, QUESTIONS, call="generate_questions"))
+
+        return await collect_questions(count, fetch)
+
+    async def stream_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> AsyncIterator[Question]:
+        prompt = build_question_prompt(cv_profile, mode, difficulty, count, focus, avoid)
+        chunks = self._structured_stream(prompt, QUESTIONS, call="generate_questions")
+        top_up = partial(self.generate_questions, cv_profile, mode, difficulty, focus=focus, avoid=avoid)
+        async for question in stream_question_items(chunks, count, top_up):
+            yield question
 
     async def evaluate_answer(
         self,
@@ -73,6 +163,7 @@ class OpenAIProvider(AIProvider):
         answer: Answer,
         mode: InterviewMode,
         cv_profile: CVProfile,
+        difficulty: Difficulty,
     ) -> AnswerScore:
         prompt = build_evaluation_prompt(
             question_text=question.text,
@@ -80,38 +171,130 @@ class OpenAIProvider(AIProvider):
             category=question.category,
             mode=mode,
             candidate_name=cv_profile.name,
+            difficulty=difficulty,
         )
-        response = await self._chat(prompt)
-        data = json.loads(response.strip())
-        return AnswerScore(
-            question_id=question.question_id,
-            question_text=question.text,
-            transcript=answer.transcript,
-            score=int(data["score"]),
-            feedback=data["feedback"],
-            strengths=data.get("strengths", []),
-            improvements=data.get("improvements", []),
-        )
+
+        async def attempt() -> AnswerScore:
+            data = await self._structured(prompt, ANSWER_SCORE, call="evaluate_answer")
+            return answer_score_from_output(question, answer, data)
+
+        return await retry_invalid("evaluate_answer", attempt)
+
+    async def evaluate_answers(
+        self,
+        pairs: list[tuple[Question, Answer]],
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> dict[str, AnswerScore]:
+        prompt = build_batch_evaluation_prompt(pairs, mode, cv_profile.name, difficulty)
+        try:
+            data = await self._structured(
+                prompt, ANSWER_SCORES, max_tokens=1024 + 400 * len(pairs), call="evaluate_answers"
+            )
+        except StructuredOutputError:
+            return {}  # the caller re-scores every missing answer on its own
+        return answer_scores_from_batch(pairs, evaluations_from_data(data))
 
     async def generate_overall_feedback(
         self,
         answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
         cv_profile: CVProfile,
         mode: InterviewMode,
         session_id: str,
     ) -> InterviewResults:
-        prompt = build_overall_feedback_prompt(answer_scores, cv_profile, mode)
-        response = await self._chat(prompt, max_tokens=2048)
-        data = json.loads(response.strip())
-        overall_score = int(data.get("overall_score", 0))
-        return InterviewResults(
-            session_id=session_id,
-            overall_score=overall_score,
-            grade=data.get("grade", score_to_grade(overall_score)),
-            category_scores=[CategoryScore(**c) for c in data.get("category_scores", [])],
-            answer_reviews=answer_scores,
-            top_strengths=data.get("top_strengths", []),
-            top_improvements=data.get("top_improvements", []),
-            recommended_resources=[Resource(**r) for r in data.get("recommended_resources", [])],
-            summary=data.get("summary", ""),
+        prompt = build_overall_feedback_prompt(answer_scores, scores, cv_profile, mode)
+
+        async def attempt() -> InterviewResults:
+            data = await self._structured(prompt, OVERALL_FEEDBACK, max_tokens=1024, call="generate_overall_feedback")
+            return results_from_data(session_id, answer_scores, scores, data)
+
+        return await retry_invalid("generate_overall_feedback", attempt)
+
+    async def stream_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        prompt = build_overall_feedback_prompt(answer_scores, scores, cv_profile, mode)
+        chunks = self._structured_stream(prompt, OVERALL_FEEDBACK, max_tokens=1024, call="generate_overall_feedback")
+        regenerate = partial(self.generate_overall_feedback, answer_scores, scores, cv_profile, mode, session_id)
+        async for field in stream_feedback_fields(chunks, session_id, answer_scores, scores, regenerate):
+            yield field
+
+    async def generate_coaching_overview(self, sessions_data: list[dict], candidate_name: str) -> str:
+        prompt = build_overview_prompt(sessions_data, candidate_name)
+
+        async def attempt() -> str:
+            data = await self._structured(prompt, COACHING_OVERVIEW, max_tokens=512, call="generate_coaching_overview")
+            return coaching_from_data(data)
+
+        return await retry_invalid("generate_coaching_overview", attempt)
+
+
+class OpenAIBatchBackend(BatchBackend):
+    """OpenAI Batch API over /v1/chat/completions: 24-hour window at half the token price."""
+
+    def __init__(self):
+        settings = get_settings()
+        self._client = AsyncOpenAI(api_key=settings.openai_api_key)
+        self._model = settings.openai_model
+
+    @property
+    def model_id(self) -> str:
+        return f"openai:{self._model}"
+
+    async def submit(self, requests: list[BatchRequest]) -> str:
+        lines = [
+            json.dumps({
+                "custom_id": request.custom_id,
+                "method": "POST",
+                "url": "/v1/chat/completions",
+                "body": {
+                    "model": self._model,
+                    "max_tokens": request.max_tokens,
+                    "messages": OpenAIProvider._messages(request.prompt),
+                    "response_format": {"type": "json_object"},
+                },
+            })
+            for request in requests
+        ]
+        upload = await self._client.files.create(file=("batch.jsonl", "\n".join(lines).encode()), purpose="batch")
+        batch = await self._client.batches.create(
+            input_file_id=upload.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
         )
+        return batch.id
+
+    async def status(self, batch_id: str) -> BatchStatus:
+        try:
+            batch = await self._client.batches.retrieve(batch_id)
+        except NotFoundError:
+            return BatchStatus.EXPIRED
+        if batch.status == "completed":
+            return BatchStatus.ENDED
+        if batch.status in ("failed", "expired", "cancelled"):
+            # Expired and cancelled batches keep whatever finished in time
+            return BatchStatus.ENDED if batch.output_file_id else BatchStatus.EXPIRED
+        return BatchStatus.IN_PROGRESS
+
+    async def results(self, batch_id: str, call: str) -> dict[str, str]:
+        batch = await self._client.batches.retrieve(batch_id)
+        if not batch.output_file_id:
+            return {}
+        content = await self._client.files.content(batch.output_file_id)
+        texts = {}
+        for line in content.text.splitlines():
+            item = json.loads(line)
+            response = item.get("response")
+            if not response or response.get("status_code") != 200:
+                continue
+            body = response["body"]
+            OpenAIProvider._record_usage(call, CompletionUsage.model_validate(body["usage"]))
+            texts[item["custom_id"]] = body["choices"][0]["message"]["content"]
+        return texts
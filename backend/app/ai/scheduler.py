@@ -0,0 +1,314 @@
+import asyncio
+import heapq
+import itertools
+import time
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from enum import Enum, IntEnum
+from typing import Any, AsyncIterator, Iterator, Optional, Sequence
+
+from app.ai.base import AIProvider
+from app.config import get_settings
+from app.models.cv import CVProfile
+from app.models.interview import Question, Answer, InterviewMode, Difficulty
+from app.models.results import AnswerScore, InterviewResults, ScoreSummary
+from app.services.metrics import get_metrics
+
+
+class Priority(IntEnum):
+    """Scheduling lanes; a lower value is always served first."""
+
+    INTERACTIVE = 0  # a user is waiting on the response (upload, start)
+    BACKGROUND = 1  # evaluation jobs
+    COACHING = 2  # dashboard recommendation refreshes
+
+
+class ProcessRole(str, Enum):
+    """Which share of the vendor rate limits this process may use."""
+
+    API = "api"  # interactive calls, plus speculative generation in the background lane
+    WORKER = "worker"  # worker.py: evaluation and coaching
+
+
+_process_role = ProcessRole.API
+
+
+def set_process_role(role: ProcessRole) -> None:
+    """Declare this process's role; call before the provider is first created."""
+    global _process_role
+    _process_role = role
+
+
+# Lowest lane the current task may use; see `at_most`
+_priority_floor: ContextVar[Priority] = ContextVar("ai_priority_floor", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def at_most(priority: Priority) -> Iterator[None]:
+    """Schedule provider calls made in this context no sooner than `priority`.
+
+    For work no user is waiting on yet, such as speculative question
+    generation, that would otherwise take the interactive lane. Tasks created
+    inside the block inherit it.
+    """
+    token = _priority_floor.set(max(priority, _priority_floor.get()))
+    try:
+        yield
+    finally:
+        _priority_floor.reset(token)
+
+
+# Rough prompt + completion size per call, charged against the tokens/min
+# bucket before the call is made (actual usage is only known after it returns)
+_ESTIMATED_TOKENS = {
+    "extract_cv_profile": 4000,
+    "generate_questions": 3000,
+    "evaluate_answer": 1500,
+    "evaluate_answers": 1000,  # plus the per-answer estimate below
+    "evaluate_answers.item": 700,
+    "generate_overall_feedback": 2000,
+    "generate_coaching_overview": 1200,
+}
+
+
+class TokenBucket:
+    """Classic token bucket refilled continuously at `per_minute` / 60 per second.
+
+    A `per_minute` of 0 disables the limit.
+    """
+
+    def __init__(self, per_minute: int):
+        self.capacity = float(per_minute)
+        self._rate = per_minute / 60.0
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self._rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)."""
+        if self._rate <= 0:
+            return 0.0
+        self._refill()
+        amount = min(amount, self.capacity)
+        return max(0.0, (amount - self._tokens) / self._rate)
+
+    def consume(self, amount: float) -> None:
+        if self._rate > 0:
+            self._tokens -= min(amount, self.capacity)
+
+
+class RequestScheduler:
+    """Admits provider calls by priority, within rate limits and a concurrency bound.
+
+    Waiting calls sit in one priority queue (FIFO within a lane). The head of
+    the queue is admitted as soon as a concurrency slot is free and both the
+    requests/min and tokens/min buckets can cover it; nothing behind it
+    overtakes, so background work cannot consume budget an interactive call
+    is waiting for.
+    """
+
+    def __init__(self, max_concurrency: int, requests_per_minute: int, tokens_per_minute: int):
+        self._max_concurrency = max_concurrency
+        self._requests = TokenBucket(requests_per_minute)
+        self._tokens = TokenBucket(tokens_per_minute)
+        self._queue: list[tuple[int, int, float, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._in_flight = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._metrics = get_metrics()
+
+    @asynccontextmanager
+    async def slot(self, priority: Priority, tokens: float) -> AsyncIterator[None]:
+        priority = max(priority, _priority_floor.get())
+        lane = priority.name.lower()
+        waiter = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._queue, (priority, next(self._seq), tokens, waiter))
+        self._publish_depth()
+        self._dispatch()
+        start = time.perf_counter()
+        try:
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()  # admitted just as we were cancelled
+            else:
+                waiter.cancel()
+                self._publish_depth()
+            raise
+        self._metrics.observe(f"ai_scheduler.wait_seconds.{lane}", time.perf_counter() - start)
+        try:
+            yield
+        finally:
+            self._release()
+
+    def _release(self) -> None:
+        self._in_flight -= 1
+        self._metrics.set_gauge("ai_scheduler.in_flight", self._in_flight)
+        self._dispatch()
+
+    def _dispatch(self) -> None:
+        while self._queue and self._in_flight < self._max_concurrency:
+            priority, _, tokens, waiter = self._queue[0]
+            if waiter.done():  # cancelled while queued
+                heapq.heappop(self._queue)
+                continue
+            delay = max(self._requests.wait_time(1), self._tokens.wait_time(tokens))
+            if delay > 0:
+                if self._timer is None:
+                    self._timer = asyncio.get_running_loop().call_later(delay, self._on_timer)
+                break
+            heapq.heappop(self._queue)
+            self._requests.consume(1)
+            self._tokens.consume(tokens)
+            self._in_flight += 1
+            waiter.set_result(None)
+        self._metrics.set_gauge("ai_scheduler.in_flight", self._in_flight)
+        self._publish_depth()
+
+    def _on_timer(self) -> None:
+        self._timer = None
+        self._dispatch()
+
+    def _publish_depth(self) -> None:
+        depth = {p: 0 for p in Priority}
+        for priority, _, _, waiter in self._queue:
+            if not waiter.done():
+                depth[Priority(priority)] += 1
+        for priority, count in depth.items():
+            self._metrics.set_gauge(f"ai_scheduler.queue_depth.{priority.name.lower()}", count)
+
+
+class ScheduledProvider(AIProvider):
+    """Wraps a provider so every call goes through a RequestScheduler.
+
+    Upload and question generation run in the interactive lane, evaluation in
+    the background lane and dashboard coaching last. Streaming calls hold
+    their slot until the stream is exhausted or closed.
+    """
+
+    def __init__(self, inner: AIProvider, scheduler: RequestScheduler):
+        self._inner = inner
+        self._scheduler = scheduler
+
+    @property
+    def model_id(self) -> str:
+        return self._inner.model_id
+
+    async def extract_cv_profile(self, raw_text: str) -> CVProfile:
+        async with self._scheduler.slot(Priority.INTERACTIVE, _ESTIMATED_TOKENS["extract_cv_profile"]):
+            return await self._inner.extract_cv_profile(raw_text)
+
+    async def generate_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> list[Question]:
+        async with self._scheduler.slot(Priority.INTERACTIVE, _ESTIMATED_TOKENS["generate_questions"]):
+            return await self._inner.generate_questions(cv_profile, mode, difficulty, count, focus, avoid)
+
+    async def stream_questions(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+        focus: Optional[str] = None,
+        avoid: Sequence[str] = (),
+    ) -> AsyncIterator[Question]:
+        async with self._scheduler.slot(Priority.INTERACTIVE, _ESTIMATED_TOKENS["generate_questions"]):
+            async for question in self._inner.stream_questions(cv_profile, mode, difficulty, count, focus, avoid):
+                yield question
+
+    async def evaluate_answer(
+        self,
+        question: Question,
+        answer: Answer,
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> AnswerScore:
+        async with self._scheduler.slot(Priority.BACKGROUND, _ESTIMATED_TOKENS["evaluate_answer"]):
+            return await self._inner.evaluate_answer(question, answer, mode, cv_profile, difficulty)
+
+    async def evaluate_answers(
+        self,
+        pairs: list[tuple[Question, Answer]],
+        mode: InterviewMode,
+        cv_profile: CVProfile,
+        difficulty: Difficulty,
+    ) -> dict[str, AnswerScore]:
+        tokens = _ESTIMATED_TOKENS["evaluate_answers"] + _ESTIMATED_TOKENS["evaluate_answers.item"] * len(pairs)
+        async with self._scheduler.slot(Priority.BACKGROUND, tokens):
+            return await self._inner.evaluate_answers(pairs, mode, cv_profile, difficulty)
+
+    async def generate_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> InterviewResults:
+        async with self._scheduler.slot(Priority.BACKGROUND, _ESTIMATED_TOKENS["generate_overall_feedback"]):
+            return await self._inner.generate_overall_feedback(answer_scores, scores, cv_profile, mode, session_id)
+
+    async def stream_overall_feedback(
+        self,
+        answer_scores: list[AnswerScore],
+        scores: ScoreSummary,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        session_id: str,
+    ) -> AsyncIterator[tuple[str, Any]]:
+        async with self._scheduler.slot(Priority.BACKGROUND, _ESTIMATED_TOKENS["generate_overall_feedback"]):
+            async for field in self._inner.stream_overall_feedback(
+                answer_scores, scores, cv_profile, mode, session_id
+            ):
+                yield field
+
+    async def generate_coaching_overview(self, sessions_data: list[dict], candidate_name: str) -> str:
+        async with self._scheduler.slot(Priority.COACHING, _ESTIMATED_TOKENS["generate_coaching_overview"]):
+            return await self._inner.generate_coaching_overview(sessions_data, candidate_name)
+
+
+def process_share() -> float:
+    """This process's fraction of the vendor rate limits, by role.
+
+    Interactive calls are made by API processes and evaluation by workers,
+    so reserving the API role its own share is what keeps background work
+    from using up the budget an interactive call needs.
+    """
+    settings = get_settings()
+    api_share = min(max(settings.ai_api_share, 0.0), 1.0)
+    if _process_role == ProcessRole.API:
+        return api_share / max(settings.ai_api_processes, 1)
+    return (1 - api_share) / max(settings.ai_worker_processes, 1)
+
+
+def _limit_share(per_minute: int, share: float) -> int:
+    return max(1, int(per_minute * share)) if per_minute > 0 else 0
+
+
+def with_scheduler(provider: AIProvider) -> AIProvider:
+    """Wrap `provider` per the AI_* scheduler settings, limited to this process's share."""
+    settings = get_settings()
+    share = process_share()
+    requests_per_minute = _limit_share(settings.ai_requests_per_minute, share)
+    tokens_per_minute = _limit_share(settings.ai_tokens_per_minute, share)
+    metrics = get_metrics()
+    metrics.set_gauge("ai_scheduler.requests_per_minute", requests_per_minute)
+    metrics.set_gauge("ai_scheduler.tokens_per_minute", tokens_per_minute)
+    scheduler = RequestScheduler(
+        max_concurrency=settings.ai_max_concurrency,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+    )
+    return ScheduledProvider(provider, scheduler)
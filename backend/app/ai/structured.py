@@ -0,0 +1,356 @@
+import json
+import logging
+import re
+from typing import Any, AsyncIterator, Awaitable, Callable, Iterable, NamedTuple, Optional, TypeVar
+
+from pydantic import BaseModel, ValidationError
+
+from app.ai.json_stream import JSONArrayStreamParser, JSONObjectStreamParser
+from app.config import get_settings
+from app.models.cv import CVProfile, WorkExperience, Education
+from app.models.interview import Question, Answer
+from app.models.results import (
+    NARRATIVE_FIELDS,
+    AnswerScore,
+    InterviewResults,
+    ScoreSummary,
+    answer_score_from_data,
+    narrative_fields,
+    results_from_feedback,
+)
+from app.services.metrics import get_metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class StructuredOutputError(ValueError):
+    """A provider response that could not be turned into the expected structure."""
+
+
+class OutputSpec(NamedTuple):
+    """A named JSON schema a provider is constrained to (tool input or response format)."""
+
+    name: str
+    description: str
+    schema: dict
+
+
+def object_schema(model: type[BaseModel], fields: Iterable[str]) -> dict:
+    """JSON schema of `model` restricted to `fields`, in that order.
+
+    Providers tend to emit properties in schema order, so the order matters
+    for fields that are streamed to the client as they complete.
+    """
+    schema = model.model_json_schema()
+    fields = list(fields)
+    result = {
+        "type": "object",
+        "properties": {name: schema["properties"][name] for name in fields},
+        "required": [name for name in fields if name in schema.get("required", [])],
+    }
+    if "$defs" in schema:
+        result["$defs"] = schema["$defs"]
+    return result
+
+
+def array_schema(key: str, model: type[BaseModel], fields: Iterable[str]) -> dict:
+    """Schema of ``{key: [item, ...]}``; tool inputs must be objects, so arrays are wrapped."""
+    item = object_schema(model, fields)
+    defs = item.pop("$defs", None)
+    result = {
+        "type": "object",
+        "properties": {key: {"type": "array", "items": item}},
+        "required": [key],
+    }
+    if defs:
+        result["$defs"] = defs
+    return result
+
+
+# Keywords OpenAI's strict mode rejects; the models still validate ranges on parsing
+_NON_STRICT_KEYWORDS = frozenset({"default", "minimum", "maximum"})
+
+
+def strict_schema(schema: Any) -> Any:
+    """`schema` in the form OpenAI's strict structured outputs require.
+
+    Every object gets ``additionalProperties: false`` and lists all of its
+    properties as required. Fields that may be omitted are already nullable
+    (Optional in the models), and the rest have empty values the model can use.
+    """
+    if isinstance(schema, list):
+        return [strict_schema(item) for item in schema]
+    if not isinstance(schema, dict):
+        return schema
+    result = {
+        key: value if key in ("properties", "$defs") else strict_schema(value)
+        for key, value in schema.items()
+        if key not in _NON_STRICT_KEYWORDS
+    }
+    for key in ("properties", "$defs"):
+        if key in schema:
+            result[key] = {name: strict_schema(value) for name, value in schema[key].items()}
+    if result.get("type") == "object" or "properties" in result:
+        result["additionalProperties"] = False
+        result["required"] = list(result.get("properties", {}))
+    return result
+
+
+_SCORE_FIELDS = ("score", "feedback", "strengths", "improvements")
+
+CV_PROFILE = OutputSpec(
+    "record_cv_profile",
+    "Record the structured profile extracted from the CV.",
+    object_schema(
+        CVProfile, ("name", "current_role", "years_of_experience", "skills", "work_experience", "education")
+    ),
+)
+QUESTIONS = OutputSpec(
+    "record_questions",
+    "Record the generated interview questions.",
+    array_schema("questions", Question, ("text", "category", "follow_up_hint")),
+)
+ANSWER_SCORE = OutputSpec(
+    "record_evaluation",
+    "Record the evaluation of the candidate's answer.",
+    object_schema(AnswerScore, _SCORE_FIELDS),
+)
+ANSWER_SCORES = OutputSpec(
+    "record_evaluations",
+    "Record the evaluation of every answer, one entry per question_id.",
+    array_schema("evaluations", AnswerScore, ("question_id", *_SCORE_FIELDS)),
+)
+OVERALL_FEEDBACK = OutputSpec(
+    "record_report",
+    "Record the narrative of the post-interview feedback report.",
+    object_schema(InterviewResults, NARRATIVE_FIELDS),
+)
+COACHING_OVERVIEW = OutputSpec(
+    "record_coaching_overview",
+    "Record the personalised coaching overview.",
+    {
+        "type": "object",
+        "properties": {"ai_recommendation": {"type": "string"}},
+        "required": ["ai_recommendation"],
+    },
+)
+
+
+# ── Parsing ───────────────────────────────────────────────────────────────────
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.DOTALL)
+
+
+def parse_json(text: str) -> Any:
+    """`json.loads` that tolerates markdown fences and prose before or after the value."""
+    text = text.strip()
+    try:
+        return json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    fenced = _FENCE.search(text)
+    if fenced:
+        text = fenced.group(1)
+    starts = [i for i in (text.find("{"), text.find("[")) if i >= 0]
+    if not starts:
+        raise StructuredOutputError("No JSON value in response")
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text, min(starts))
+    except json.JSONDecodeError as e:
+        raise StructuredOutputError(f"Malformed or truncated JSON in response: {e}") from e
+    return value
+
+
+def _items(data: Any, key: str) -> list:
+    """The list under `key`, or `data` itself when a provider returned a bare array."""
+    if isinstance(data, dict):
+        data = data.get(key)
+    return data if isinstance(data, list) else []
+
+
+def _valid(model: type[BaseModel], items: Any) -> list:
+    valid = []
+    for item in items if isinstance(items, list) else []:
+        try:
+            valid.append(model.model_validate(item))
+        except ValidationError:
+            continue
+    return valid
+
+
+def cv_profile_from_data(data: Any, raw_text: str) -> CVProfile:
+    """Build a CVProfile, dropping malformed list entries rather than failing the upload."""
+    if not isinstance(data, dict):
+        raise StructuredOutputError("CV profile response is not an object")
+    try:
+        years = float(data.get("years_of_experience") or 0)
+    except (TypeError, ValueError):
+        years = 0.0
+    return CVProfile(
+        name=str(data.get("name") or "Candidate"),
+        current_role=str(data.get("current_role") or ""),
+        years_of_experience=years,
+        skills=[s for s in data.get("skills") or [] if isinstance(s, str)][:20],
+        work_experience=_valid(WorkExperience, data.get("work_experience")),
+        education=_valid(Education, data.get("education")),
+        raw_text=raw_text,
+    )
+
+
+def questions_from_data(data: Any) -> list[Question]:
+    """Every well-formed question in the response; malformed entries are dropped."""
+    questions = []
+    for item in _items(data, "questions"):
+        question = question_from_item(item)
+        if question is not None:
+            questions.append(question)
+    return questions
+
+
+def question_from_item(item: Any) -> Optional[Question]:
+    if not isinstance(item, dict) or not isinstance(item.get("text"), str) or not item["text"].strip():
+        return None
+    try:
+        return Question(
+            text=item["text"],
+            category=item.get("category") or "General",
+            follow_up_hint=item.get("follow_up_hint"),
+        )
+    except ValidationError:
+        return None
+
+
+def answer_score_from_output(question: Question, answer: Answer, data: Any) -> AnswerScore:
+    try:
+        return answer_score_from_data(question, answer, data)
+    except ValueError as e:
+        raise StructuredOutputError(str(e)) from e
+
+
+def evaluations_from_data(data: Any) -> list:
+    return _items(data, "evaluations")
+
+
+def coaching_from_data(data: Any) -> str:
+    if not isinstance(data, dict) or not isinstance(data.get("ai_recommendation"), str):
+        raise StructuredOutputError("Coaching response has no ai_recommendation")
+    return data["ai_recommendation"]
+
+
+def results_from_data(
+    session_id: str, answer_scores: list[AnswerScore], scores: ScoreSummary, data: Any
+) -> InterviewResults:
+    if not isinstance(data, dict):
+        raise StructuredOutputError("Feedback response is not an object")
+    try:
+        return results_from_feedback(session_id, answer_scores, scores, data)
+    except (KeyError, TypeError, ValueError) as e:
+        raise StructuredOutputError(f"Invalid feedback report: {e}") from e
+
+
+# ── Bounded retries ───────────────────────────────────────────────────────────
+
+
+async def retry_invalid(call: str, attempt: Callable[[], Awaitable[T]]) -> T:
+    """Await `attempt()`, repeating it while the output is invalid, up to AI_OUTPUT_RETRIES times."""
+    retries = get_settings().ai_output_retries
+    retried = 0
+    while True:
+        try:
+            return await attempt()
+        except StructuredOutputError as e:
+            if retried >= retries:
+                raise
+            retried += 1
+            get_metrics().incr(f"ai.{call}.output_retries")
+            logger.warning("Retrying %s after invalid output: %s", call, e)
+
+
+async def collect_questions(count: int, fetch: Callable[[int], Awaitable[list[Question]]]) -> list[Question]:
+    """Gather `count` valid questions, re-requesting only the missing ones.
+
+    Returns a short set once the retry budget is spent, as long as there is
+    at least one question.
+    """
+    questions: list[Question] = []
+
+    async def attempt() -> list[Question]:
+        missing = count - len(questions)
+        questions.extend((await fetch(missing))[:missing])
+        if len(questions) < count:
+            raise StructuredOutputError(f"{count - len(questions)} of {count} questions missing or invalid")
+        return questions
+
+    try:
+        return await retry_invalid("generate_questions", attempt)
+    except StructuredOutputError:
+        if questions:
+            return questions
+        raise
+
+
+async def stream_question_items(
+    chunks: AsyncIterator[str],
+    count: int,
+    top_up: Callable[[int], Awaitable[list[Question]]],
+) -> AsyncIterator[Question]:
+    """Yield questions from a streamed ``{"questions": [...]}`` (or bare array) response.
+
+    Malformed entries are skipped and, if the stream ends short (truncated or
+    invalid JSON), only the missing questions are requested again.
+    """
+    parser = JSONArrayStreamParser()
+    produced = 0
+    try:
+        async for chunk in chunks:
+            for item in parser.feed(chunk):
+                question = question_from_item(item)
+                if question is not None and produced < count:
+                    produced += 1
+                    yield question
+    except json.JSONDecodeError as e:
+        logger.warning("Question stream was malformed: %s", e)
+    finally:
+        await chunks.aclose()
+    if produced < count:
+        get_metrics().incr("ai.generate_questions.output_retries")
+        for question in (await top_up(count - produced))[: count - produced]:
+            yield question
+
+
+async def stream_feedback_fields(
+    chunks: AsyncIterator[str],
+    session_id: str,
+    answer_scores: list[AnswerScore],
+    scores: ScoreSummary,
+    regenerate: Callable[[], Awaitable[InterviewResults]],
+) -> AsyncIterator[tuple[str, Any]]:
+    """Yield (field, value) pairs of a streamed feedback narrative as they complete.
+
+    If the stream is truncated or the finished report does not validate, the
+    report is generated again (non-streamed, within the retry budget) and its
+    fields are yielded again, replacing the earlier values.
+    """
+    parser = JSONObjectStreamParser()
+    fields: dict[str, Any] = {}
+    try:
+        async for chunk in chunks:
+            for field, value in parser.feed(chunk):
+                fields[field] = value
+                yield field, value
+    except json.JSONDecodeError as e:
+        logger.warning("Feedback stream was malformed: %s", e)
+    finally:
+        await chunks.aclose()
+    if parser.finished:
+        try:
+            results_from_data(session_id, answer_scores, scores, fields)
+            return
+        except StructuredOutputError:
+            pass
+    get_metrics().incr("ai.generate_overall_feedback.output_retries")
+    results = await regenerate()
+    for field, value in narrative_fields(results):
+        yield field, value
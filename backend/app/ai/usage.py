@@ -0,0 +1,45 @@
+from app.services.metrics import get_metrics
+
+
+def record_usage(
+    call: str,
+    input_tokens: int,
+    output_tokens: int,
+    cached_input_tokens: int = 0,
+    cache_write_tokens: int = 0,
+) -> None:
+    """Count vendor-reported token usage per provider call type (see /metrics).
+
+    `input_tokens` is the full prompt size; `cached_input_tokens` is the part
+    served from the provider's prompt cache and `cache_write_tokens` the part
+    written to it by this call.
+    """
+    metrics = get_metrics()
+    metrics.incr(f"ai.{call}.calls")
+    metrics.incr(f"ai.{call}.input_tokens", input_tokens)
+    metrics.incr(f"ai.{call}.output_tokens", output_tokens)
+    metrics.incr(f"ai.{call}.cached_input_tokens", cached_input_tokens)
+    metrics.incr(f"ai.{call}.cache_write_tokens", cache_write_tokens)
+    if cached_input_tokens:
+        metrics.incr(f"ai.{call}.cache_hits")
+
+
+def usage_summary() -> dict[str, dict[str, float]]:
+    """Per call type: calls, token totals, cache hit rate and cached share of input."""
+    counters = get_metrics().snapshot()["counters"]
+    calls = [name[len("ai."):-len(".calls")] for name in counters if name.startswith("ai.") and name.endswith(".calls")]
+    summary: dict[str, dict[str, float]] = {}
+    for call in calls:
+        totals = {
+            field: counters.get(f"ai.{call}.{field}", 0)
+            for field in ("calls", "input_tokens", "output_tokens", "cached_input_tokens", "cache_write_tokens")
+        }
+        hits = counters.get(f"ai.{call}.cache_hits", 0)
+        summary[call] = {
+            **totals,
+            "cache_hit_rate": hits / totals["calls"] if totals["calls"] else 0.0,
+            "cached_input_share": (
+                totals["cached_input_tokens"] / totals["input_tokens"] if totals["input_tokens"] else 0.0
+            ),
+        }
+    return summary
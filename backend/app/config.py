@@ -10,11 +10,48 @@ class Settings(BaseSettings):
         extra="ignore",  # silently ignore NEXT_PUBLIC_* and other non-backend vars
     )
 
-    ai_provider: Literal["claude", "openai"] = "claude"
+    ai_provider: Literal["claude", "openai", "mock", "composite"] = "claude"
     anthropic_api_key: str = ""
     openai_api_key: str = ""
     claude_model: str = "claude-sonnet-4-6"
     openai_model: str = "gpt-4o"
+    # Mock provider for load testing (AI_PROVIDER=mock); see app/ai/mock_provider.py
+    mock_seed: int = 0
+    mock_latency: dict[str, tuple[float, float]] = {}  # method -> (p50, p99) seconds
+    mock_latency_scale: float = 1.0  # multiplies every sampled latency; 0 disables sleeping
+    mock_error_rate: float = 0.0
+    mock_error_rates: dict[str, float] = {}  # per-method override of mock_error_rate
+    mock_stream: bool = True
+    # Provider request scheduler (app/ai/scheduler.py). Concurrency is per process;
+    # the rate limits are the vendor's, for all processes together (0 = unlimited).
+    # API processes get `ai_api_share` of them, split evenly over `ai_api_processes`;
+    # worker.py processes split the rest over `ai_worker_processes`
+    ai_max_concurrency: int = 16
+    ai_requests_per_minute: int = 0
+    ai_tokens_per_minute: int = 0
+    ai_api_share: float = 0.5
+    ai_api_processes: int = 1
+    ai_worker_processes: int = 1
+    # Extra attempts for a provider call whose structured output is still invalid
+    ai_output_retries: int = 1
+    # AI_PROVIDER=composite (app/ai/composite.py): members in priority order,
+    # hedged once the primary passes its own latency percentile
+    ai_composite_providers: list[Literal["claude", "openai", "mock"]] = ["claude", "openai"]
+    ai_hedge_percentile: float = 95.0
+    ai_hedge_initial_delay_seconds: float = 10.0  # hedge delay until enough latency samples exist
+    ai_breaker_failure_threshold: int = 5  # consecutive failures that open a member's circuit
+    ai_breaker_reset_seconds: float = 30.0
+    # Generate questions at CV upload for the user's likely mode/difficulty, so
+    # /start can serve them without waiting on the provider
+    speculative_questions_enabled: bool = False
+    # Question sets larger than this are generated as concurrent shards, each
+    # focused on a different category and skills; 0 generates in one call
+    question_shard_size: int = 5
+    # Reuse questions generated for similar CVs (app/services/question_bank.py);
+    # at least `personalized_count` per interview still come from the provider
+    question_bank_enabled: bool = False
+    question_bank_personalized_count: int = 2
+    question_bank_min_similarity: float = 0.3
     cv_session_ttl_seconds: int = 1800  # 30 minutes
     interview_session_ttl_seconds: int = 7200  # 2 hours
     cors_origins: list[str] = ["http://localhost:3000", "http://127.0.0.1:3000"]
@@ -27,6 +64,28 @@ class Settings(BaseSettings):
     google_client_id: str = ""
     google_client_secret: str = ""
     google_redirect_uri: str = "http://localhost:3000/auth/callback"
+    # CV parsing runs in a process pool (see app/services/parse_pool.py)
+    cv_parser_workers: int = 2
+    cv_parser_max_pending: int = 8  # uploads parsing or queued before we return 503
+    cv_parser_timeout_seconds: float = 20.0
+    # Evaluation job queue / worker (see worker.py)
+    evaluation_worker_concurrency: int = 4
+    evaluation_worker_poll_interval_seconds: float = 1.0
+    evaluation_worker_metrics_log_interval_seconds: float = 60.0  # 0 disables the periodic metrics log
+    evaluation_job_max_attempts: int = 5
+    evaluation_job_visibility_timeout_seconds: int = 120
+    evaluation_job_retry_backoff_seconds: float = 2.0
+    evaluation_job_retry_backoff_max_seconds: float = 300.0
+    # "per_answer" scores each answer as it is submitted; "batch" scores a whole
+    # session in one provider call when it ends, re-scoring malformed entries singly
+    evaluation_strategy: Literal["per_answer", "batch"] = "per_answer"
+    # When a session is evaluated, each unscored answer gets this many provider
+    # attempts with backoff, all within the deadline; answers still unscored
+    # after it are left to the job's next attempt (or a resume)
+    evaluation_answer_attempts: int = 3
+    evaluation_answer_deadline_seconds: float = 90.0
+    # Answers with fewer words than this are scored locally, without a provider call
+    evaluation_short_answer_words: int = 5
 
 
 @lru_cache
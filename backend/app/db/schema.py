@@ -1,4 +1,5 @@
 from app.db.connection import get_pool
+from app.models.cv import CVProfile
 
 _CREATE_TABLES = """
 CREATE TABLE IF NOT EXISTS users (
@@ -10,22 +11,113 @@ CREATE TABLE IF NOT EXISTS users (
     created_at      TIMESTAMPTZ DEFAULT NOW()
 );
 
+CREATE TABLE IF NOT EXISTS cv_profiles (
+    profile_hash  TEXT PRIMARY KEY,
+    cv_profile    JSONB NOT NULL,
+    created_at    TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- profile_hash is NULL while an asynchronous upload is still extracting;
+-- raw_text holds the parsed CV until the extraction job has finished with it
 CREATE TABLE IF NOT EXISTS cv_sessions (
-    token       TEXT PRIMARY KEY,
-    cv_profile  JSONB NOT NULL,
-    expires_at  TIMESTAMPTZ NOT NULL
+    token         TEXT PRIMARY KEY,
+    profile_hash  TEXT,
+    status        TEXT NOT NULL DEFAULT 'ready',
+    error         TEXT,
+    raw_text      TEXT,
+    expires_at    TIMESTAMPTZ NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_cv_sessions_expires
     ON cv_sessions (expires_at);
 
+CREATE TABLE IF NOT EXISTS cv_upload_cache (
+    cache_key     TEXT PRIMARY KEY,
+    raw_text      TEXT NOT NULL,
+    profile_hash  TEXT NOT NULL,
+    created_at    TIMESTAMPTZ DEFAULT NOW(),
+    last_hit_at   TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Questions generated at upload time for the interview the user is expected
+-- to start (see app/services/question_speculation.py); `questions` is NULL
+-- while generation is in flight
+CREATE TABLE IF NOT EXISTS speculative_questions (
+    token           TEXT PRIMARY KEY,
+    mode            TEXT NOT NULL,
+    difficulty      TEXT NOT NULL,
+    question_count  INT NOT NULL,
+    questions       JSONB,
+    expires_at      TIMESTAMPTZ NOT NULL,
+    created_at      TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Generated questions that don't name the candidate's employers or schools,
+-- reused for CVs with similar skills and role (see app/services/question_bank.py)
+CREATE TABLE IF NOT EXISTS question_bank (
+    id              BIGSERIAL PRIMARY KEY,
+    text_hash       TEXT NOT NULL,
+    mode            TEXT NOT NULL,
+    difficulty      TEXT NOT NULL,
+    text            TEXT NOT NULL,
+    category        TEXT NOT NULL,
+    follow_up_hint  TEXT,
+    skills          TEXT[] NOT NULL,
+    role            TEXT NOT NULL,
+    created_at      TIMESTAMPTZ DEFAULT NOW(),
+    UNIQUE (mode, difficulty, text_hash)
+);
+
+-- questions_updated_at: when the background question stream last appended to
+-- the question set, so a stream whose process died can be detected
 CREATE TABLE IF NOT EXISTS interview_sessions (
-    session_id  TEXT PRIMARY KEY,
-    data        JSONB NOT NULL,
-    expires_at  TIMESTAMPTZ NOT NULL
+    session_id              TEXT PRIMARY KEY,
+    data                    JSONB NOT NULL,
+    status                  TEXT NOT NULL DEFAULT 'active',
+    current_question_index  INT NOT NULL DEFAULT 0,
+    questions_updated_at    TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    expires_at              TIMESTAMPTZ NOT NULL
 );
 CREATE INDEX IF NOT EXISTS idx_interview_sessions_expires
     ON interview_sessions (expires_at);
 
+CREATE TABLE IF NOT EXISTS interview_answers (
+    session_id        TEXT NOT NULL,
+    position          INT NOT NULL,
+    question_id       TEXT NOT NULL,
+    transcript        TEXT NOT NULL,
+    duration_seconds  DOUBLE PRECISION NOT NULL DEFAULT 0,
+    created_at        TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (session_id, position)
+);
+
+CREATE TABLE IF NOT EXISTS answer_scores (
+    session_id  TEXT NOT NULL,
+    question_id TEXT NOT NULL,
+    data        JSONB NOT NULL,
+    created_at  TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (session_id, question_id)
+);
+
+CREATE TABLE IF NOT EXISTS evaluation_jobs (
+    job_id        BIGSERIAL PRIMARY KEY,
+    job_key       TEXT UNIQUE NOT NULL,
+    kind          TEXT NOT NULL,
+    session_id    TEXT NOT NULL,
+    payload       JSONB NOT NULL DEFAULT '{}'::jsonb,
+    status        TEXT NOT NULL DEFAULT 'queued',
+    attempts      INT NOT NULL DEFAULT 0,
+    max_attempts  INT NOT NULL,
+    run_after     TIMESTAMPTZ NOT NULL DEFAULT NOW(),
+    locked_until  TIMESTAMPTZ,
+    last_error    TEXT,
+    created_at    TIMESTAMPTZ DEFAULT NOW(),
+    updated_at    TIMESTAMPTZ DEFAULT NOW()
+);
+CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_claimable
+    ON evaluation_jobs (run_after) WHERE status IN ('queued', 'running');
+CREATE INDEX IF NOT EXISTS idx_evaluation_jobs_session
+    ON evaluation_jobs (session_id, kind);
+
 CREATE TABLE IF NOT EXISTS interview_results (
     session_id  TEXT PRIMARY KEY,
     data        JSONB NOT NULL,
@@ -36,18 +128,181 @@ CREATE TABLE IF NOT EXISTS interview_results (
 );
 CREATE INDEX IF NOT EXISTS idx_interview_results_user
     ON interview_results (user_id, created_at DESC);
+
+-- Dashboard coaching text, regenerated in the background whenever a new
+-- result lands; latest_session_id is the newest result it was written from
+CREATE TABLE IF NOT EXISTS user_recommendations (
+    user_id            TEXT PRIMARY KEY REFERENCES users(user_id) ON DELETE CASCADE,
+    latest_session_id  TEXT NOT NULL,
+    results_count      INT NOT NULL,
+    ai_recommendation  TEXT NOT NULL,
+    updated_at         TIMESTAMPTZ DEFAULT NOW()
+);
+
+-- Re-scored reports, kept next to the originals in interview_results; one row
+-- per session and rescoring version (see rescore.py)
+CREATE TABLE IF NOT EXISTS interview_results_versions (
+    session_id  TEXT NOT NULL,
+    version     TEXT NOT NULL,
+    model_id    TEXT NOT NULL,
+    data        JSONB NOT NULL,
+    created_at  TIMESTAMPTZ DEFAULT NOW(),
+    PRIMARY KEY (session_id, version)
+);
+
+-- Checkpoint of a rescoring run: `cursor` is the last session_id handed to a
+-- batch; batches still open at the vendor are in rescore_batches
+CREATE TABLE IF NOT EXISTS rescore_runs (
+    version          TEXT PRIMARY KEY,
+    model_id         TEXT NOT NULL,
+    cursor           TEXT NOT NULL DEFAULT '',
+    sessions_done    INT NOT NULL DEFAULT 0,
+    sessions_failed  INT NOT NULL DEFAULT 0,
+    answers_scored   INT NOT NULL DEFAULT 0,
+    started_at       TIMESTAMPTZ DEFAULT NOW(),
+    updated_at       TIMESTAMPTZ DEFAULT NOW(),
+    finished_at      TIMESTAMPTZ
+);
+
+CREATE TABLE IF NOT EXISTS rescore_batches (
+    batch_id      TEXT PRIMARY KEY,
+    version       TEXT NOT NULL REFERENCES rescore_runs(version) ON DELETE CASCADE,
+    stage         TEXT NOT NULL,
+    attempt       INT NOT NULL DEFAULT 1,
+    session_ids   JSONB NOT NULL,
+    answer_scores JSONB,
+    status        TEXT NOT NULL DEFAULT 'submitted',
+    submitted_at  TIMESTAMPTZ DEFAULT NOW(),
+    completed_at  TIMESTAMPTZ
+);
+CREATE INDEX IF NOT EXISTS idx_rescore_batches_open
+    ON rescore_batches (version) WHERE status = 'submitted';
+
+-- One-off data migrations that have already run (see init_db)
+CREATE TABLE IF NOT EXISTS schema_migrations (
+    name        TEXT PRIMARY KEY,
+    applied_at  TIMESTAMPTZ DEFAULT NOW()
+);
 """
 
-# Migrations for databases created before Google OAuth support
+# Migrations for databases created before Google OAuth support, for sessions
+# that still keep answers/status inside the JSONB document, and for CV
+# profiles that were copied inline instead of stored once in cv_profiles, and
+# for CV tokens from before asynchronous extraction
 _MIGRATIONS = """
 ALTER TABLE users ADD COLUMN IF NOT EXISTS google_id TEXT UNIQUE;
 ALTER TABLE users ALTER COLUMN hashed_password DROP NOT NULL;
+
+ALTER TABLE interview_sessions ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'active';
+ALTER TABLE interview_sessions ADD COLUMN IF NOT EXISTS current_question_index INT NOT NULL DEFAULT 0;
+ALTER TABLE interview_sessions ADD COLUMN IF NOT EXISTS questions_updated_at TIMESTAMPTZ NOT NULL DEFAULT NOW();
+INSERT INTO interview_answers (session_id, position, question_id, transcript, duration_seconds)
+SELECT s.session_id, a.ord - 1, a.value->>'question_id', a.value->>'transcript',
+       COALESCE((a.value->>'duration_seconds')::double precision, 0)
+FROM interview_sessions s,
+     jsonb_array_elements(s.data->'answers') WITH ORDINALITY AS a(value, ord)
+WHERE s.data ? 'answers'
+ON CONFLICT DO NOTHING;
+UPDATE interview_sessions
+SET status = COALESCE(data->>'status', status),
+    current_question_index = COALESCE((data->>'current_question_index')::int, current_question_index),
+    data = data - 'answers' - 'status' - 'current_question_index'
+WHERE data ? 'answers';
+
+-- Profiles embedded by older versions are moved to cv_profiles by
+-- _backfill_profile_hashes below
+ALTER TABLE cv_sessions ADD COLUMN IF NOT EXISTS profile_hash TEXT;
+
+ALTER TABLE cv_sessions ADD COLUMN IF NOT EXISTS status TEXT NOT NULL DEFAULT 'ready';
+ALTER TABLE cv_sessions ADD COLUMN IF NOT EXISTS error TEXT;
+ALTER TABLE cv_sessions ALTER COLUMN profile_hash DROP NOT NULL;
+ALTER TABLE cv_sessions ADD COLUMN IF NOT EXISTS raw_text TEXT;
 """
 
 
+# Rows moved per transaction by the one-off profile backfill
+_BACKFILL_BATCH_SIZE = 500
+_PROFILE_BACKFILL = "cv_profile_content_hash_backfill"
+
+
+async def _move_profiles(conn, rows, update_sql: str) -> None:
+    """Store each row's embedded profile under its content hash and point the row (key, hash) at it."""
+    profiles = [(row[0], CVProfile.model_validate(row[1])) for row in rows]
+    async with conn.transaction():
+        await conn.executemany(
+            """
+            INSERT INTO cv_profiles (profile_hash, cv_profile) VALUES ($1, $2)
+            ON CONFLICT (profile_hash) DO NOTHING
+            """,
+            [(p.content_hash(), p.model_dump(mode="json")) for _, p in profiles],
+        )
+        await conn.executemany(update_sql, [(key, p.content_hash()) for key, p in profiles])
+
+
+async def _backfill_profile_hashes(conn) -> None:
+    """Move CV profiles embedded in cv_sessions / interview_sessions rows into cv_profiles.
+
+    The key is CVProfile.content_hash(), the hash of the profile's canonical
+    JSON, so it has to be computed here: hashing the jsonb text in SQL gives a
+    different key, and new uploads of the same CV would never match it.
+    Rows are moved in keyset batches, and the run is recorded in
+    schema_migrations so later startups skip the scan. Every step is
+    idempotent, so processes starting together may both run it.
+    """
+    if await conn.fetchval("SELECT EXISTS (SELECT 1 FROM schema_migrations WHERE name = $1)", _PROFILE_BACKFILL):
+        return
+
+    legacy_cv_sessions = await conn.fetchval(
+        """
+        SELECT EXISTS (
+            SELECT 1 FROM information_schema.columns
+            WHERE table_name = 'cv_sessions' AND column_name = 'cv_profile'
+        )
+        """
+    )
+    if legacy_cv_sessions:
+        cursor = ""
+        while rows := await conn.fetch(
+            """
+            SELECT token, cv_profile FROM cv_sessions
+            WHERE token > $1 AND cv_profile IS NOT NULL
+            ORDER BY token LIMIT $2
+            """,
+            cursor,
+            _BACKFILL_BATCH_SIZE,
+        ):
+            await _move_profiles(conn, rows, "UPDATE cv_sessions SET profile_hash = $2 WHERE token = $1")
+            cursor = rows[-1][0]
+        await conn.execute("ALTER TABLE cv_sessions DROP COLUMN IF EXISTS cv_profile")
+
+    cursor = ""
+    while rows := await conn.fetch(
+        """
+        SELECT session_id, data->'cv_profile' FROM interview_sessions
+        WHERE session_id > $1 AND data ? 'cv_profile'
+        ORDER BY session_id LIMIT $2
+        """,
+        cursor,
+        _BACKFILL_BATCH_SIZE,
+    ):
+        await _move_profiles(
+            conn,
+            rows,
+            """
+            UPDATE interview_sessions
+            SET data = (data - 'cv_profile') || jsonb_build_object('cv_profile_hash', $2::text)
+            WHERE session_id = $1
+            """,
+        )
+        cursor = rows[-1][0]
+
+    await conn.execute("INSERT INTO schema_migrations (name) VALUES ($1) ON CONFLICT DO NOTHING", _PROFILE_BACKFILL)
+
+
 async def init_db() -> None:
     """Create all tables/indexes and apply column migrations idempotently."""
     pool = await get_pool()
     async with pool.acquire() as conn:
         await conn.execute(_CREATE_TABLES)
         await conn.execute(_MIGRATIONS)
+        await _backfill_profile_hashes(conn)
@@ -1,3 +1,7 @@
+import hashlib
+import json
+from enum import Enum
+
 from pydantic import BaseModel, Field
 from typing import Optional
 
@@ -25,8 +29,27 @@ class CVProfile(BaseModel):
     education: list[Education] = Field(default_factory=list)
     raw_text: str = ""
 
+    def content_hash(self) -> str:
+        """Stable SHA-256 of the profile's content, used as its storage key."""
+        canonical = json.dumps(self.model_dump(mode="json"), sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(canonical.encode()).hexdigest()
+
+
+class CVStatus(str, Enum):
+    EXTRACTING = "extracting"  # text parsed; the profile is still being extracted
+    READY = "ready"
+    FAILED = "failed"
+
 
 class CVUploadResponse(BaseModel):
     cv_session_token: str
-    cv_profile: CVProfile
+    status: CVStatus = CVStatus.READY
+    cv_profile: Optional[CVProfile] = None  # None while extracting
     message: str = "CV processed successfully"
+
+
+class CVStatusResponse(BaseModel):
+    cv_session_token: str
+    status: CVStatus
+    cv_profile: Optional[CVProfile] = None
+    error: Optional[str] = None
@@ -4,8 +4,6 @@ from enum import Enum
 import uuid
 from datetime import datetime
 
-from app.models.cv import CVProfile
-
 
 class InterviewMode(str, Enum):
     BEHAVIORAL = "behavioral"
@@ -44,16 +42,47 @@ class Answer(BaseModel):
 
 class InterviewSession(BaseModel):
     session_id: str = Field(default_factory=lambda: str(uuid.uuid4()))
-    cv_profile: CVProfile
+    cv_profile_hash: str  # key into cv_profiles; load via SessionStore.get_profile
     mode: InterviewMode
     difficulty: Difficulty
     questions: list[Question] = Field(default_factory=list)
+    # False while the rest of the question set is still streaming in
+    questions_complete: bool = True
+    question_count: Optional[int] = None  # requested size of the question set
     answers: list[Answer] = Field(default_factory=list)
     current_question_index: int = 0
     status: SessionStatus = SessionStatus.ACTIVE
     created_at: datetime = Field(default_factory=datetime.utcnow)
     user_id: Optional[str] = None  # set when authenticated user starts interview
 
+    @property
+    def total_questions(self) -> int:
+        """Expected number of questions, including ones still being generated."""
+        if self.questions_complete or self.question_count is None:
+            return len(self.questions)
+        return max(self.question_count, len(self.questions))
+
+
+class SessionProgress(BaseModel):
+    """Scalar state of a session plus the question at its current index.
+
+    Read from plain columns and narrow JSONB paths, so hot endpoints never
+    decode the full session document.
+    """
+    session_id: str
+    status: SessionStatus
+    current_question_index: int
+    questions_available: int
+    questions_complete: bool = True
+    question_count: Optional[int] = None
+    current_question: Optional[Question] = None  # None if finished or not generated yet
+
+    @property
+    def total_questions(self) -> int:
+        if self.questions_complete or self.question_count is None:
+            return self.questions_available
+        return max(self.question_count, self.questions_available)
+
 
 # --- DTOs ---
 
@@ -83,7 +112,14 @@ class RespondResponse(BaseModel):
     question_number: Optional[int] = None
     total_questions: Optional[int] = None
     is_final: bool = False
+    # The answer is recorded but the next question is still being generated;
+    # poll GET /api/interview/{session_id}/next for it
+    pending: bool = False
 
 
 class EndInterviewRequest(BaseModel):
     session_id: str
+
+
+class ResumeEvaluationRequest(BaseModel):
+    session_id: str
@@ -0,0 +1,28 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+from enum import Enum
+
+
+class JobKind(str, Enum):
+    EVALUATE_ANSWER = "evaluate_answer"
+    EVALUATE_SESSION = "evaluate_session"
+    REFRESH_COACHING = "refresh_coaching"
+    EXTRACT_CV = "extract_cv"
+
+
+class JobStatus(str, Enum):
+    QUEUED = "queued"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+
+class EvaluationJob(BaseModel):
+    job_id: int
+    kind: JobKind
+    session_id: str
+    payload: dict = Field(default_factory=dict)
+    status: JobStatus
+    attempts: int
+    max_attempts: int
+    last_error: Optional[str] = None
@@ -1,5 +1,7 @@
 from pydantic import BaseModel, Field
-from typing import Optional
+from typing import Any, NamedTuple, Optional
+
+from app.models.interview import Question, Answer, SessionStatus
 
 
 class AnswerScore(BaseModel):
@@ -10,6 +12,7 @@ class AnswerScore(BaseModel):
     feedback: str
     strengths: list[str] = Field(default_factory=list)
     improvements: list[str] = Field(default_factory=list)
+    category: Optional[str] = None  # the question's category; absent on older scores
 
 
 class CategoryScore(BaseModel):
@@ -36,6 +39,46 @@ class InterviewResults(BaseModel):
     summary: str = ""
 
 
+class ProvisionalAnswerScore(BaseModel):
+    """An answer's score before evaluation finishes, with the transcript features behind it."""
+    question_id: str
+    question_text: str
+    category: Optional[str] = None
+    score: int = Field(ge=0, le=100)
+    final: bool  # True once this is the provider's score rather than an estimate
+    word_count: int
+    words_per_minute: Optional[float] = None
+    filler_ratio: float
+    structure_coverage: float
+    hint_overlap: Optional[float] = None
+
+
+class ProvisionalResults(BaseModel):
+    session_id: str
+    status: SessionStatus
+    overall_score: int = Field(ge=0, le=100)
+    grade: str
+    answers: list[ProvisionalAnswerScore] = Field(default_factory=list)
+
+
+# Report fields the provider writes; the numbers are computed locally
+NARRATIVE_FIELDS = ("summary", "top_strengths", "top_improvements", "recommended_resources")
+
+
+class ScoreSummary(NamedTuple):
+    """A report's numbers, aggregated from its answer scores (see app/services/scoring.py)."""
+
+    overall_score: int
+    grade: str
+    category_scores: list[CategoryScore]
+
+
+def narrative_fields(results: InterviewResults) -> list[tuple[str, Any]]:
+    """The report's NARRATIVE_FIELDS as JSON-ready (field, value) pairs, in that order."""
+    data = results.model_dump(mode="json", include=set(NARRATIVE_FIELDS))
+    return [(field, data[field]) for field in NARRATIVE_FIELDS]
+
+
 def score_to_grade(score: int) -> str:
     if score >= 90:
         return "A"
@@ -47,3 +90,68 @@ def score_to_grade(score: int) -> str:
         return "D"
     else:
         return "F"
+
+
+def results_from_feedback(
+    session_id: str, answer_scores: list[AnswerScore], scores: ScoreSummary, data: dict
+) -> InterviewResults:
+    """Build the report from the computed scores and the narrative JSON a provider returned."""
+    return InterviewResults(
+        session_id=session_id,
+        overall_score=scores.overall_score,
+        grade=scores.grade,
+        category_scores=scores.category_scores,
+        answer_reviews=answer_scores,
+        top_strengths=data.get("top_strengths", []),
+        top_improvements=data.get("top_improvements", []),
+        recommended_resources=[Resource(**r) for r in data.get("recommended_resources", [])],
+        summary=data.get("summary", ""),
+    )
+
+
+def answer_score_from_data(question: Question, answer: Answer, data: object) -> AnswerScore:
+    """Build an AnswerScore from an evaluation a provider returned.
+
+    Raises ValueError (including pydantic's ValidationError) if it is malformed.
+    """
+    if not isinstance(data, dict):
+        raise ValueError("Evaluation is not an object")
+    try:
+        return AnswerScore(
+            question_id=question.question_id,
+            question_text=question.text,
+            transcript=answer.transcript,
+            score=int(data["score"]),
+            feedback=data["feedback"],
+            strengths=data.get("strengths", []),
+            improvements=data.get("improvements", []),
+            category=question.category,
+        )
+    except (KeyError, TypeError) as e:
+        raise ValueError(f"Invalid evaluation: {e!r}") from e
+
+
+def answer_scores_from_batch(
+    pairs: list[tuple[Question, Answer]], items: object
+) -> dict[str, AnswerScore]:
+    """Validate a batched evaluation response, keeping only well-formed entries.
+
+    Entries are matched to answers by ``question_id``; unknown ids, duplicates
+    and anything that doesn't validate as an AnswerScore are dropped, so the
+    caller can re-evaluate just those answers.
+    """
+    by_id = {question.question_id: (question, answer) for question, answer in pairs}
+    scores: dict[str, AnswerScore] = {}
+    if not isinstance(items, list):
+        return scores
+    for item in items:
+        if not isinstance(item, dict):
+            continue
+        question_id = item.get("question_id")
+        if question_id not in by_id or question_id in scores:
+            continue
+        try:
+            scores[question_id] = answer_score_from_data(*by_id[question_id], item)
+        except ValueError:
+            continue
+    return scores
@@ -0,0 +1,13 @@
+from typing import NamedTuple
+
+
+class Prompt(NamedTuple):
+    """A prompt split for provider-side prompt caching.
+
+    `system` holds only static instructions (role, guidance, rubric, output
+    schema) so identical prefixes are shared across calls and can be served
+    from the provider's cache; everything request-specific goes in `user`.
+    """
+
+    system: str
+    user: str
@@ -1,5 +1,8 @@
+from typing import Optional, Sequence, Union
+
 from app.models.cv import CVProfile
-from app.models.interview import InterviewMode, Difficulty
+from app.models.interview import InterviewMode, Difficulty, Question, Answer
+from app.prompts.base import Prompt
 
 DIFFICULTY_GUIDANCE = {
     "easy": "Ask straightforward questions suitable for entry-level candidates. Focus on fundamentals and basic scenarios.",
@@ -15,48 +18,131 @@ MODE_GUIDANCE = {
     "hr": "Ask HR-focused questions: motivation, career goals, salary expectations, company culture fit, strengths/weaknesses.",
 }
 
+# Shared by every evaluation call, whatever the mode and difficulty (those are
+# in the user turn), so it is one long, stable prefix that the provider can
+# cache; it is deliberately above the 1024-token caching minimum.
+_EVALUATION_GUIDE = """SCORING RUBRIC
+Score each answer from 0 to 100 against the band descriptions below, then adjust within the band
+for how well the answer fits the question's category and the interview's difficulty.
+- 90-100 Exceptional: answers the question directly and completely; gives concrete, specific
+  examples with the candidate's own actions and measurable outcomes; shows insight beyond the
+  obvious (trade-offs, lessons learned, what they would do differently); well organised.
+- 70-89 Good: covers the main points with at least one real example; reasoning is sound; some
+  detail, impact or reflection is missing, or the structure wanders in places.
+- 50-69 Adequate: addresses the question but stays general or hypothetical; examples are thin or
+  team-level ("we did") without the candidate's own contribution; little evidence of depth.
+- 30-49 Weak: only partly answers the question, misses key aspects, or is vague, generic or
+  largely off-topic; claims are not backed by any example or reasoning.
+- 0-29 Poor: irrelevant, incorrect on fundamentals, refuses or does not attempt the question, or
+  is too short to assess.
+
+WHAT TO LOOK FOR BY CATEGORY
+- Behavioral: a real past situation told in STAR order (Situation, Task, Action, Result); the
+  candidate's own actions rather than the team's; a concrete result, ideally quantified; reflection
+  on what they learned. Hypothetical answers to behavioural questions cap at the Adequate band.
+- Situational: a clear, realistic plan for the scenario; priorities and stakeholders identified;
+  risks and trade-offs acknowledged; sensible escalation; judgement consistent with the seniority
+  the difficulty implies.
+- Technical: correctness first; precise terminology; explains why, not only what; mentions edge
+  cases, complexity, failure modes or testing where relevant; ties the answer to real experience.
+  Confident but wrong statements score lower than an honest, partially correct answer.
+- System Design: clarifies requirements and scale before designing; names the main components and
+  data flow; chooses storage, caching, queuing and consistency models with reasons; discusses
+  bottlenecks, scaling, reliability and monitoring; weighs alternatives.
+- HR: honest, specific motivation; career goals that connect to the role; self-awareness about
+  strengths and weaknesses with examples; professional tone on topics such as salary and culture.
+
+CALIBRATION BY DIFFICULTY
+- easy: expect fundamentals and a clear, relevant example; do not penalise missing advanced depth.
+- medium: expect specific examples, sound reasoning and some discussion of trade-offs or impact.
+- hard: expect senior-level depth: trade-offs, edge cases, scale, leadership and measurable impact;
+  an answer that would be Good at medium difficulty is usually Adequate here.
+
+TRANSCRIPTS
+Answers are transcribed from speech. Ignore filler words, false starts, repetition, punctuation
+and transcription errors; judge the content, not the wording. Do not reward length for its own
+sake: a concise answer that covers the points beats a long one that circles them.
+
+CALIBRATION EXAMPLES
+1. Behavioral, medium. Question: "Tell me about a time you disagreed with a teammate."
+   Answer: "We argued about the API design. I think we eventually agreed and it was fine."
+   Score 35: on topic but no situation detail, no actions of their own and no result.
+2. Behavioral, medium. Same question. Answer describes a disagreement over a database migration
+   plan, how the candidate set up a short spike to compare both approaches, shared the numbers
+   with the team, and the migration shipped two weeks early; mentions they now prototype earlier.
+   Score 86: full STAR structure, own actions, measurable result and reflection; could say more
+   about handling the teammate's concerns.
+3. Technical, hard. Question: "How would you find a memory leak in a long-running service?"
+   Answer: "Restart it regularly and add more memory."
+   Score 12: avoids the question and offers no diagnosis.
+4. Technical, hard. Same question. Answer walks through confirming growth with metrics, taking
+   heap snapshots at intervals and diffing them, suspecting caches and unbounded queues,
+   reproducing under load, and adding an alert on RSS growth after the fix.
+   Score 92: systematic, specific tools and causes, verification and prevention.
+
+FEEDBACK
+Write feedback addressed to the candidate in the second person. Be specific to their answer:
+quote or paraphrase what they said. Strengths and improvements must be concrete and actionable,
+for example "Quantify the result (e.g. latency or revenue impact)" rather than "Add more detail"."""
+
+_SCORE_FIELDS = """- "score": integer 0-100
+- "feedback": 2-3 sentence overall assessment (string)
+- "strengths": array of 1-3 specific strengths demonstrated (strings)
+- "improvements": array of 1-3 specific areas for improvement (strings)"""
+
 
 def build_question_prompt(
     cv_profile: CVProfile,
     mode: InterviewMode,
     difficulty: Difficulty,
     count: int,
-) -> str:
+    focus: Optional[str] = None,
+    avoid: Sequence[str] = (),
+) -> Prompt:
     skills = ", ".join(cv_profile.skills[:15]) if cv_profile.skills else "general skills"
     experience_summary = "\n".join(
         f"- {exp.role} at {exp.company} ({exp.duration}): {', '.join(exp.highlights[:2])}"
         for exp in cv_profile.work_experience[:3]
     ) or "No specific work experience listed."
 
-    return f"""You are an expert interview coach generating personalised interview questions.
-
-CANDIDATE PROFILE:
-- Name: {cv_profile.name}
-- Current Role: {cv_profile.current_role or "Not specified"}
-- Years of Experience: {cv_profile.years_of_experience}
-- Key Skills: {skills}
-- Work Experience:
-{experience_summary}
+    system = f"""You are an expert interview coach generating personalised interview questions.
 
 INTERVIEW SETTINGS:
 - Mode: {mode.value.upper()} — {MODE_GUIDANCE.get(mode.value, "")}
 - Difficulty: {difficulty.value.upper()} — {DIFFICULTY_GUIDANCE.get(difficulty.value, "")}
-- Number of questions to generate: {count}
 
 INSTRUCTIONS:
-Generate exactly {count} interview questions tailored specifically to this candidate's background.
+Generate exactly the number of interview questions requested, tailored specifically to the candidate's background.
 Each question must reference their actual skills, experience, or background where possible.
 
-Return a JSON array with exactly {count} objects. Each object must have:
+Return a JSON object with a single "questions" field: an array with exactly that many objects.
+Each object must have:
 - "text": the full question text (string)
 - "category": one of "Behavioral", "Technical", "System Design", "HR", "Situational" (string)
 - "follow_up_hint": a brief hint for the interviewer on what a good answer should include (string)
 
 Return ONLY valid JSON. No markdown fences, no explanation.
 Example format:
-[
+{{"questions": [
   {{"text": "Question text here?", "category": "Behavioral", "follow_up_hint": "Look for STAR format"}}
-]"""
+]}}"""
+
+    user = f"""CANDIDATE PROFILE:
+- Name: {cv_profile.name}
+- Current Role: {cv_profile.current_role or "Not specified"}
+- Years of Experience: {cv_profile.years_of_experience}
+- Key Skills: {skills}
+- Work Experience:
+{experience_summary}
+
+Number of questions to generate: {count}"""
+    # Per-request steering stays in the user turn so the system prefix is the same for every shard
+    if focus:
+        user += f"\nFocus these questions on: {focus}"
+    if avoid:
+        user += "\nDo not repeat or closely paraphrase any of these questions:\n" + "\n".join(f"- {q}" for q in avoid)
+
+    return Prompt(system, user)
 
 
 def build_evaluation_prompt(
@@ -65,32 +151,64 @@ def build_evaluation_prompt(
     category: str,
     mode: InterviewMode,
     candidate_name: str,
-    difficulty: str = "medium",
-) -> str:
-    return f"""You are a senior interview evaluator assessing a candidate's answer.
+    difficulty: Union[Difficulty, str],
+) -> Prompt:
+    """Prompt to score one answer; live evaluation and rescoring both build it here."""
+    system = f"""You are a senior interview evaluator assessing a candidate's answer.
 
+Evaluate the answer on a scale of 0-100 and provide structured feedback.
+
+{_EVALUATION_GUIDE}
+
+Return a JSON object with exactly these fields:
+{_SCORE_FIELDS}
+
+Return ONLY valid JSON. No markdown fences."""
+
+    user = f"""INTERVIEW MODE: {mode.value}
+DIFFICULTY: {Difficulty(difficulty).value}
 QUESTION: {question_text}
 CATEGORY: {category}
-INTERVIEW MODE: {mode.value}
-DIFFICULTY: {difficulty}
 CANDIDATE: {candidate_name}
 
 CANDIDATE'S ANSWER (transcribed from speech):
-\"\"\"{transcript}\"\"\"
+\"\"\"{transcript}\"\"\""""
 
-Evaluate this answer on a scale of 0-100 and provide structured feedback.
+    return Prompt(system, user)
 
-Return a JSON object with exactly these fields:
-- "score": integer 0-100
-- "feedback": 2-3 sentence overall assessment (string)
-- "strengths": array of 1-3 specific strengths demonstrated (strings)
-- "improvements": array of 1-3 specific areas for improvement (strings)
 
-Scoring rubric:
-- 90-100: Exceptional, exceeds expectations with concrete examples and deep insight
-- 70-89: Good, covers main points with some examples
-- 50-69: Adequate, addresses the question but lacks depth or specifics
-- 30-49: Weak, misses key aspects or gives vague answers
-- 0-29: Poor, irrelevant or very insufficient answer
+def build_batch_evaluation_prompt(
+    pairs: list[tuple[Question, Answer]],
+    mode: InterviewMode,
+    candidate_name: str,
+    difficulty: Union[Difficulty, str],
+) -> Prompt:
+    """Score every answer of a session in one call; mirrors build_evaluation_prompt."""
+    answers_text = "\n\n".join(
+        f"[{question.question_id}]\n"
+        f"QUESTION: {question.text}\n"
+        f"CATEGORY: {question.category}\n"
+        f"CANDIDATE'S ANSWER (transcribed from speech):\n\"\"\"{answer.transcript}\"\"\""
+        for question, answer in pairs
+    )
+
+    system = f"""You are a senior interview evaluator assessing a candidate's answers.
+
+Evaluate each answer independently on a scale of 0-100 and provide structured feedback.
+
+{_EVALUATION_GUIDE}
+
+Return a JSON object with a single "evaluations" field: an array with one object per answer,
+in the order given, each with exactly these fields:
+- "question_id": the id shown in brackets above the question (string)
+{_SCORE_FIELDS}
 
 Return ONLY valid JSON. No markdown fences."""
+
+    user = f"""INTERVIEW MODE: {mode.value}
+DIFFICULTY: {Difficulty(difficulty).value}
+CANDIDATE: {candidate_name}
+
+{answers_text}"""
+
+    return Prompt(system, user)
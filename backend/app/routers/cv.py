@@ -1,18 +1,28 @@
-from fastapi import APIRouter, UploadFile, File, HTTPException
+from fastapi import APIRouter, UploadFile, File, HTTPException, Request
 
-from app.models.cv import CVUploadResponse
-from app.services.cv_parser import extract_raw_text
+from app.models.cv import CVStatus, CVStatusResponse, CVUploadResponse
+from app.services.parse_pool import ParserSaturatedError, ParseTimeoutError, get_parse_pool
 from app.services.session_store import get_session_store
+from app.services.cv_cache import get_cv_upload_cache, upload_cache_key
+from app.services.cv_extraction import enqueue_cv_extraction, speculate_questions
 from app.ai.factory import get_ai_provider
+from app.auth.jwt_utils import get_optional_user_id
 
 router = APIRouter()
 
 ALLOWED_EXTENSIONS = {".pdf", ".docx", ".doc", ".txt"}
 MAX_FILE_SIZE = 5 * 1024 * 1024  # 5 MB
 
-
 @router.post("/upload", response_model=CVUploadResponse)
-async def upload_cv(file: UploadFile = File(...)):
+async def upload_cv(request: Request, file: UploadFile = File(...), async_extraction: bool = False):
+    """Parse a CV and extract its profile.
+
+    With ``?async_extraction=true`` the response comes back as soon as the
+    text is parsed, with status "extracting" and no profile. The text is
+    stored with the token and the profile is extracted by a worker job, so
+    it survives restarts of this process. Poll ``GET /api/cv/{token}``, or
+    just call /api/interview/start, which waits for the extraction to finish.
+    """
     filename = file.filename or "upload"
     ext = "." + filename.rsplit(".", 1)[-1].lower() if "." in filename else ""
     if ext not in ALLOWED_EXTENSIONS:
@@ -27,22 +37,63 @@ async def upload_cv(file: UploadFile = File(...)):
     if not file_bytes:
         raise HTTPException(status_code=400, detail="Uploaded file is empty.")
 
+    store = get_session_store()
+    provider = get_ai_provider()
+    cache = get_cv_upload_cache()
+    cache_key = upload_cache_key(file_bytes, provider)
+    user_id = get_optional_user_id(request)
+
+    # Seen this exact file with the current model and prompt: skip parsing and extraction
+    cached = await cache.get(cache_key)
+    if cached is not None:
+        token = await store.store_cv_profile(cached.cv_profile)
+        speculate_questions(token, cached.cv_profile, user_id)
+        return CVUploadResponse(cv_session_token=token, cv_profile=cached.cv_profile)
+
     try:
-        raw_text = extract_raw_text(filename, file_bytes)
+        raw_text = await get_parse_pool().extract(filename, file_bytes)
+    except ParserSaturatedError:
+        raise HTTPException(
+            status_code=503,
+            detail="CV parser is busy. Please try again in a few seconds.",
+            headers={"Retry-After": "5"},
+        )
+    except ParseTimeoutError:
+        raise HTTPException(status_code=422, detail="File took too long to parse.")
     except Exception as e:
         raise HTTPException(status_code=422, detail=f"Failed to parse file: {e}")
 
     if not raw_text.strip():
         raise HTTPException(status_code=422, detail="Could not extract any text from the uploaded file.")
 
-    provider = get_ai_provider()
+    if async_extraction:
+        token = await store.create_pending_cv_token(raw_text)
+        await enqueue_cv_extraction(token, cache_key, user_id)
+        return CVUploadResponse(
+            cv_session_token=token,
+            status=CVStatus.EXTRACTING,
+            message="CV received; extracting profile",
+        )
+
     try:
         cv_profile = await provider.extract_cv_profile(raw_text)
         cv_profile.raw_text = raw_text
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"AI CV extraction failed: {e}")
 
-    store = get_session_store()
     token = await store.store_cv_profile(cv_profile)
+    await cache.put(cache_key, raw_text, cv_profile)
+    speculate_questions(token, cv_profile, user_id)
 
     return CVUploadResponse(cv_session_token=token, cv_profile=cv_profile)
+
+
+@router.get("/{token}", response_model=CVStatusResponse)
+async def get_cv_status(token: str):
+    store = get_session_store()
+    state = await store.get_cv_token_state(token)
+    if state is None:
+        raise HTTPException(status_code=404, detail="CV session token not found or expired.")
+    cv_profile = await store.get_profile(state.profile_hash) if state.profile_hash else None
+    return CVStatusResponse(cv_session_token=token, status=state.status, cv_profile=cv_profile, error=state.error)
+
@@ -1,5 +1,11 @@
 import asyncio
-from fastapi import APIRouter, HTTPException, BackgroundTasks, Response, Request
+import json
+import logging
+import time
+from typing import AsyncIterator, Optional
+
+from fastapi import APIRouter, HTTPException, Response, Request
+from fastapi.responses import StreamingResponse
 
 from app.models.interview import (
     InterviewSession,
@@ -9,131 +15,302 @@ from app.models.interview import (
     RespondRequest,
     RespondResponse,
     EndInterviewRequest,
+    ResumeEvaluationRequest,
     Answer,
+    Question,
+    SessionProgress,
+)
+from app.models.cv import CVStatus
+from app.models.results import AnswerScore, ProvisionalResults
+from app.services.session_store import CVTokenState, get_session_store
+from app.services.question_generator import stream_questions
+from app.services.question_speculation import get_question_speculator
+from app.services.evaluator import (
+    enqueue_answer_evaluation,
+    enqueue_session_evaluation,
+    resume_session_evaluation,
 )
-from app.services.session_store import get_session_store
-from app.services.question_generator import generate_questions
-from app.services.evaluator import evaluate_session
+from app.services.metrics import get_metrics
+from app.services.results_notifier import get_results_notifier
+from app.services.transcript_features import provisional_results
 from app.auth.jwt_utils import get_optional_user_id
+from app.config import get_settings
+
+logger = logging.getLogger(__name__)
 
 router = APIRouter()
 
+# How long /start waits for a CV uploaded with async_extraction to be ready
+_CV_EXTRACTION_WAIT_TIMEOUT_SECONDS = 60.0
+
+# How long /respond (and each /next poll) waits for a question that is still
+# being generated before answering `pending`
+_QUESTION_WAIT_TIMEOUT_SECONDS = 30.0
+_NEXT_QUESTION_WAIT_TIMEOUT_SECONDS = 10.0
+# An incomplete question set that gains no question for this long is treated
+# as complete: the process streaming it has most likely died
+_QUESTION_STALL_SECONDS = 120.0
+
+# Results stream: comment line to keep proxies from closing an idle connection,
+# and an upper bound after which the client falls back to polling
+_STREAM_KEEPALIVE_SECONDS = 15.0
+_STREAM_MAX_SECONDS = 600.0
+
+# Strong references to background question streams so they aren't GC'd mid-flight
+_question_tasks: set[asyncio.Task] = set()
+
 
 @router.post("/start", response_model=StartInterviewResponse)
 async def start_interview(req: StartInterviewRequest, request: Request):
     store = get_session_store()
 
-    cv_profile = await store.get_cv_profile(req.cv_session_token)
+    state = await _wait_for_cv_extraction(req.cv_session_token)
+    if state is not None and state.status == CVStatus.FAILED:
+        raise HTTPException(status_code=422, detail=state.error or "CV extraction failed.")
+    if state is not None and state.status == CVStatus.EXTRACTING:
+        raise HTTPException(
+            status_code=503,
+            detail="CV is still being processed. Please try again shortly.",
+            headers={"Retry-After": "5"},
+        )
+    profile_hash = state.profile_hash if state is not None else None
+    cv_profile = await store.get_profile(profile_hash) if profile_hash else None
     if cv_profile is None:
         raise HTTPException(status_code=404, detail="CV session token not found or expired.")
 
-    try:
-        questions = await generate_questions(
-            cv_profile=cv_profile,
-            mode=req.mode,
-            difficulty=req.difficulty,
-            count=req.question_count,
+    if get_settings().speculative_questions_enabled:
+        speculated = await get_question_speculator().take(
+            req.cv_session_token, req.mode, req.difficulty, req.question_count
         )
+        if speculated is not None:
+            session = InterviewSession(
+                cv_profile_hash=profile_hash,
+                mode=req.mode,
+                difficulty=req.difficulty,
+                questions=speculated,
+                questions_complete=True,
+                question_count=req.question_count,
+                user_id=get_optional_user_id(request),
+            )
+            await store.store_session(session)
+            return StartInterviewResponse(
+                session_id=session.session_id,
+                question=speculated[0],
+                question_number=1,
+                total_questions=session.total_questions,
+            )
+
+    question_stream = stream_questions(
+        cv_profile=cv_profile,
+        mode=req.mode,
+        difficulty=req.difficulty,
+        count=req.question_count,
+    )
+    try:
+        first_question = await anext(question_stream, None)
     except Exception as e:
+        await question_stream.aclose()
         raise HTTPException(status_code=500, detail=f"Question generation failed: {e}")
 
-    if not questions:
+    if first_question is None:
         raise HTTPException(status_code=500, detail="No questions generated.")
 
     session = InterviewSession(
-        cv_profile=cv_profile,
+        cv_profile_hash=profile_hash,
         mode=req.mode,
         difficulty=req.difficulty,
-        questions=questions,
+        questions=[first_question],
+        questions_complete=req.question_count == 1,
+        question_count=req.question_count,
         user_id=get_optional_user_id(request),
     )
     await store.store_session(session)
 
+    if session.questions_complete:
+        await question_stream.aclose()
+    else:
+        # Return the first question now; the rest keep streaming into the session
+        task = asyncio.create_task(_fill_questions(session.session_id, question_stream))
+        _question_tasks.add(task)
+        task.add_done_callback(_question_tasks.discard)
+
     return StartInterviewResponse(
         session_id=session.session_id,
-        question=questions[0],
+        question=first_question,
         question_number=1,
-        total_questions=len(questions),
+        total_questions=session.total_questions,
     )
 
 
+async def _fill_questions(session_id: str, questions: AsyncIterator[Question]) -> None:
+    """Append each remaining streamed question to the stored session as it arrives."""
+    store = get_session_store()
+    try:
+        async for question in questions:
+            await store.append_questions(session_id, [question])
+    except Exception:
+        # The interview ends after the questions we did receive: marking the
+        # set complete below is what tells a waiting /respond or /next
+        logger.exception("Question generation failed for session %s", session_id)
+        get_metrics().incr("questions.stream_failures")
+    finally:
+        try:
+            await store.append_questions(session_id, [], complete=True)
+        except Exception:
+            logger.exception("Could not mark the question set of session %s complete", session_id)
+
+
+async def _wait_for_cv_extraction(token: str) -> Optional[CVTokenState]:
+    """The CV token's state once its extraction has finished, or as it stands at the timeout.
+
+    Rather than polling, the request waits for the notification sent when the
+    token is completed or failed, and re-reads the state only when one arrives.
+    """
+    store = get_session_store()
+    deadline = time.monotonic() + _CV_EXTRACTION_WAIT_TIMEOUT_SECONDS
+    async with get_results_notifier().subscribe(token) as inbox:
+        state = await store.get_cv_token_state(token)
+        while state is not None and state.status == CVStatus.EXTRACTING:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                break
+            try:
+                await asyncio.wait_for(inbox.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                break
+            state = await store.get_cv_token_state(token)  # finished, or a resync
+    return state
+
+
+async def _wait_for_next_question(session_id: str, timeout: float) -> Optional[SessionProgress]:
+    """Progress once the current question exists or generation has finished; None at the timeout.
+
+    Woken by the notification append_questions sends rather than by polling.
+    """
+    store = get_session_store()
+    deadline = time.monotonic() + timeout
+    async with get_results_notifier().subscribe(session_id) as inbox:
+        while True:
+            progress = await store.get_progress(session_id)
+            if progress is None or progress.current_question is not None or progress.questions_complete:
+                return progress
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return None
+            try:
+                await asyncio.wait_for(inbox.get(), timeout=remaining)
+            except asyncio.TimeoutError:
+                return None
+
+
 @router.post("/respond", response_model=RespondResponse)
 async def respond_to_question(req: RespondRequest):
     store = get_session_store()
-    session = await store.get_session(req.session_id)
-    if session is None:
-        raise HTTPException(status_code=404, detail="Interview session not found or expired.")
-    if session.status != SessionStatus.ACTIVE:
-        raise HTTPException(status_code=409, detail=f"Session is not active (status: {session.status}).")
-
-    session.answers.append(
-        Answer(
-            question_id=req.question_id,
-            transcript=req.transcript,
-            duration_seconds=req.duration_seconds,
-        )
+    answer = Answer(
+        question_id=req.question_id,
+        transcript=req.transcript,
+        duration_seconds=req.duration_seconds,
     )
-    session.current_question_index += 1
+    try:
+        progress = await store.record_answer(req.session_id, answer)
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Interview session not found or expired.")
+
+    await enqueue_answer_evaluation(req.session_id, answer.question_id)
+    return await _next_question_response(req.session_id, progress, _QUESTION_WAIT_TIMEOUT_SECONDS)
+
+
+@router.get("/{session_id}/next", response_model=RespondResponse)
+async def next_question(session_id: str):
+    """The session's current question, for a client told by /respond that it was `pending`."""
+    progress = await get_session_store().get_progress(session_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Interview session not found or expired.")
+    return await _next_question_response(session_id, progress, _NEXT_QUESTION_WAIT_TIMEOUT_SECONDS)
 
-    next_index = session.current_question_index
-    if next_index < len(session.questions):
-        next_question = session.questions[next_index]
-        await store.update_session(session)
+
+async def _next_question_response(session_id: str, progress: SessionProgress, wait: float) -> RespondResponse:
+    """Respond with the current question, waiting up to `wait` seconds for it to be generated."""
+    store = get_session_store()
+    if progress.current_question is None and not progress.questions_complete:
+        waited = await _wait_for_next_question(session_id, wait)
+        if waited is None and await store.complete_stalled_questions(session_id, _QUESTION_STALL_SECONDS):
+            logger.warning("Question generation for session %s stalled; ending after the stored questions", session_id)
+            get_metrics().incr("questions.stalled_sets")
+            waited = await store.get_progress(session_id)
+        if waited is None:
+            # The answer is already recorded; the client polls /next rather than resubmitting
+            return RespondResponse(
+                question_number=progress.current_question_index + 1,
+                total_questions=progress.total_questions,
+                pending=True,
+            )
+        progress = waited
+
+    if progress.current_question is not None:
         return RespondResponse(
-            next_question=next_question,
-            question_number=next_index + 1,
-            total_questions=len(session.questions),
+            next_question=progress.current_question,
+            question_number=progress.current_question_index + 1,
+            total_questions=progress.total_questions,
             is_final=False,
         )
-    else:
-        session.status = SessionStatus.COMPLETED
-        await store.update_session(session)
-        return RespondResponse(is_final=True, total_questions=len(session.questions))
+    if progress.status == SessionStatus.ACTIVE:
+        # Generation ended early, after the answer was recorded
+        await store.set_status(session_id, SessionStatus.COMPLETED, only_if=SessionStatus.ACTIVE)
+    return RespondResponse(is_final=True, total_questions=progress.questions_available)
 
 
 @router.post("/end")
-async def end_interview(req: EndInterviewRequest, background_tasks: BackgroundTasks):
+async def end_interview(req: EndInterviewRequest):
     store = get_session_store()
-    session = await store.get_session(req.session_id)
-    if session is None:
+    progress = await store.get_progress(req.session_id)
+    if progress is None:
         raise HTTPException(status_code=404, detail="Interview session not found or expired.")
 
-    if session.status not in (SessionStatus.ACTIVE, SessionStatus.COMPLETED):
-        raise HTTPException(status_code=409, detail=f"Session already in status: {session.status}.")
+    if progress.status not in (SessionStatus.ACTIVE, SessionStatus.COMPLETED):
+        raise HTTPException(status_code=409, detail=f"Session already in status: {progress.status}.")
 
-    if not session.answers:
+    if progress.current_question_index == 0:
         raise HTTPException(status_code=400, detail="No answers recorded — cannot evaluate.")
 
-    session.status = SessionStatus.EVALUATING
-    await store.update_session(session)
+    await store.set_status(req.session_id, SessionStatus.EVALUATING)
 
-    background_tasks.add_task(_run_evaluation, session)
-    return {"message": "Evaluation queued.", "session_id": session.session_id}
+    # Picked up by the evaluation worker (worker.py), not this process
+    await enqueue_session_evaluation(req.session_id)
+    return {"message": "Evaluation queued.", "session_id": req.session_id}
 
 
-async def _run_evaluation(session: InterviewSession):
+@router.post("/resume")
+async def resume_evaluation(req: ResumeEvaluationRequest):
+    """Retry a failed evaluation; only answers that have no stored score yet are scored again."""
     store = get_session_store()
-    try:
-        await evaluate_session(session)
-        session.status = SessionStatus.EVALUATED
-    except Exception:
-        session.status = SessionStatus.ERROR
-    await store.update_session(session)
+    progress = await store.get_progress(req.session_id)
+    if progress is None:
+        raise HTTPException(status_code=404, detail="Interview session not found or expired.")
+
+    if not await resume_session_evaluation(req.session_id):
+        raise HTTPException(
+            status_code=409,
+            detail=f"Only failed evaluations can be resumed; session is {progress.status.value}.",
+        )
+    return {"message": "Evaluation resumed.", "session_id": req.session_id}
 
 
 @router.get("/{session_id}/results")
 async def get_results(session_id: str, response: Response):
     store = get_session_store()
-    session = await store.get_session(session_id)
+    progress = await store.get_progress(session_id)
 
-    if session is None:
+    if progress is None:
         raise HTTPException(status_code=404, detail="Session not found or expired.")
 
-    if session.status == SessionStatus.EVALUATING:
+    if progress.status == SessionStatus.EVALUATING:
         response.status_code = 202
         return {"status": "evaluating", "session_id": session_id}
 
-    if session.status == SessionStatus.ERROR:
+    if progress.status == SessionStatus.ERROR:
         raise HTTPException(status_code=500, detail="Evaluation failed.")
 
     results = await store.get_results(session_id)
@@ -142,3 +319,95 @@ async def get_results(session_id: str, response: Response):
         return {"status": "evaluating", "session_id": session_id}
 
     return results
+
+
+@router.get("/{session_id}/results/provisional", response_model=ProvisionalResults)
+async def get_provisional_results(session_id: str):
+    """Scores estimated from the transcripts, for the results page to show while evaluation runs.
+
+    Answers the provider has already scored carry that score and `final: true`.
+    """
+    store = get_session_store()
+    answered = await store.get_answered_questions(session_id)
+    if answered is None:
+        raise HTTPException(status_code=404, detail="Session not found or expired.")
+    return provisional_results(session_id, answered, await store.get_answer_scores(session_id))
+
+
+def _sse(event: str, data: dict | list) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def _reviews_event(scores: dict[str, AnswerScore]) -> str:
+    return _sse("answer_reviews", [score.model_dump(mode="json") for score in scores.values()])
+
+
+@router.get("/{session_id}/results/stream")
+async def stream_results(session_id: str):
+    """Server-sent events for a session's report, as it is produced.
+
+    Events: `answer_reviews` (the per-answer scores, once all exist), then one
+    `field` per overall-feedback field while the provider streams it, then
+    `results` with the complete report, or `error`. The request registers with
+    the process-wide LISTEN connection and only queries the database when a
+    notification for this session needs it.
+    """
+    store = get_session_store()
+    notifier = get_results_notifier()
+
+    async def events() -> AsyncIterator[str]:
+        reviews_sent = False
+
+        async with notifier.subscribe(session_id) as inbox:
+            deadline = time.monotonic() + _STREAM_MAX_SECONDS
+            recheck = True
+            while True:
+                if recheck:
+                    # Results go first: they are stored before the status flips
+                    results = await store.get_results(session_id)
+                    if results is not None:
+                        yield _sse("results", results.model_dump(mode="json"))
+                        return
+                    progress = await store.get_progress(session_id)
+                    if progress is None:
+                        yield _sse("error", {"detail": "Session not found or expired."})
+                        return
+                    if progress.status == SessionStatus.ERROR:
+                        yield _sse("error", {"detail": "Evaluation failed."})
+                        return
+                    if not reviews_sent and progress.status == SessionStatus.EVALUATING:
+                        # Joined late: the reviews may already be complete
+                        scores = await store.get_answer_scores(session_id)
+                        if scores and len(scores) >= progress.current_question_index:
+                            reviews_sent = True
+                            yield _reviews_event(scores)
+                    recheck = False
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    yield _sse("timeout", {"session_id": session_id})
+                    return
+                try:
+                    message = await asyncio.wait_for(
+                        inbox.get(), timeout=min(_STREAM_KEEPALIVE_SECONDS, remaining)
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+
+                event = message.get("event")
+                if event == "answer_reviews":
+                    if not reviews_sent:
+                        reviews_sent = True
+                        yield _reviews_event(await store.get_answer_scores(session_id))
+                elif event == "field":
+                    if not message.get("truncated"):
+                        yield _sse("field", {"field": message["field"], "value": message["value"]})
+                else:
+                    recheck = True  # results stored, status change, or resync
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
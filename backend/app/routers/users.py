@@ -1,12 +1,10 @@
-import json
 from collections import Counter
 from fastapi import APIRouter, HTTPException, Request
 
 from app.models.user import SessionSummary, OverviewResponse
 from app.services.user_store import get_user_store
 from app.auth.jwt_utils import get_optional_user_id
-from app.ai.factory import get_ai_provider
-from app.prompts.evaluation_prompts import build_overview_prompt
+from app.services.coaching import enqueue_recommendation_refresh
 
 router = APIRouter()
 
@@ -42,13 +40,12 @@ async def get_history(request: Request):
 @router.get("/me/overview", response_model=OverviewResponse)
 async def get_overview(request: Request):
     user_id = _require_user(request)
-    store = get_user_store()
 
-    user = await store.get_user_by_id(user_id)
-    if not user:
+    dashboard = await get_user_store().get_dashboard(user_id)
+    if dashboard is None:
         raise HTTPException(status_code=404, detail="User not found.")
 
-    history = await store.get_history(user_id)
+    history, ai_recommendation, recommendation_session_id = dashboard
     if not history:
         return OverviewResponse(
             total_sessions=0,
@@ -61,46 +58,23 @@ async def get_overview(request: Request):
             sessions=[],
         )
 
-    scores = [r.overall_score for r, _, _ in history]
-    all_strengths = [s for r, _, _ in history for s in r.top_strengths]
-    all_improvements = [s for r, _, _ in history for s in r.top_improvements]
+    latest_session_id = history[-1].session_id
+    if recommendation_session_id != latest_session_id:
+        # Normally queued when the result was stored; this covers older results
+        # and refreshes that failed. Idempotent per (user, latest session).
+        await enqueue_recommendation_refresh(user_id, latest_session_id)
+    if not ai_recommendation:
+        ai_recommendation = "Your personalised coaching recommendation is being prepared — check back shortly."
 
-    sessions = [
-        SessionSummary(
-            session_id=results.session_id,
-            mode=mode,
-            difficulty=difficulty,
-            overall_score=results.overall_score,
-            grade=results.grade,
-            total_questions=len(results.answer_reviews),
-            date="",
-            top_strengths=results.top_strengths[:2],
-            top_improvements=results.top_improvements[:2],
-        )
-        for results, mode, difficulty in reversed(history)
-    ]
+    scores = [s.overall_score for s in history]
+    all_strengths = [x for s in history for x in s.top_strengths]
+    all_improvements = [x for s in history for x in s.top_improvements]
 
-    sessions_data = [
-        {
-            "mode": mode,
-            "difficulty": difficulty,
-            "score": results.overall_score,
-            "grade": results.grade,
-            "strengths": results.top_strengths,
-            "improvements": results.top_improvements,
-        }
-        for results, mode, difficulty in history[-10:]
+    sessions = [
+        s.model_copy(update={"top_strengths": s.top_strengths[:2], "top_improvements": s.top_improvements[:2]})
+        for s in reversed(history)
     ]
 
-    try:
-        provider = get_ai_provider()
-        prompt = build_overview_prompt(sessions_data, user.display_name or user.email)
-        response_text = await provider._chat(prompt, max_tokens=512)  # type: ignore[attr-defined]
-        data = json.loads(response_text.strip())
-        ai_recommendation = data.get("ai_recommendation", "")
-    except Exception:
-        ai_recommendation = "Unable to generate personalised recommendation at this time."
-
     return OverviewResponse(
         total_sessions=len(history),
         average_score=round(sum(scores) / len(scores), 1),
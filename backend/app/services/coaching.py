@@ -0,0 +1,49 @@
+from app.models.jobs import JobKind
+from app.ai.factory import get_ai_provider
+from app.services.job_queue import get_job_queue
+from app.services.user_store import get_user_store
+
+# Sessions fed to the coaching prompt, newest last
+_COACHING_HISTORY_LIMIT = 10
+
+
+async def enqueue_recommendation_refresh(user_id: str, latest_session_id: str) -> None:
+    """Queue regeneration of a user's coaching text once `latest_session_id` has results."""
+    await get_job_queue().enqueue(
+        JobKind.REFRESH_COACHING,
+        latest_session_id,
+        job_key=f"{JobKind.REFRESH_COACHING.value}:{user_id}:{latest_session_id}",
+        payload={"user_id": user_id},
+    )
+
+
+async def refresh_recommendation(user_id: str) -> None:
+    """Regenerate and store the coaching text from the user's current history."""
+    store = get_user_store()
+    user = await store.get_user_by_id(user_id)
+    if user is None:
+        return
+    history = await store.get_history(user_id)
+    if not history:
+        return
+
+    sessions_data = [
+        {
+            "mode": mode,
+            "difficulty": difficulty,
+            "score": results.overall_score,
+            "grade": results.grade,
+            "strengths": results.top_strengths,
+            "improvements": results.top_improvements,
+        }
+        for results, mode, difficulty in history[-_COACHING_HISTORY_LIMIT:]
+    ]
+    recommendation = await get_ai_provider().generate_coaching_overview(
+        sessions_data, user.display_name or user.email
+    )
+    await store.store_recommendation(
+        user_id,
+        latest_session_id=history[-1][0].session_id,
+        results_count=len(history),
+        ai_recommendation=recommendation,
+    )
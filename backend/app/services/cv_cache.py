@@ -0,0 +1,98 @@
+import hashlib
+from collections import OrderedDict
+from typing import NamedTuple, Optional
+
+from app.models.cv import CVProfile
+from app.ai.base import AIProvider
+from app.db.connection import get_pool
+from app.prompts.evaluation_prompts import CV_EXTRACTION_PROMPT_VERSION
+from app.services.metrics import get_metrics
+from app.services.session_store import get_session_store
+
+_MEMORY_CACHE_SIZE = 256
+
+
+class CachedCV(NamedTuple):
+    raw_text: str
+    cv_profile: CVProfile
+
+
+def upload_cache_key(file_bytes: bytes, provider: AIProvider) -> str:
+    """Content hash of the file plus everything that shapes the extracted profile."""
+    digest = hashlib.sha256(file_bytes).hexdigest()
+    return f"{digest}:{provider.model_id}:v{CV_EXTRACTION_PROMPT_VERSION}"
+
+
+class CVUploadCache:
+    """Content-addressed cache of parsed CV text and extracted profiles.
+
+    Backed by the cv_upload_cache table and fronted by an in-process LRU.
+    Profiles themselves live in cv_profiles; entries only hold their hash.
+    """
+
+    def __init__(self):
+        self._memory: OrderedDict[str, tuple[str, str]] = OrderedDict()
+
+    def _remember(self, key: str, raw_text: str, profile_hash: str) -> None:
+        self._memory[key] = (raw_text, profile_hash)
+        self._memory.move_to_end(key)
+        while len(self._memory) > _MEMORY_CACHE_SIZE:
+            self._memory.popitem(last=False)
+
+    async def get(self, key: str) -> Optional[CachedCV]:
+        metrics = get_metrics()
+        entry = self._memory.get(key)
+        if entry is not None:
+            self._memory.move_to_end(key)
+            metrics.incr("cv_cache.hits_memory")
+        else:
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    UPDATE cv_upload_cache SET last_hit_at = NOW()
+                    WHERE cache_key = $1
+                    RETURNING raw_text, profile_hash
+                    """,
+                    key,
+                )
+            if row is None:
+                metrics.incr("cv_cache.misses")
+                return None
+            entry = (row["raw_text"], row["profile_hash"])
+            self._remember(key, *entry)
+            metrics.incr("cv_cache.hits_db")
+
+        raw_text, profile_hash = entry
+        profile = await get_session_store().get_profile(profile_hash)
+        if profile is None:
+            metrics.incr("cv_cache.misses")
+            return None
+        return CachedCV(raw_text=raw_text, cv_profile=profile)
+
+    async def put(self, key: str, raw_text: str, cv_profile: CVProfile) -> None:
+        """Record an extraction; the profile must already be stored in cv_profiles."""
+        profile_hash = cv_profile.content_hash()
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO cv_upload_cache (cache_key, raw_text, profile_hash)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (cache_key) DO UPDATE
+                SET raw_text = EXCLUDED.raw_text,
+                    profile_hash = EXCLUDED.profile_hash,
+                    last_hit_at = NOW()
+                """,
+                key,
+                raw_text,
+                profile_hash,
+            )
+        self._remember(key, raw_text, profile_hash)
+
+
+_cache = CVUploadCache()
+
+
+def get_cv_upload_cache() -> CVUploadCache:
+    return _cache
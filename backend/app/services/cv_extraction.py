@@ -0,0 +1,42 @@
+from typing import Optional
+
+from app.models.cv import CVProfile
+from app.models.jobs import JobKind
+from app.ai.factory import get_ai_provider
+from app.config import get_settings
+from app.services.cv_cache import get_cv_upload_cache
+from app.services.job_queue import get_job_queue
+from app.services.question_speculation import get_question_speculator
+from app.services.session_store import get_session_store
+
+
+async def enqueue_cv_extraction(token: str, cache_key: str, user_id: Optional[str]) -> None:
+    """Queue extraction of the profile of a CV uploaded with async_extraction."""
+    await get_job_queue().enqueue(
+        JobKind.EXTRACT_CV,
+        token,
+        job_key=f"{JobKind.EXTRACT_CV.value}:{token}",
+        payload={"cache_key": cache_key, "user_id": user_id},
+    )
+
+
+async def extract_pending_cv(token: str, cache_key: str, user_id: Optional[str]) -> None:
+    """Extract the profile of a pending CV token from the text stored with it.
+
+    Provider errors propagate so the job is retried. A token that has expired
+    or was already finished by an earlier attempt is left alone.
+    """
+    store = get_session_store()
+    raw_text = await store.get_pending_cv_text(token)
+    if raw_text is None:
+        return
+    cv_profile = await get_ai_provider().extract_cv_profile(raw_text)
+    cv_profile.raw_text = raw_text
+    await store.complete_cv_token(token, cv_profile)
+    await get_cv_upload_cache().put(cache_key, raw_text, cv_profile)
+    speculate_questions(token, cv_profile, user_id)
+
+
+def speculate_questions(token: str, cv_profile: CVProfile, user_id: Optional[str]) -> None:
+    if get_settings().speculative_questions_enabled:
+        get_question_speculator().speculate(token, cv_profile, user_id)
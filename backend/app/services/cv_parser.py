@@ -1,4 +1,5 @@
 import io
+import signal
 from pathlib import Path
 
 
@@ -34,3 +35,28 @@ def extract_raw_text(filename: str, file_bytes: bytes) -> str:
     else:
         # Try treating as plain text
         return file_bytes.decode("utf-8", errors="replace")
+
+
+class ParseDeadlineExceeded(Exception):
+    pass
+
+
+def _raise_deadline(signum, frame):
+    raise ParseDeadlineExceeded()
+
+
+def extract_raw_text_with_deadline(filename: str, file_bytes: bytes, timeout_seconds: float) -> str:
+    """Entry point for parser worker processes.
+
+    Arms a SIGALRM timer so a pathological file aborts inside the worker and
+    frees its slot, rather than occupying the process after the caller gave up.
+    """
+    if not hasattr(signal, "setitimer"):
+        return extract_raw_text(filename, file_bytes)
+    previous = signal.signal(signal.SIGALRM, _raise_deadline)
+    signal.setitimer(signal.ITIMER_REAL, timeout_seconds)
+    try:
+        return extract_raw_text(filename, file_bytes)
+    finally:
+        signal.setitimer(signal.ITIMER_REAL, 0)
+        signal.signal(signal.SIGALRM, previous)
@@ -0,0 +1,160 @@
+import asyncio
+import logging
+from typing import Awaitable, Callable
+
+from app.models.interview import SessionStatus
+from app.models.jobs import EvaluationJob, JobKind
+from app.config import get_settings
+from app.services.coaching import refresh_recommendation
+from app.services.cv_extraction import extract_pending_cv
+from app.services.evaluator import evaluate_answer, evaluate_session
+from app.services.job_queue import get_job_queue
+from app.services.session_store import get_session_store
+
+logger = logging.getLogger(__name__)
+
+# How long a session job waits before re-checking for unfinished answer jobs
+_STRAGGLER_RECHECK_SECONDS = 1.0
+
+
+class JobDeferred(Exception):
+    """Raised by a handler to put its job back without charging an attempt."""
+
+    def __init__(self, delay_seconds: float):
+        super().__init__(f"deferred for {delay_seconds}s")
+        self.delay_seconds = delay_seconds
+
+
+async def _handle_evaluate_answer(job: EvaluationJob) -> None:
+    session = await get_session_store().get_session(job.session_id)
+    if session is None:
+        return  # expired; nothing left to score
+    await evaluate_answer(session, job.payload["question_id"])
+
+
+async def _handle_evaluate_session(job: EvaluationJob) -> None:
+    store = get_session_store()
+    session = await store.get_session(job.session_id)
+    if session is None:
+        return
+    # Let in-flight answer jobs land first; any that failed for good are redone here
+    if await get_job_queue().has_unfinished(job.session_id, JobKind.EVALUATE_ANSWER):
+        raise JobDeferred(_STRAGGLER_RECHECK_SECONDS)
+    await evaluate_session(session)
+    await store.set_status(job.session_id, SessionStatus.EVALUATED)
+
+
+async def _handle_refresh_coaching(job: EvaluationJob) -> None:
+    await refresh_recommendation(job.payload["user_id"])
+
+
+async def _handle_extract_cv(job: EvaluationJob) -> None:
+    # session_id is the CV session token
+    await extract_pending_cv(job.session_id, job.payload["cache_key"], job.payload.get("user_id"))
+
+
+async def _on_evaluate_session_failed(job: EvaluationJob) -> None:
+    await get_session_store().set_status(job.session_id, SessionStatus.ERROR)
+
+
+async def _on_extract_cv_failed(job: EvaluationJob) -> None:
+    await get_session_store().fail_cv_token(job.session_id, "AI CV extraction failed. Please upload the CV again.")
+
+
+_HANDLERS: dict[JobKind, Callable[[EvaluationJob], Awaitable[None]]] = {
+    JobKind.EVALUATE_ANSWER: _handle_evaluate_answer,
+    JobKind.EVALUATE_SESSION: _handle_evaluate_session,
+    JobKind.REFRESH_COACHING: _handle_refresh_coaching,
+    JobKind.EXTRACT_CV: _handle_extract_cv,
+}
+
+# Called once a job has exhausted its retries
+_FAILURE_HANDLERS: dict[JobKind, Callable[[EvaluationJob], Awaitable[None]]] = {
+    JobKind.EVALUATE_SESSION: _on_evaluate_session_failed,
+    JobKind.EXTRACT_CV: _on_extract_cv_failed,
+}
+
+
+class EvaluationWorker:
+    """Polls the job queue and runs up to `concurrency` jobs at a time."""
+
+    def __init__(
+        self,
+        concurrency: int | None = None,
+        poll_interval_seconds: float | None = None,
+        visibility_timeout_seconds: float | None = None,
+    ):
+        settings = get_settings()
+        self._concurrency = concurrency or settings.evaluation_worker_concurrency
+        self._poll_interval = poll_interval_seconds or settings.evaluation_worker_poll_interval_seconds
+        self._visibility_timeout = (
+            visibility_timeout_seconds or settings.evaluation_job_visibility_timeout_seconds
+        )
+        self._queue = get_job_queue()
+        self._active: set[asyncio.Task] = set()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        logger.info("Evaluation worker started (concurrency=%d)", self._concurrency)
+        while not stop.is_set():
+            free = self._concurrency - len(self._active)
+            jobs: list[EvaluationJob] = []
+            if free > 0:
+                try:
+                    jobs = await self._queue.claim(free, self._visibility_timeout)
+                except Exception:
+                    logger.exception("Failed to claim jobs")
+            for job in jobs:
+                task = asyncio.create_task(self._execute(job))
+                self._active.add(task)
+                task.add_done_callback(self._active.discard)
+            if not jobs:
+                # Idle or saturated: wait for a poll tick, a finished job, or shutdown
+                waiters = [asyncio.create_task(stop.wait()), *self._active]
+                await asyncio.wait(
+                    waiters, timeout=self._poll_interval, return_when=asyncio.FIRST_COMPLETED
+                )
+                waiters[0].cancel()
+
+        # Drain: let running jobs finish; unfinished leases simply expire and are retried
+        if self._active:
+            await asyncio.wait(self._active, timeout=self._visibility_timeout)
+        logger.info("Evaluation worker stopped")
+
+    async def _execute(self, job: EvaluationJob) -> None:
+        if job.attempts > job.max_attempts:
+            # Lease expired on the final attempt (e.g. the worker crashed)
+            await self._give_up(job, job.last_error or "lease expired")
+            return
+
+        heartbeat = asyncio.create_task(self._heartbeat(job))
+        try:
+            await _HANDLERS[job.kind](job)
+        except JobDeferred as deferred:
+            await self._queue.defer(job, deferred.delay_seconds)
+        except Exception as exc:
+            logger.warning(
+                "Job %d (%s, session %s) attempt %d failed: %s",
+                job.job_id, job.kind.value, job.session_id, job.attempts, exc,
+            )
+            if not await self._queue.fail(job, repr(exc)):
+                await self._give_up(job, repr(exc))
+        else:
+            await self._queue.complete(job)
+        finally:
+            heartbeat.cancel()
+
+    async def _give_up(self, job: EvaluationJob, error: str) -> None:
+        if job.attempts > job.max_attempts:
+            await self._queue.fail(job, error)
+        logger.error("Job %d (%s, session %s) failed permanently", job.job_id, job.kind.value, job.session_id)
+        on_failure = _FAILURE_HANDLERS.get(job.kind)
+        if on_failure is not None:
+            await on_failure(job)
+
+    async def _heartbeat(self, job: EvaluationJob) -> None:
+        while True:
+            await asyncio.sleep(self._visibility_timeout / 3)
+            try:
+                await self._queue.extend(job, self._visibility_timeout)
+            except Exception:
+                logger.exception("Failed to extend lease for job %d", job.job_id)
@@ -1,36 +1,255 @@
 import asyncio
-from app.models.interview import InterviewSession
-from app.models.results import AnswerScore, InterviewResults
+import logging
+import random
+import time
+from typing import Optional
+
+from app.models.cv import CVProfile
+from app.models.interview import InterviewSession, Answer, SessionStatus
+from app.models.jobs import JobKind
+from app.models.results import AnswerScore, InterviewResults, results_from_feedback
 from app.ai.factory import get_ai_provider
+from app.config import get_settings
+from app.services.coaching import enqueue_recommendation_refresh
+from app.services.job_queue import get_job_queue
+from app.services.metrics import get_metrics
+from app.services.results_notifier import publish
+from app.services.scoring import summarize_scores
 from app.services.session_store import get_session_store
+from app.services.transcript_features import extract_features, is_short_answer, short_answer_score
 
+logger = logging.getLogger(__name__)
 
-async def evaluate_session(session: InterviewSession) -> InterviewResults:
-    """Evaluate all answers concurrently, then generate overall feedback and persist."""
-    provider = get_ai_provider()
+# Backoff before an answer's second attempt, doubling for each one after
+_ANSWER_RETRY_BACKOFF_SECONDS = 1.0
+
+
+class EvaluationIncomplete(Exception):
+    """Some answers could not be scored; every other score has been stored."""
+
+    def __init__(self, failed: dict[str, BaseException]):
+        first = next(iter(failed.values()))
+        super().__init__(f"{len(failed)} answer(s) could not be scored, e.g. {first!r}")
+        self.failed = failed
+
+
+async def enqueue_answer_evaluation(session_id: str, question_id: str) -> None:
+    """Queue scoring of one answer as soon as it is submitted.
+
+    With the batch strategy answers are scored together when the session
+    ends, so nothing is queued here.
+    """
+    if get_settings().evaluation_strategy == "batch":
+        return
+    await get_job_queue().enqueue(
+        JobKind.EVALUATE_ANSWER,
+        session_id,
+        job_key=f"{JobKind.EVALUATE_ANSWER.value}:{session_id}:{question_id}",
+        payload={"question_id": question_id},
+    )
+
+
+async def enqueue_session_evaluation(session_id: str, resume: bool = False) -> None:
+    """Queue the final aggregation step for a finished interview.
+
+    With `resume`, a session job that failed for good is queued again.
+    """
+    await get_job_queue().enqueue(
+        JobKind.EVALUATE_SESSION,
+        session_id,
+        job_key=f"{JobKind.EVALUATE_SESSION.value}:{session_id}",
+        revive_failed=resume,
+    )
+
+
+async def resume_session_evaluation(session_id: str) -> bool:
+    """Re-run a failed evaluation; answers scored before the failure are kept, not re-scored.
+
+    Returns False if the session is not in the ERROR state.
+    """
     store = get_session_store()
+    if not await store.set_status(session_id, SessionStatus.EVALUATING, only_if=SessionStatus.ERROR):
+        return False
+    await enqueue_session_evaluation(session_id, resume=True)
+    get_metrics().incr("evaluation.resumes")
+    return True
+
 
-    question_map = {q.question_id: q for q in session.questions}
+async def _load_profile(session: InterviewSession) -> CVProfile:
+    profile = await get_session_store().get_profile(session.cv_profile_hash)
+    if profile is None:
+        raise LookupError(f"CV profile {session.cv_profile_hash} not found.")
+    return profile
 
-    tasks = [
-        provider.evaluate_answer(
-            question=question_map[answer.question_id],
+
+async def _evaluate_and_store(
+    session: InterviewSession, answer: Answer, cv_profile: CVProfile
+) -> AnswerScore:
+    provider = get_ai_provider()
+    question = next(q for q in session.questions if q.question_id == answer.question_id)
+    # Empty and trivially short answers would cost a full round trip for a near-zero score
+    score = short_answer_score(question, answer, extract_features([(question, answer)])[0])
+    if score is not None:
+        get_metrics().incr("evaluation.short_answers")
+    else:
+        score = await provider.evaluate_answer(
+            question=question,
             answer=answer,
             mode=session.mode,
-            cv_profile=session.cv_profile,
+            cv_profile=cv_profile,
+            difficulty=session.difficulty,
         )
-        for answer in session.answers
-        if answer.question_id in question_map
-    ]
+    await get_session_store().store_answer_score(session.session_id, score)
+    return score
+
+
+async def _evaluate_with_retries(
+    session: InterviewSession, answer: Answer, cv_profile: CVProfile, deadline: float
+) -> AnswerScore:
+    """`_evaluate_and_store`, retried with exponential backoff until `deadline` (monotonic)."""
+    attempts = get_settings().evaluation_answer_attempts
+    metrics = get_metrics()
+    attempt = 1
+    while True:
+        try:
+            return await asyncio.wait_for(
+                _evaluate_and_store(session, answer, cv_profile),
+                timeout=max(deadline - time.monotonic(), 0),
+            )
+        except Exception as e:
+            delay = _ANSWER_RETRY_BACKOFF_SECONDS * 2 ** (attempt - 1)
+            delay += random.uniform(0, delay * 0.1)
+            if attempt >= attempts or time.monotonic() + delay >= deadline:
+                metrics.incr("evaluation.answer_failures")
+                raise
+            metrics.incr("evaluation.answer_retries")
+            logger.warning(
+                "Scoring answer %s of session %s failed (attempt %d), retrying: %r",
+                answer.question_id, session.session_id, attempt, e,
+            )
+            await asyncio.sleep(delay)
+            attempt += 1
+
 
-    answer_scores: list[AnswerScore] = await asyncio.gather(*tasks)
+async def _evaluate_all_and_store(
+    session: InterviewSession, answers: list[Answer], cv_profile: CVProfile
+) -> list[AnswerScore]:
+    """Score `answers` concurrently, each retried within EVALUATION_ANSWER_DEADLINE_SECONDS.
 
-    results = await provider.generate_overall_feedback(
-        answer_scores=list(answer_scores),
-        cv_profile=session.cv_profile,
+    Each score is stored as soon as it exists, so an answer that fails for
+    good costs none of the others: they all run to completion, and only then
+    is EvaluationIncomplete raised for the failures.
+    """
+    deadline = time.monotonic() + get_settings().evaluation_answer_deadline_seconds
+    results = await asyncio.gather(
+        *(_evaluate_with_retries(session, a, cv_profile, deadline) for a in answers),
+        return_exceptions=True,
+    )
+    failed = {a.question_id: r for a, r in zip(answers, results) if isinstance(r, BaseException)}
+    if failed:
+        raise EvaluationIncomplete(failed)
+    return results
+
+
+async def _evaluate_batch_and_store(
+    session: InterviewSession, answers: list[Answer], cv_profile: CVProfile
+) -> list[AnswerScore]:
+    """Score `answers` in one provider call, then re-score any malformed or missing entries singly.
+
+    Short answers are left out of the call and scored locally by `_evaluate_and_store`.
+    """
+    questions = {q.question_id: q for q in session.questions}
+    pairs = [(questions[a.question_id], a) for a in answers]
+    pairs = [pair for pair, features in zip(pairs, extract_features(pairs)) if not is_short_answer(features)]
+    scores: dict[str, AnswerScore] = {}
+    if pairs:
+        try:
+            scores = await get_ai_provider().evaluate_answers(pairs, session.mode, cv_profile, session.difficulty)
+        except Exception as e:
+            # Fall back to scoring every answer singly rather than failing the session
+            logger.warning("Batched scoring of session %s failed: %r", session.session_id, e)
+    store = get_session_store()
+    for score in scores.values():
+        await store.store_answer_score(session.session_id, score)
+
+    retry = [a for a in answers if a.question_id not in scores]
+    metrics = get_metrics()
+    metrics.incr("evaluation.batch.answers", len(pairs))
+    metrics.incr("evaluation.batch.fallbacks", len(pairs) - len(scores))
+    fallback = await _evaluate_all_and_store(session, retry, cv_profile)
+    return list(scores.values()) + fallback
+
+
+async def evaluate_answer(session: InterviewSession, question_id: str) -> Optional[AnswerScore]:
+    """Score and persist the session's answer to `question_id`, unless already scored."""
+    store = get_session_store()
+    stored = await store.get_answer_scores(session.session_id)
+    if question_id in stored:
+        return stored[question_id]
+    answer = next((a for a in session.answers if a.question_id == question_id), None)
+    if answer is None or not any(q.question_id == question_id for q in session.questions):
+        return None
+    return await _evaluate_and_store(session, answer, await _load_profile(session))
+
+
+async def evaluate_session(session: InterviewSession) -> InterviewResults:
+    """Collect per-answer scores (scoring any not yet done), then generate overall feedback and persist.
+
+    Raises EvaluationIncomplete if some answers could not be scored; the
+    scores that were obtained are stored, so a retry scores only the rest.
+    """
+    provider = get_ai_provider()
+    store = get_session_store()
+
+    cv_profile = await _load_profile(session)
+    stored = await store.get_answer_scores(session.session_id)
+    question_ids = {q.question_id for q in session.questions}
+    answers = [a for a in session.answers if a.question_id in question_ids]
+
+    missing = [a for a in answers if a.question_id not in stored]
+    if missing:
+        strategy = get_settings().evaluation_strategy
+        start = time.perf_counter()
+        if strategy == "batch":
+            scored = await _evaluate_batch_and_store(session, missing, cv_profile)
+        else:
+            scored = await _evaluate_all_and_store(session, missing, cv_profile)
+        get_metrics().observe(f"evaluation.{strategy}.scoring_seconds", time.perf_counter() - start)
+        for score in scored:
+            stored[score.question_id] = score
+
+    # Scores stored before answers carried their category get it from the question
+    categories = {q.question_id: q.category for q in session.questions}
+    answer_scores: list[AnswerScore] = [
+        stored[a.question_id]
+        if stored[a.question_id].category
+        else stored[a.question_id].model_copy(update={"category": categories[a.question_id]})
+        for a in answers
+    ]
+    scores = summarize_scores(answer_scores, session.difficulty)
+
+    # Results pages listening on the stream show the reviews and the computed
+    # scores now, and each narrative field as soon as the provider has written it
+    await publish(session.session_id, "answer_reviews")
+    await publish(session.session_id, "field", field="overall_score", value=scores.overall_score)
+    await publish(session.session_id, "field", field="grade", value=scores.grade)
+    await publish(
+        session.session_id,
+        "field",
+        field="category_scores",
+        value=[c.model_dump(mode="json") for c in scores.category_scores],
+    )
+    feedback = {}
+    async for field, value in provider.stream_overall_feedback(
+        answer_scores=answer_scores,
+        scores=scores,
+        cv_profile=cv_profile,
         mode=session.mode,
         session_id=session.session_id,
-    )
+    ):
+        feedback[field] = value
+        await publish(session.session_id, "field", field=field, value=value)
+    results = results_from_feedback(session.session_id, answer_scores, scores, feedback)
 
     # Persist to interview_results — include user linkage if authenticated.
     # This single write covers both the results-page lookup and the user history.
@@ -41,5 +260,7 @@ async def evaluate_session(session: InterviewSession) -> InterviewResults:
         mode=session.mode.value,
         difficulty=session.difficulty.value,
     )
+    if session.user_id:
+        await enqueue_recommendation_refresh(session.user_id, session.session_id)
 
     return results
@@ -0,0 +1,192 @@
+import random
+from typing import Optional
+
+import asyncpg
+
+from app.models.jobs import EvaluationJob, JobKind, JobStatus
+from app.config import get_settings
+from app.db.connection import get_pool
+
+
+def _to_job(row: asyncpg.Record) -> EvaluationJob:
+    return EvaluationJob(**dict(row))
+
+
+class JobQueue:
+    """PostgreSQL-backed durable queue for evaluation work.
+
+    Jobs are claimed with ``FOR UPDATE SKIP LOCKED`` so any number of worker
+    processes can poll concurrently. A claimed job is invisible to other
+    workers until ``locked_until``; if its worker dies, it becomes claimable
+    again once that visibility timeout lapses. Every state transition is
+    fenced on ``attempts`` so a worker whose lease expired cannot clobber a
+    newer attempt.
+    """
+
+    async def enqueue(
+        self,
+        kind: JobKind,
+        session_id: str,
+        job_key: str,
+        payload: Optional[dict] = None,
+        revive_failed: bool = False,
+    ) -> None:
+        """Queue a job; a second enqueue with the same `job_key` is a no-op.
+
+        With `revive_failed`, an existing job with that key that has failed
+        permanently is queued again with a fresh set of attempts instead.
+        """
+        settings = get_settings()
+        on_conflict = (
+            """
+            DO UPDATE SET status = 'queued', attempts = 0, max_attempts = EXCLUDED.max_attempts,
+                          run_after = NOW(), locked_until = NULL, last_error = NULL, updated_at = NOW()
+            WHERE evaluation_jobs.status = 'failed'
+            """
+            if revive_failed
+            else "DO NOTHING"
+        )
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                f"""
+                INSERT INTO evaluation_jobs (job_key, kind, session_id, payload, max_attempts)
+                VALUES ($1, $2, $3, $4, $5)
+                ON CONFLICT (job_key) {on_conflict}
+                """,
+                job_key,
+                kind.value,
+                session_id,
+                payload or {},
+                settings.evaluation_job_max_attempts,
+            )
+
+    async def claim(self, limit: int, visibility_timeout_seconds: float) -> list[EvaluationJob]:
+        """Lease up to `limit` ready jobs, including ones whose previous lease expired."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                UPDATE evaluation_jobs j
+                SET status = 'running',
+                    attempts = j.attempts + 1,
+                    locked_until = NOW() + make_interval(secs => $2),
+                    updated_at = NOW()
+                FROM (
+                    SELECT job_id FROM evaluation_jobs
+                    WHERE (status = 'queued' AND run_after <= NOW())
+                       OR (status = 'running' AND locked_until < NOW())
+                    ORDER BY run_after
+                    LIMIT $1
+                    FOR UPDATE SKIP LOCKED
+                ) ready
+                WHERE j.job_id = ready.job_id
+                RETURNING j.job_id, j.kind, j.session_id, j.payload, j.status,
+                          j.attempts, j.max_attempts, j.last_error
+                """,
+                limit,
+                float(visibility_timeout_seconds),
+            )
+        return [_to_job(row) for row in rows]
+
+    async def extend(self, job: EvaluationJob, visibility_timeout_seconds: float) -> None:
+        """Heartbeat: push back the lease of a job that is still being worked on."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE evaluation_jobs
+                SET locked_until = NOW() + make_interval(secs => $1), updated_at = NOW()
+                WHERE job_id = $2 AND attempts = $3 AND status = 'running'
+                """,
+                float(visibility_timeout_seconds),
+                job.job_id,
+                job.attempts,
+            )
+
+    async def complete(self, job: EvaluationJob) -> None:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE evaluation_jobs
+                SET status = 'done', locked_until = NULL, last_error = NULL, updated_at = NOW()
+                WHERE job_id = $1 AND attempts = $2
+                """,
+                job.job_id,
+                job.attempts,
+            )
+
+    async def defer(self, job: EvaluationJob, delay_seconds: float) -> None:
+        """Put a job back without charging it an attempt (e.g. it is waiting on other jobs)."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE evaluation_jobs
+                SET status = 'queued',
+                    attempts = attempts - 1,
+                    run_after = NOW() + make_interval(secs => $1),
+                    locked_until = NULL,
+                    updated_at = NOW()
+                WHERE job_id = $2 AND attempts = $3
+                """,
+                float(delay_seconds),
+                job.job_id,
+                job.attempts,
+            )
+
+    async def fail(self, job: EvaluationJob, error: str) -> bool:
+        """Record a failed attempt. Returns True if the job will be retried.
+
+        Retries use exponential backoff with jitter; once `max_attempts` is
+        exhausted the job is parked as failed.
+        """
+        settings = get_settings()
+        retry = job.attempts < job.max_attempts
+        delay = min(
+            settings.evaluation_job_retry_backoff_seconds * 2 ** (job.attempts - 1),
+            settings.evaluation_job_retry_backoff_max_seconds,
+        )
+        delay += random.uniform(0, delay * 0.1)
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                UPDATE evaluation_jobs
+                SET status = $1,
+                    run_after = NOW() + make_interval(secs => $2),
+                    locked_until = NULL,
+                    last_error = $3,
+                    updated_at = NOW()
+                WHERE job_id = $4 AND attempts = $5
+                """,
+                (JobStatus.QUEUED if retry else JobStatus.FAILED).value,
+                float(delay),
+                error[:2000],
+                job.job_id,
+                job.attempts,
+            )
+        return retry
+
+    async def has_unfinished(self, session_id: str, kind: JobKind) -> bool:
+        """True if any job of `kind` for the session is still queued or running."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetchval(
+                """
+                SELECT EXISTS (
+                    SELECT 1 FROM evaluation_jobs
+                    WHERE session_id = $1 AND kind = $2 AND status IN ('queued', 'running')
+                )
+                """,
+                session_id,
+                kind.value,
+            )
+
+
+_queue = JobQueue()
+
+
+def get_job_queue() -> JobQueue:
+    return _queue
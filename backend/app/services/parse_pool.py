@@ -0,0 +1,107 @@
+import asyncio
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Optional
+
+from app.config import get_settings
+from app.services.cv_parser import ParseDeadlineExceeded, extract_raw_text_with_deadline
+from app.services.metrics import get_metrics
+
+# Recycle parser processes periodically to cap pdfminer memory growth
+_MAX_TASKS_PER_CHILD = 200
+# Extra time the caller waits beyond the in-process deadline before giving up
+_TIMEOUT_GRACE_SECONDS = 2.0
+
+
+class ParserSaturatedError(Exception):
+    """Raised when too many uploads are already parsing or queued."""
+
+
+class ParseTimeoutError(Exception):
+    """Raised when a single file takes longer than the configured timeout."""
+
+
+class ParsePool:
+    """Bounded process pool for CPU-bound CV text extraction.
+
+    Keeps pdfminer/python-docx off the event loop. At most `max_pending`
+    files may be parsing or waiting for a process; beyond that, uploads are
+    rejected immediately instead of piling up behind each other.
+    """
+
+    def __init__(self, workers: int, max_pending: int, timeout_seconds: float):
+        self._executor = ProcessPoolExecutor(
+            max_workers=workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=_MAX_TASKS_PER_CHILD,
+        )
+        self._max_pending = max_pending
+        self._timeout = timeout_seconds
+        self._pending = 0
+
+    def _release(self, started: float) -> None:
+        self._pending -= 1
+        metrics = get_metrics()
+        metrics.set_gauge("cv_parser.pending", self._pending)
+        metrics.observe("cv_parser.duration_seconds", time.perf_counter() - started)
+
+    async def extract(self, filename: str, file_bytes: bytes) -> str:
+        metrics = get_metrics()
+        if self._pending >= self._max_pending:
+            metrics.incr("cv_parser.rejected")
+            raise ParserSaturatedError()
+
+        self._pending += 1
+        metrics.set_gauge("cv_parser.pending", self._pending)
+        metrics.incr("cv_parser.submitted")
+        started = time.perf_counter()
+
+        loop = asyncio.get_running_loop()
+        future = loop.run_in_executor(
+            self._executor, extract_raw_text_with_deadline, filename, file_bytes, self._timeout
+        )
+        # The slot is held until the process is actually done, not until we stop waiting
+        future.add_done_callback(lambda _: self._release(started))
+        try:
+            text = await asyncio.wait_for(
+                asyncio.shield(future), self._timeout + _TIMEOUT_GRACE_SECONDS
+            )
+        except (ParseDeadlineExceeded, asyncio.TimeoutError):
+            metrics.incr("cv_parser.timeouts")
+            raise ParseTimeoutError()
+        except Exception:
+            metrics.incr("cv_parser.failed")
+            raise
+        metrics.incr("cv_parser.completed")
+        return text
+
+    def shutdown(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[ParsePool] = None
+
+
+def init_parse_pool() -> ParsePool:
+    global _pool
+    settings = get_settings()
+    _pool = ParsePool(
+        workers=settings.cv_parser_workers,
+        max_pending=settings.cv_parser_max_pending,
+        timeout_seconds=settings.cv_parser_timeout_seconds,
+    )
+    return _pool
+
+
+def get_parse_pool() -> ParsePool:
+    if _pool is None:
+        raise RuntimeError("Parse pool not initialised — call init_parse_pool() first.")
+    return _pool
+
+
+def close_parse_pool() -> None:
+    global _pool
+    if _pool:
+        _pool.shutdown()
+        _pool = None
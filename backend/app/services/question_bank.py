@@ -0,0 +1,201 @@
+import asyncio
+import hashlib
+import math
+import random
+import re
+import time
+from collections import Counter, defaultdict
+from typing import Iterable
+
+from app.config import get_settings
+from app.db.connection import get_pool
+from app.models.cv import CVProfile
+from app.models.interview import Difficulty, InterviewMode, Question
+from app.services.metrics import get_metrics
+
+# Rows written by other processes are picked up at most this long after
+_REFRESH_INTERVAL_SECONDS = 300.0
+
+# Matches are drawn at random from this many times `count` best candidates,
+# so similar CVs do not all get the identical set
+_CANDIDATE_POOL_FACTOR = 3
+
+_WORD = re.compile(r"[a-z0-9+#.]+")
+
+
+def _terms(skills: Iterable[str], role: str) -> list[str]:
+    """Index terms of a profile: each skill as a whole, plus the words of the role."""
+    terms = [f"skill:{s.strip().lower()}" for s in skills if s.strip()]
+    terms += [f"role:{w}" for w in _WORD.findall(role.lower())]
+    return terms
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(" ".join(text.lower().split()).encode()).hexdigest()
+
+
+def is_reusable(question: Question, cv_profile: CVProfile) -> bool:
+    """False for questions that name the candidate, an employer or a school from their CV."""
+    text = question.text.lower()
+    names = [cv_profile.name] if cv_profile.name != "Candidate" else []
+    names += [w.company for w in cv_profile.work_experience]
+    names += [e.institution for e in cv_profile.education]
+    return not any(name.strip() and name.strip().lower() in text for name in names)
+
+
+class _Index:
+    """TF-IDF index over the profiles questions were generated for, one per mode and difficulty.
+
+    Each banked question is a document whose terms are the skills and role
+    of the CV it was written for; a new CV is matched by cosine similarity.
+    """
+
+    def __init__(self):
+        self.questions: list[Question] = []
+        self.hashes: set[str] = set()
+        self._terms: list[Counter] = []
+        self._doc_freq: Counter = Counter()
+        self._postings: dict[str, list[int]] = defaultdict(list)
+
+    def add(self, question: Question, terms: list[str]) -> None:
+        text_hash = _text_hash(question.text)
+        if text_hash in self.hashes:
+            return
+        self.hashes.add(text_hash)
+        doc = len(self.questions)
+        self.questions.append(question)
+        counts = Counter(terms)
+        self._terms.append(counts)
+        for term in counts:
+            self._doc_freq[term] += 1
+            self._postings[term].append(doc)
+
+    def _idf(self, term: str) -> float:
+        return math.log((1 + len(self.questions)) / (1 + self._doc_freq[term])) + 1
+
+    def _norm(self, doc: int) -> float:
+        return math.sqrt(sum((tf * self._idf(t)) ** 2 for t, tf in self._terms[doc].items())) or 1.0
+
+    def search(self, terms: list[str], min_similarity: float) -> list[tuple[float, int]]:
+        query = Counter(terms)
+        weights = {t: tf * self._idf(t) for t, tf in query.items() if t in self._postings}
+        query_norm = math.sqrt(sum(w * w for w in weights.values())) or 1.0
+        dots: dict[int, float] = defaultdict(float)
+        for term, weight in weights.items():
+            idf = self._idf(term)
+            for doc in self._postings[term]:
+                dots[doc] += weight * self._terms[doc][term] * idf
+        scored = [(dot / (query_norm * self._norm(doc)), doc) for doc, dot in dots.items()]
+        return sorted((s for s in scored if s[0] >= min_similarity), reverse=True)
+
+
+class QuestionBank:
+    """Questions generated for earlier candidates, reusable for similar CVs.
+
+    Stored in the question_bank table and indexed in memory per process.
+    Only questions that don't name the candidate's employers, schools or
+    name are banked.
+    """
+
+    def __init__(self):
+        self._indexes: dict[tuple[str, str], _Index] = defaultdict(_Index)
+        self._last_id = 0
+        self._refreshed_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def _refresh(self) -> None:
+        if time.monotonic() - self._refreshed_at < _REFRESH_INTERVAL_SECONDS:
+            return
+        async with self._lock:
+            if time.monotonic() - self._refreshed_at < _REFRESH_INTERVAL_SECONDS:
+                return
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                rows = await conn.fetch(
+                    """
+                    SELECT id, mode, difficulty, text, category, follow_up_hint, skills, role
+                    FROM question_bank WHERE id > $1 ORDER BY id
+                    """,
+                    self._last_id,
+                )
+            for row in rows:
+                question = Question(text=row["text"], category=row["category"], follow_up_hint=row["follow_up_hint"])
+                self._indexes[(row["mode"], row["difficulty"])].add(question, _terms(row["skills"], row["role"]))
+                self._last_id = row["id"]
+            self._refreshed_at = time.monotonic()
+            get_metrics().set_gauge("question_bank.size", sum(len(i.questions) for i in self._indexes.values()))
+
+    async def find(
+        self,
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+    ) -> list[Question]:
+        """Up to `count` banked questions for profiles similar to `cv_profile`, each with a fresh id."""
+        if count <= 0:
+            return []
+        await self._refresh()
+        index = self._indexes.get((mode.value, difficulty.value))
+        if index is None:
+            return []
+        matches = index.search(
+            _terms(cv_profile.skills, cv_profile.current_role),
+            get_settings().question_bank_min_similarity,
+        )
+        candidates = matches[: count * _CANDIDATE_POOL_FACTOR]
+        chosen = sorted(random.sample(candidates, min(count, len(candidates))), reverse=True)
+        return [
+            Question(
+                text=index.questions[doc].text,
+                category=index.questions[doc].category,
+                follow_up_hint=index.questions[doc].follow_up_hint,
+            )
+            for _, doc in chosen
+        ]
+
+    async def add(
+        self,
+        questions: list[Question],
+        cv_profile: CVProfile,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+    ) -> None:
+        """Bank freshly generated questions against the profile they were written for."""
+        reusable = [q for q in questions if is_reusable(q, cv_profile)]
+        if not reusable:
+            return
+        skills = [s for s in cv_profile.skills if s.strip()]
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.executemany(
+                """
+                INSERT INTO question_bank (text_hash, mode, difficulty, text, category, follow_up_hint, skills, role)
+                VALUES ($1, $2, $3, $4, $5, $6, $7, $8)
+                ON CONFLICT (mode, difficulty, text_hash) DO NOTHING
+                """,
+                [
+                    (
+                        _text_hash(q.text),
+                        mode.value,
+                        difficulty.value,
+                        q.text,
+                        q.category,
+                        q.follow_up_hint,
+                        skills,
+                        cv_profile.current_role,
+                    )
+                    for q in reusable
+                ],
+            )
+        index = self._indexes[(mode.value, difficulty.value)]
+        for question in reusable:
+            index.add(question, _terms(skills, cv_profile.current_role))
+        get_metrics().incr("question_bank.added", len(reusable))
+
+
+_bank = QuestionBank()
+
+
+def get_question_bank() -> QuestionBank:
+    return _bank
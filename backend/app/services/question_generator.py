@@ -1,6 +1,157 @@
+import asyncio
+import logging
+import math
+import re
+from contextlib import aclosing
+from typing import AsyncIterator, Iterable, Optional
+
 from app.models.cv import CVProfile
 from app.models.interview import Question, InterviewMode, Difficulty
 from app.ai.factory import get_ai_provider
+from app.config import get_settings
+from app.services.metrics import get_metrics
+from app.services.question_bank import get_question_bank
+
+logger = logging.getLogger(__name__)
+
+# Categories shards of a large set are spread across, per mode
+_SHARD_CATEGORIES = {
+    "behavioral": ["Behavioral", "Situational"],
+    "technical": ["Technical"],
+    "system_design": ["System Design"],
+    "mixed": ["Behavioral", "Technical", "Situational", "System Design"],
+    "hr": ["HR", "Behavioral"],
+}
+
+# Two questions whose content words overlap at least this much (Jaccard) are
+# near-duplicates, unless they are about different skills from the CV; the
+# later one is dropped and replaced by a top-up
+_DUPLICATE_SIMILARITY = 0.6
+_MAX_TOP_UPS = 2
+
+_WORD = re.compile(r"[a-z0-9+#]+")
+_STOPWORDS = frozenset(
+    "a about an and are as at be by can did do does for from had has have how i if in is it me of on or "
+    "that the this to was we were what when where which who why will with would you your".split()
+)
+_SHARD_DONE = object()
+
+
+class _Seen:
+    """Questions chosen so far, for near-duplicate checks."""
+
+    def __init__(self, cv_profile: CVProfile, questions: Iterable[Question] = ()):
+        self._skills = [s.lower() for s in cv_profile.skills if s.strip()]
+        self.questions: list[Question] = []
+        self._signatures: list[tuple[set[str], frozenset[str]]] = []
+        for question in questions:
+            self.admit(question)
+
+    def admit(self, question: Question) -> bool:
+        """Record `question` unless it nearly repeats one already seen."""
+        text = question.text.lower()
+        words = set(_WORD.findall(text)) - _STOPWORDS
+        skills = frozenset(s for s in self._skills if s in text)
+        for other_words, other_skills in self._signatures:
+            if skills and other_skills and skills != other_skills:
+                continue  # the same kind of question about another skill is a different question
+            union = len(words | other_words)
+            if union and len(words & other_words) / union >= _DUPLICATE_SIMILARITY:
+                get_metrics().incr("questions.near_duplicates")
+                return False
+        self.questions.append(question)
+        self._signatures.append((words, skills))
+        return True
+
+
+def _shard_plan(cv_profile: CVProfile, mode: InterviewMode, count: int) -> list[tuple[int, Optional[str]]]:
+    """Split `count` into (size, focus) shards of at most QUESTION_SHARD_SIZE.
+
+    Each shard is focused on a different category and slice of the
+    candidate's skills so that concurrent shards don't write the same
+    questions.
+    """
+    shard_size = get_settings().question_shard_size
+    if shard_size <= 0 or count <= shard_size:
+        return [(count, None)]
+    shards = math.ceil(count / shard_size)
+    categories = _SHARD_CATEGORIES.get(mode.value, [])
+    skills = cv_profile.skills[:15]
+    plan = []
+    for i in range(shards):
+        size = count // shards + (1 if i < count % shards else 0)
+        focus = []
+        if categories:
+            focus.append(f"{categories[i % len(categories)]} questions")
+        if skills[i::shards]:
+            focus.append("the candidate's experience with " + ", ".join(skills[i::shards]))
+        plan.append((size, "; ".join(focus) or None))
+    return plan
+
+
+async def _top_up(
+    cv_profile: CVProfile,
+    mode: InterviewMode,
+    difficulty: Difficulty,
+    count: int,
+    seen: _Seen,
+) -> list[Question]:
+    """Generate questions until `seen` holds `count`, steering away from those it has.
+
+    Gives up after _MAX_TOP_UPS rounds and returns what it has; the caller
+    serves a short set rather than failing an interview that has questions.
+    """
+    provider = get_ai_provider()
+    added: list[Question] = []
+    for _ in range(_MAX_TOP_UPS):
+        missing = count - len(seen.questions)
+        if missing <= 0:
+            break
+        get_metrics().incr("questions.top_ups")
+        try:
+            candidates = await provider.generate_questions(
+                cv_profile, mode, difficulty, missing, avoid=[q.text for q in seen.questions]
+            )
+        except Exception as e:
+            logger.warning("Question top-up failed: %s", e)
+            break
+        fresh = [q for q in candidates[:missing] if seen.admit(q)]
+        if not fresh:
+            break
+        added.extend(fresh)
+    return added
+
+
+async def _from_bank(
+    cv_profile: CVProfile,
+    mode: InterviewMode,
+    difficulty: Difficulty,
+    count: int,
+) -> list[Question]:
+    """Banked questions for this profile, leaving at least QUESTION_BANK_PERSONALIZED_COUNT to generate."""
+    settings = get_settings()
+    if not settings.question_bank_enabled:
+        return []
+    banked = await get_question_bank().find(
+        cv_profile, mode, difficulty, count - min(count, settings.question_bank_personalized_count)
+    )
+    get_metrics().incr("question_bank.served", len(banked))
+    return banked
+
+
+async def _bank_generated(
+    questions: list[Question],
+    cv_profile: CVProfile,
+    mode: InterviewMode,
+    difficulty: Difficulty,
+) -> None:
+    if not get_settings().question_bank_enabled or not questions:
+        return
+    try:
+        await get_question_bank().add(questions, cv_profile, mode, difficulty)
+    except Exception as e:
+        # Banking is best effort; the questions were already served
+        logger.warning("Could not add generated questions to the bank: %s", e)
 
 
 async def generate_questions(
@@ -9,5 +160,95 @@ async def generate_questions(
     difficulty: Difficulty,
     count: int,
 ) -> list[Question]:
+    banked = await _from_bank(cv_profile, mode, difficulty, count)
+    if len(banked) >= count:
+        return banked
     provider = get_ai_provider()
-    return await provider.generate_questions(cv_profile, mode, difficulty, count)
+    plan = _shard_plan(cv_profile, mode, count - len(banked))
+    results = await asyncio.gather(
+        *(provider.generate_questions(cv_profile, mode, difficulty, size, focus) for size, focus in plan),
+        return_exceptions=True,
+    )
+    errors = [r for r in results if isinstance(r, BaseException)]
+    if len(errors) == len(results):
+        raise errors[0]
+    for error in errors:
+        logger.warning("Question shard failed: %s", error)
+
+    seen = _Seen(cv_profile, banked)
+    generated = [
+        question
+        for (size, _), shard in zip(plan, results)
+        if not isinstance(shard, BaseException)
+        for question in shard[:size]
+        if seen.admit(question)
+    ]
+    generated += await _top_up(cv_profile, mode, difficulty, count, seen)
+    await _bank_generated(generated, cv_profile, mode, difficulty)
+    return banked + generated
+
+
+async def stream_questions(
+    cv_profile: CVProfile,
+    mode: InterviewMode,
+    difficulty: Difficulty,
+    count: int,
+) -> AsyncIterator[Question]:
+    """Yield up to `count` questions: banked ones at once, then the provider's as it produces them.
+
+    Large sets are generated as concurrent shards (see `_shard_plan`) whose
+    questions are yielded in arrival order, minus near-duplicates, and
+    topped up at the end if any shard came back short.
+    """
+    banked = await _from_bank(cv_profile, mode, difficulty, count)
+    for question in banked:
+        yield question
+    if len(banked) >= count:
+        return
+
+    provider = get_ai_provider()
+    plan = _shard_plan(cv_profile, mode, count - len(banked))
+    queue: asyncio.Queue = asyncio.Queue()
+
+    async def run_shard(size: int, focus: Optional[str]) -> None:
+        try:
+            async with aclosing(provider.stream_questions(cv_profile, mode, difficulty, size, focus)) as stream:
+                produced = 0
+                async for question in stream:
+                    await queue.put(question)
+                    produced += 1
+                    if produced >= size:
+                        break
+        except Exception as e:
+            await queue.put(e)
+        finally:
+            await queue.put(_SHARD_DONE)
+
+    tasks = [asyncio.create_task(run_shard(size, focus)) for size, focus in plan]
+    seen = _Seen(cv_profile, banked)
+    generated: list[Question] = []
+    errors: list[Exception] = []
+    finished = 0
+    try:
+        while finished < len(tasks) and len(seen.questions) < count:
+            item = await queue.get()
+            if item is _SHARD_DONE:
+                finished += 1
+            elif isinstance(item, Exception):
+                errors.append(item)
+            elif seen.admit(item):
+                generated.append(item)
+                yield item
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    if errors and not seen.questions:
+        raise errors[0]
+    for error in errors:
+        logger.warning("Question shard failed: %s", error)
+    for question in await _top_up(cv_profile, mode, difficulty, count, seen):
+        generated.append(question)
+        yield question
+    await _bank_generated(generated, cv_profile, mode, difficulty)
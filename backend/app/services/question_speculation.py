@@ -0,0 +1,217 @@
+import asyncio
+import logging
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Optional
+
+from app.ai.scheduler import Priority, at_most
+from app.config import get_settings
+from app.db.connection import get_pool
+from app.models.cv import CVProfile
+from app.models.interview import Difficulty, InterviewMode, Question, StartInterviewRequest
+from app.services.metrics import get_metrics
+from app.services.question_generator import generate_questions
+
+logger = logging.getLogger(__name__)
+
+# How long /start waits for a matching speculation that is still generating
+# before it generates on demand instead
+_PENDING_WAIT_SECONDS = 5.0
+_PENDING_POLL_INTERVAL_SECONDS = 0.25
+
+# The global most popular choice is an aggregate over recent results; it
+# changes slowly, so it is recomputed at most this often per process
+_POPULAR_WINDOW_DAYS = 7
+_POPULAR_TTL_SECONDS = 600.0
+
+_DEFAULT_MODE = InterviewMode.MIXED
+_DEFAULT_DIFFICULTY = StartInterviewRequest.model_fields["difficulty"].default
+_DEFAULT_COUNT = StartInterviewRequest.model_fields["question_count"].default
+_MAX_COUNT = 20
+
+
+class QuestionSpeculator:
+    """Generates questions at upload time for the interview a user will most likely start.
+
+    The guess is the user's last choice of mode and difficulty (with as many
+    questions as they answered then) or, for anonymous and new users, the
+    most popular recent choice. Generated questions are kept in the
+    speculative_questions table against the CV session token, so /start can
+    serve them from any API process, and are used at most once.
+    """
+
+    def __init__(self):
+        self._tasks: set[asyncio.Task] = set()  # strong refs so they aren't GC'd mid-flight
+        self._popular: Optional[tuple[InterviewMode, Difficulty]] = None
+        self._popular_at = 0.0
+        self._hits = 0
+        self._misses = 0
+
+    # ── Prediction ────────────────────────────────────────────────────────────
+
+    async def predict(self, user_id: Optional[str]) -> tuple[InterviewMode, Difficulty, int]:
+        pool = await get_pool()
+        if user_id:
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    SELECT mode, difficulty, jsonb_array_length(data->'answer_reviews') AS answered
+                    FROM interview_results WHERE user_id = $1
+                    ORDER BY created_at DESC LIMIT 1
+                    """,
+                    user_id,
+                )
+            if row is not None and row["mode"] and row["difficulty"]:
+                count = min(max(row["answered"] or _DEFAULT_COUNT, 1), _MAX_COUNT)
+                return InterviewMode(row["mode"]), Difficulty(row["difficulty"]), count
+        mode, difficulty = await self._most_popular()
+        return mode, difficulty, _DEFAULT_COUNT
+
+    async def _most_popular(self) -> tuple[InterviewMode, Difficulty]:
+        if self._popular is not None and time.monotonic() - self._popular_at < _POPULAR_TTL_SECONDS:
+            return self._popular
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT mode, difficulty FROM interview_results
+                WHERE created_at > NOW() - make_interval(days => $1)
+                  AND mode IS NOT NULL AND difficulty IS NOT NULL
+                GROUP BY mode, difficulty
+                ORDER BY count(*) DESC LIMIT 1
+                """,
+                _POPULAR_WINDOW_DAYS,
+            )
+        if row is not None:
+            self._popular = InterviewMode(row["mode"]), Difficulty(row["difficulty"])
+        else:
+            self._popular = _DEFAULT_MODE, _DEFAULT_DIFFICULTY
+        self._popular_at = time.monotonic()
+        return self._popular
+
+    # ── Speculation ───────────────────────────────────────────────────────────
+
+    def speculate(self, token: str, cv_profile: CVProfile, user_id: Optional[str]) -> None:
+        """Start generating questions for `token` in the background, below interactive priority."""
+        with at_most(Priority.BACKGROUND):
+            task = asyncio.create_task(self._speculate(token, cv_profile, user_id))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _speculate(self, token: str, cv_profile: CVProfile, user_id: Optional[str]) -> None:
+        metrics = get_metrics()
+        try:
+            mode, difficulty, count = await self.predict(user_id)
+            expires_at = datetime.now(timezone.utc) + timedelta(seconds=get_settings().cv_session_ttl_seconds)
+            pool = await get_pool()
+            async with pool.acquire() as conn:
+                async with conn.transaction():
+                    await conn.execute("DELETE FROM speculative_questions WHERE expires_at <= NOW()")
+                    await conn.execute(
+                        """
+                        INSERT INTO speculative_questions (token, mode, difficulty, question_count, expires_at)
+                        VALUES ($1, $2, $3, $4, $5)
+                        ON CONFLICT (token) DO NOTHING
+                        """,
+                        token,
+                        mode.value,
+                        difficulty.value,
+                        count,
+                        expires_at,
+                    )
+            metrics.incr("questions.speculation.started")
+
+            questions = await generate_questions(cv_profile, mode, difficulty, count)
+            async with pool.acquire() as conn:
+                if len(questions) < count:
+                    await conn.execute("DELETE FROM speculative_questions WHERE token = $1", token)
+                    metrics.incr("questions.speculation.failed")
+                    return
+                await conn.execute(
+                    "UPDATE speculative_questions SET questions = $2 WHERE token = $1",
+                    token,
+                    [q.model_dump(mode="json") for q in questions],
+                )
+        except Exception as e:
+            metrics.incr("questions.speculation.failed")
+            logger.warning("Speculative question generation failed for a CV session: %s", e)
+            try:
+                pool = await get_pool()
+                async with pool.acquire() as conn:
+                    await conn.execute("DELETE FROM speculative_questions WHERE token = $1", token)
+            except Exception:
+                pass
+
+    # ── Serving ───────────────────────────────────────────────────────────────
+
+    async def take(
+        self,
+        token: str,
+        mode: InterviewMode,
+        difficulty: Difficulty,
+        count: int,
+    ) -> Optional[list[Question]]:
+        """Claim speculated questions matching the request, or None to generate on demand.
+
+        A speculation for the same mode and difficulty with at least `count`
+        questions matches. One that is still generating is waited for briefly.
+        """
+        pool = await get_pool()
+        deadline = time.monotonic() + _PENDING_WAIT_SECONDS
+        waited = False
+        while True:
+            async with pool.acquire() as conn:
+                row = await conn.fetchrow(
+                    """
+                    DELETE FROM speculative_questions
+                    WHERE token = $1 AND mode = $2 AND difficulty = $3 AND question_count >= $4
+                      AND questions IS NOT NULL AND expires_at > NOW()
+                    RETURNING questions
+                    """,
+                    token,
+                    mode.value,
+                    difficulty.value,
+                    count,
+                )
+                pending = row is None and await conn.fetchval(
+                    """
+                    SELECT EXISTS (
+                        SELECT 1 FROM speculative_questions
+                        WHERE token = $1 AND mode = $2 AND difficulty = $3 AND question_count >= $4
+                          AND questions IS NULL AND expires_at > NOW()
+                    )
+                    """,
+                    token,
+                    mode.value,
+                    difficulty.value,
+                    count,
+                )
+            if row is not None:
+                if waited:
+                    get_metrics().incr("questions.speculation.pending_hits")
+                self._record(hit=True)
+                return [Question.model_validate(q) for q in row["questions"][:count]]
+            if not pending or time.monotonic() >= deadline:
+                if pending:
+                    get_metrics().incr("questions.speculation.pending_timeouts")
+                self._record(hit=False)
+                return None
+            waited = True
+            await asyncio.sleep(_PENDING_POLL_INTERVAL_SECONDS)
+
+    def _record(self, hit: bool) -> None:
+        metrics = get_metrics()
+        if hit:
+            self._hits += 1
+            metrics.incr("questions.speculation.hits")
+        else:
+            self._misses += 1
+            metrics.incr("questions.speculation.misses")
+        metrics.set_gauge("questions.speculation.hit_rate", self._hits / (self._hits + self._misses))
+
+
+_speculator = QuestionSpeculator()
+
+
+def get_question_speculator() -> QuestionSpeculator:
+    return _speculator
@@ -0,0 +1,503 @@
+import asyncio
+import logging
+import time
+from typing import NamedTuple, Optional
+
+from pydantic import ValidationError
+
+from app.ai.batch import BatchBackend, BatchRequest, BatchStatus
+from app.ai.structured import parse_json
+from app.ai.usage import usage_summary
+from app.db.connection import get_pool
+from app.models.cv import CVProfile
+from app.models.interview import InterviewMode
+from app.models.results import AnswerScore, InterviewResults, results_from_feedback
+from app.prompts.evaluation_prompts import build_overall_feedback_prompt
+from app.prompts.question_prompts import build_evaluation_prompt
+from app.services.scoring import summarize_scores
+
+logger = logging.getLogger(__name__)
+
+# A request that fails or returns malformed JSON is resubmitted in a later
+# batch; after this many attempts its session is counted as failed
+_MAX_ATTEMPTS = 3
+
+_ANSWER_MAX_TOKENS = 1024
+_FEEDBACK_MAX_TOKENS = 1024
+
+_SESSION_COLUMNS = """
+SELECT r.session_id, r.data, r.mode, r.difficulty,
+       s.data->'questions' AS questions, p.cv_profile
+FROM interview_results r
+LEFT JOIN interview_sessions s ON s.session_id = r.session_id
+LEFT JOIN cv_profiles p ON p.profile_hash = s.data->>'cv_profile_hash'
+"""
+
+
+class _Session(NamedTuple):
+    session_id: str
+    mode: InterviewMode
+    difficulty: str
+    cv_profile: CVProfile
+    reviews: list[AnswerScore]  # the original scores carry question text and transcript
+    categories: dict[str, str]
+
+
+class _Batch(NamedTuple):
+    batch_id: str
+    stage: str  # "answers" or "feedback"
+    attempt: int
+    session_ids: list[str]
+    # Scores already obtained for these sessions, by session_id then question_id
+    answer_scores: dict[str, dict[str, AnswerScore]]
+
+
+def _session_from_row(row) -> _Session:
+    results = InterviewResults.model_validate(row["data"])
+    return _Session(
+        session_id=row["session_id"],
+        mode=InterviewMode(row["mode"] or InterviewMode.MIXED.value),
+        difficulty=row["difficulty"] or "medium",
+        # Sessions and profiles expire independently of results; fall back to
+        # what the stored report itself contains
+        cv_profile=CVProfile.model_validate(row["cv_profile"]) if row["cv_profile"] else CVProfile(),
+        reviews=results.answer_reviews,
+        categories={q["question_id"]: q.get("category", "General") for q in row["questions"] or []},
+    )
+
+
+def _category(session: _Session, review: AnswerScore) -> str:
+    # The question's own category, as live scoring sees it; the review's copy
+    # only when the session's questions have expired
+    return session.categories.get(review.question_id, review.category or "General")
+
+
+def _parse_answer(text: Optional[str], review: AnswerScore, category: str) -> Optional[AnswerScore]:
+    if text is None:
+        return None
+    try:
+        data = parse_json(text)
+        return AnswerScore(
+            question_id=review.question_id,
+            question_text=review.question_text,
+            transcript=review.transcript,
+            score=int(data["score"]),
+            feedback=data["feedback"],
+            strengths=data.get("strengths", []),
+            improvements=data.get("improvements", []),
+            category=category,
+        )
+    except (KeyError, TypeError, ValueError, ValidationError):
+        return None
+
+
+def _parse_feedback(
+    text: Optional[str], session: _Session, answer_scores: list[AnswerScore]
+) -> Optional[InterviewResults]:
+    if text is None:
+        return None
+    try:
+        scores = summarize_scores(answer_scores, session.difficulty)
+        return results_from_feedback(session.session_id, answer_scores, scores, parse_json(text))
+    except (KeyError, TypeError, ValueError, ValidationError):
+        return None
+
+
+def _dump_scores(scores: dict[str, dict[str, AnswerScore]]) -> dict:
+    return {
+        session_id: {question_id: score.model_dump(mode="json") for question_id, score in by_question.items()}
+        for session_id, by_question in scores.items()
+    }
+
+
+def _load_scores(data: Optional[dict]) -> dict[str, dict[str, AnswerScore]]:
+    return {
+        session_id: {question_id: AnswerScore.model_validate(score) for question_id, score in by_question.items()}
+        for session_id, by_question in (data or {}).items()
+    }
+
+
+class RescoreJob:
+    """Re-scores stored interviews under a new `version` through a batch backend.
+
+    Results are read from interview_results in keyset pages of `batch_size`
+    sessions, one short query per page, and each page is submitted as a
+    chunk: first one request per answer, then, once a session's answers are
+    all scored, one overall feedback request. Up to `max_in_flight` chunks are open at the vendor at
+    once. Every batch is recorded in rescore_batches before the next step, so
+    an interrupted run picks up its open batches and continues from the
+    checkpointed cursor when started again with the same version. Finished
+    reports go to interview_results_versions; the originals are untouched.
+    """
+
+    def __init__(
+        self,
+        backend: BatchBackend,
+        version: str,
+        batch_size: int = 500,
+        max_in_flight: int = 4,
+        poll_interval: float = 60.0,
+        limit: Optional[int] = None,
+        from_start: bool = False,
+    ):
+        self._backend = backend
+        self._version = version
+        self._batch_size = batch_size
+        self._slots = asyncio.Semaphore(max_in_flight)
+        self._poll_interval = poll_interval
+        self._limit = limit
+        self._from_start = from_start
+        self._started = time.monotonic()
+        self._stats = {
+            "batches": 0,
+            "requests": 0,
+            "sessions_done": 0,
+            "sessions_failed": 0,
+            "answers_scored": 0,
+        }
+
+    async def run(self) -> dict:
+        cursor = await self._open_run()
+        tasks = []
+        for batch in await self._open_batches():
+            await self._slots.acquire()
+            tasks.append(asyncio.create_task(self._run_chunk(batch)))
+
+        remaining = self._limit
+        while remaining is None or remaining > 0:
+            size = self._batch_size if remaining is None else min(self._batch_size, remaining)
+            # The page is read only once a slot is free, so no snapshot or
+            # connection is held while earlier chunks wait at the vendor
+            await self._slots.acquire()
+            chunk = [_session_from_row(row) for row in await self._page(cursor, size)]
+            if not chunk:
+                self._slots.release()
+                break
+            cursor = chunk[-1].session_id
+            tasks.append(await self._start_chunk(chunk))
+            if remaining is not None:
+                remaining -= len(chunk)
+            if len(chunk) < size:
+                break
+
+        await asyncio.gather(*tasks)
+        return await self._finish()
+
+    # ── Pipeline ──────────────────────────────────────────────────────────────
+
+    async def _start_chunk(self, sessions: list[_Session]) -> asyncio.Task:
+        # The caller holds the chunk's slot; _run_chunk releases it
+        batch = await self._submit("answers", 1, sessions, {})
+        await self._record([batch], cursor=sessions[-1].session_id)
+        return asyncio.create_task(self._run_chunk(batch))
+
+    async def _run_chunk(self, batch: _Batch) -> None:
+        try:
+            pending = [batch]
+            while pending:
+                successors = await asyncio.gather(*(self._advance(b) for b in pending))
+                pending = [b for group in successors for b in group]
+        finally:
+            self._slots.release()
+
+    async def _advance(self, batch: _Batch) -> list[_Batch]:
+        """Wait for `batch`, store what it produced and submit whatever comes next."""
+        while (status := await self._backend.status(batch.batch_id)) == BatchStatus.IN_PROGRESS:
+            await asyncio.sleep(self._poll_interval)
+
+        sessions = await self._load_sessions(batch.session_ids)
+        if status == BatchStatus.EXPIRED:
+            logger.warning("Batch %s expired; resubmitting %d sessions", batch.batch_id, len(sessions))
+            retry = await self._submit(batch.stage, batch.attempt, sessions, batch.answer_scores)
+            await self._record([retry], closed=batch, closed_status="expired")
+            return [retry]
+        if batch.stage == "answers":
+            return await self._collect_answers(batch, sessions)
+        return await self._collect_feedback(batch, sessions)
+
+    async def _collect_answers(self, batch: _Batch, sessions: list[_Session]) -> list[_Batch]:
+        texts = await self._backend.results(batch.batch_id, "batch.evaluate_answer")
+        scores = {s.session_id: dict(batch.answer_scores.get(s.session_id, {})) for s in sessions}
+        for request, session, review in self._answer_items(batch.session_ids, sessions, batch.answer_scores):
+            score = _parse_answer(texts.get(request.custom_id), review, _category(session, review))
+            if score is not None:
+                scores[session.session_id][review.question_id] = score
+
+        complete, incomplete = [], []
+        for session in sessions:
+            done = all(r.question_id in scores[session.session_id] for r in session.reviews)
+            (complete if done else incomplete).append(session)
+        successors = []
+        if complete:
+            successors.append(await self._submit("feedback", 1, complete, scores))
+        failed = 0
+        if incomplete and batch.attempt < _MAX_ATTEMPTS:
+            successors.append(await self._submit("answers", batch.attempt + 1, incomplete, scores))
+        else:
+            failed = len(incomplete)
+        await self._record(successors, closed=batch, failed=failed)
+        return successors
+
+    async def _collect_feedback(self, batch: _Batch, sessions: list[_Session]) -> list[_Batch]:
+        texts = await self._backend.results(batch.batch_id, "batch.generate_overall_feedback")
+        by_id = {s.session_id: s for s in sessions}
+        reports: list[InterviewResults] = []
+        retry: list[_Session] = []
+        for i, session_id in enumerate(batch.session_ids):
+            session = by_id.get(session_id)
+            if session is None:
+                continue
+            answer_scores = [batch.answer_scores[session_id][r.question_id] for r in session.reviews]
+            results = _parse_feedback(texts.get(f"f{i}"), session, answer_scores)
+            if results is not None:
+                reports.append(results)
+            else:
+                retry.append(session)
+
+        successors = []
+        failed = 0
+        if retry and batch.attempt < _MAX_ATTEMPTS:
+            successors.append(await self._submit("feedback", batch.attempt + 1, retry, batch.answer_scores))
+        else:
+            failed = len(retry)
+        await self._record(successors, closed=batch, reports=reports, failed=failed)
+        return successors
+
+    # ── Requests ──────────────────────────────────────────────────────────────
+
+    @staticmethod
+    def _answer_items(
+        session_ids: list[str],
+        sessions: list[_Session],
+        carried: dict[str, dict[str, AnswerScore]],
+    ) -> list[tuple[BatchRequest, _Session, AnswerScore]]:
+        """One request per answer not yet scored; custom ids are stable across resubmission."""
+        by_id = {s.session_id: s for s in sessions}
+        items = []
+        for i, session_id in enumerate(session_ids):
+            session = by_id.get(session_id)
+            if session is None:
+                continue
+            for j, review in enumerate(session.reviews):
+                if review.question_id in carried.get(session_id, {}):
+                    continue
+                prompt = build_evaluation_prompt(
+                    question_text=review.question_text,
+                    transcript=review.transcript,
+                    category=_category(session, review),
+                    mode=session.mode,
+                    candidate_name=session.cv_profile.name,
+                    difficulty=session.difficulty,
+                )
+                items.append((BatchRequest(f"a{i}_{j}", prompt, _ANSWER_MAX_TOKENS), session, review))
+        return items
+
+    async def _submit(
+        self,
+        stage: str,
+        attempt: int,
+        sessions: list[_Session],
+        scores: dict[str, dict[str, AnswerScore]],
+    ) -> _Batch:
+        session_ids = [s.session_id for s in sessions]
+        carried = {sid: scores[sid] for sid in session_ids if sid in scores}
+        if stage == "answers":
+            requests = [request for request, _, _ in self._answer_items(session_ids, sessions, carried)]
+        else:
+            requests = [self._feedback_request(f"f{i}", s, carried[s.session_id]) for i, s in enumerate(sessions)]
+        batch_id = await self._backend.submit(requests)
+        self._stats["batches"] += 1
+        self._stats["requests"] += len(requests)
+        return _Batch(batch_id, stage, attempt, session_ids, carried)
+
+    @staticmethod
+    def _feedback_request(custom_id: str, session: _Session, scores: dict[str, AnswerScore]) -> BatchRequest:
+        answer_scores = [scores[r.question_id] for r in session.reviews]
+        prompt = build_overall_feedback_prompt(
+            answer_scores, summarize_scores(answer_scores, session.difficulty), session.cv_profile, session.mode
+        )
+        return BatchRequest(custom_id, prompt, _FEEDBACK_MAX_TOKENS)
+
+    # ── Persistence ───────────────────────────────────────────────────────────
+
+    async def _page(self, cursor: str, size: int) -> list:
+        """Up to `size` results not yet re-scored under this version, after `cursor`, in session_id order."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetch(
+                _SESSION_COLUMNS
+                + """
+                WHERE r.session_id > $2
+                  AND jsonb_array_length(r.data->'answer_reviews') > 0
+                  AND NOT EXISTS (
+                      SELECT 1 FROM interview_results_versions v
+                      WHERE v.session_id = r.session_id AND v.version = $1
+                  )
+                  AND NOT EXISTS (
+                      SELECT 1 FROM rescore_batches b
+                      WHERE b.version = $1 AND b.status = 'submitted' AND b.session_ids ? r.session_id
+                  )
+                ORDER BY r.session_id
+                LIMIT $3
+                """,
+                self._version,
+                cursor,
+                size,
+            )
+
+    async def _load_sessions(self, session_ids: list[str]) -> list[_Session]:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(_SESSION_COLUMNS + "WHERE r.session_id = ANY($1::text[])", session_ids)
+        by_id = {row["session_id"]: _session_from_row(row) for row in rows}
+        return [by_id[sid] for sid in session_ids if sid in by_id]
+
+    async def _open_run(self) -> str:
+        """Create or resume the run for this version; return its checkpointed cursor."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    INSERT INTO rescore_runs (version, model_id) VALUES ($1, $2)
+                    ON CONFLICT (version) DO NOTHING
+                    """,
+                    self._version,
+                    self._backend.model_id,
+                )
+                row = await conn.fetchrow(
+                    "SELECT model_id, cursor FROM rescore_runs WHERE version = $1 FOR UPDATE",
+                    self._version,
+                )
+                if row["model_id"] != self._backend.model_id:
+                    raise ValueError(
+                        f"Version {self._version!r} was scored with {row['model_id']}, "
+                        f"not {self._backend.model_id}; pick a new version."
+                    )
+                cursor = "" if self._from_start else row["cursor"]
+                await conn.execute(
+                    "UPDATE rescore_runs SET cursor = $2, finished_at = NULL, updated_at = NOW() WHERE version = $1",
+                    self._version,
+                    cursor,
+                )
+        return cursor
+
+    async def _open_batches(self) -> list[_Batch]:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT batch_id, stage, attempt, session_ids, answer_scores FROM rescore_batches
+                WHERE version = $1 AND status = 'submitted'
+                ORDER BY submitted_at
+                """,
+                self._version,
+            )
+        return [
+            _Batch(row["batch_id"], row["stage"], row["attempt"], row["session_ids"], _load_scores(row["answer_scores"]))
+            for row in rows
+        ]
+
+    async def _record(
+        self,
+        submitted: list[_Batch],
+        closed: Optional[_Batch] = None,
+        closed_status: str = "done",
+        reports: Optional[list[InterviewResults]] = None,
+        failed: int = 0,
+        cursor: Optional[str] = None,
+    ) -> None:
+        """Atomically checkpoint one pipeline step: new batches, the one they replace and its output."""
+        reports = reports or []
+        answers = sum(len(r.answer_reviews) for r in reports)
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                for batch in submitted:
+                    await conn.execute(
+                        """
+                        INSERT INTO rescore_batches (batch_id, version, stage, attempt, session_ids, answer_scores)
+                        VALUES ($1, $2, $3, $4, $5, $6)
+                        """,
+                        batch.batch_id,
+                        self._version,
+                        batch.stage,
+                        batch.attempt,
+                        batch.session_ids,
+                        _dump_scores(batch.answer_scores),
+                    )
+                if closed is not None:
+                    await conn.execute(
+                        "UPDATE rescore_batches SET status = $2, completed_at = NOW() WHERE batch_id = $1",
+                        closed.batch_id,
+                        closed_status,
+                    )
+                if reports:
+                    await conn.executemany(
+                        """
+                        INSERT INTO interview_results_versions (session_id, version, model_id, data)
+                        VALUES ($1, $2, $3, $4)
+                        ON CONFLICT (session_id, version) DO UPDATE
+                        SET model_id = EXCLUDED.model_id, data = EXCLUDED.data, created_at = NOW()
+                        """,
+                        [
+                            (r.session_id, self._version, self._backend.model_id, r.model_dump(mode="json"))
+                            for r in reports
+                        ],
+                    )
+                await conn.execute(
+                    """
+                    UPDATE rescore_runs
+                    SET cursor = GREATEST(cursor, COALESCE($2, cursor)),
+                        sessions_done = sessions_done + $3,
+                        sessions_failed = sessions_failed + $4,
+                        answers_scored = answers_scored + $5,
+                        updated_at = NOW()
+                    WHERE version = $1
+                    """,
+                    self._version,
+                    cursor,
+                    len(reports),
+                    failed,
+                    answers,
+                )
+
+        if reports or failed:
+            self._stats["sessions_done"] += len(reports)
+            self._stats["sessions_failed"] += failed
+            self._stats["answers_scored"] += answers
+            report = self.report()
+            logger.info(
+                "%s: %d sessions re-scored, %d failed (%.0f sessions/hour)",
+                self._version,
+                report["sessions_done"],
+                report["sessions_failed"],
+                report["sessions_per_hour"],
+            )
+
+    async def _finish(self) -> dict:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                UPDATE rescore_runs SET finished_at = NOW(), updated_at = NOW()
+                WHERE version = $1
+                RETURNING sessions_done, sessions_failed, answers_scored
+                """,
+                self._version,
+            )
+        return {**self.report(), "run_totals": dict(row)}
+
+    def report(self) -> dict:
+        """Throughput of this invocation, plus batch token and prompt-cache usage."""
+        elapsed = time.monotonic() - self._started
+        hours = elapsed / 3600
+        return {
+            "version": self._version,
+            "model": self._backend.model_id,
+            "elapsed_seconds": round(elapsed, 1),
+            **self._stats,
+            "sessions_per_hour": self._stats["sessions_done"] / hours if hours else 0.0,
+            "answers_per_hour": self._stats["answers_scored"] / hours if hours else 0.0,
+            "usage": {call: usage for call, usage in usage_summary().items() if call.startswith("batch.")},
+        }
@@ -0,0 +1,145 @@
+import asyncio
+import json
+import logging
+from contextlib import asynccontextmanager
+from typing import AsyncIterator, Optional
+
+import asyncpg
+
+from app.config import get_settings
+from app.db.connection import get_pool
+
+logger = logging.getLogger(__name__)
+
+# Postgres NOTIFY channel; the payload is {"session_id": ..., "event": ..., **data},
+# where session_id is an interview session id or a CV session token
+CHANNEL = "interview_events"
+
+# Postgres rejects NOTIFY payloads of 8000 bytes or more
+_MAX_PAYLOAD_BYTES = 7900
+
+_RECONNECT_DELAY_SECONDS = 2.0
+
+# Delivered to every subscriber when notifications may have been missed
+RESYNC = {"event": "resync"}
+
+
+async def notify(conn: asyncpg.Connection, session_id: str, event: str, **data) -> None:
+    """Queue a NOTIFY on `conn`; inside a transaction it is delivered only on commit.
+
+    Data too large for a payload is dropped (the event is sent with
+    ``"truncated": true``), so listeners must treat it as a hint.
+    """
+    payload = json.dumps({"session_id": session_id, "event": event, **data})
+    if len(payload.encode()) > _MAX_PAYLOAD_BYTES:
+        payload = json.dumps({"session_id": session_id, "event": event, "truncated": True})
+    await conn.execute("SELECT pg_notify($1, $2)", CHANNEL, payload)
+
+
+async def publish(session_id: str, event: str, **data) -> None:
+    """Send a notification outside of any transaction."""
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        await notify(conn, session_id, event, **data)
+
+
+class ResultsNotifier:
+    """Fans out Postgres notifications about sessions to waiting requests.
+
+    One dedicated connection LISTENs for the whole process; each waiting
+    request registers a queue for its session and receives every
+    notification payload for that session. If the connection drops, every
+    queue gets `RESYNC` so its reader can re-check state it might have
+    missed, and the connection is re-established in the background.
+    """
+
+    def __init__(self):
+        self._conn: Optional[asyncpg.Connection] = None
+        self._waiters: dict[str, set[asyncio.Queue]] = {}
+        self._reconnect_task: Optional[asyncio.Task] = None
+        self._closed = False
+
+    async def start(self) -> None:
+        self._conn = await asyncpg.connect(get_settings().database_url)
+        self._conn.add_termination_listener(self._on_terminated)
+        await self._conn.add_listener(CHANNEL, self._on_notify)
+
+    async def close(self) -> None:
+        self._closed = True
+        if self._reconnect_task is not None:
+            self._reconnect_task.cancel()
+        if self._conn is not None and not self._conn.is_closed():
+            await self._conn.close()
+        self._conn = None
+        self._wake_all()
+
+    @asynccontextmanager
+    async def subscribe(self, session_id: str) -> AsyncIterator[asyncio.Queue]:
+        """Register interest in a session *before* checking its state, so no event is missed."""
+        inbox: asyncio.Queue = asyncio.Queue()
+        self._waiters.setdefault(session_id, set()).add(inbox)
+        try:
+            yield inbox
+        finally:
+            waiters = self._waiters.get(session_id)
+            if waiters is not None:
+                waiters.discard(inbox)
+                if not waiters:
+                    del self._waiters[session_id]
+
+    def _on_notify(self, conn, pid, channel, payload: str) -> None:
+        try:
+            message = json.loads(payload)
+            session_id = message["session_id"]
+        except (ValueError, KeyError, TypeError):
+            logger.warning("Ignoring malformed %s payload: %r", CHANNEL, payload)
+            return
+        for inbox in self._waiters.get(session_id, ()):
+            inbox.put_nowait(message)
+
+    def _wake_all(self) -> None:
+        for waiters in self._waiters.values():
+            for inbox in waiters:
+                inbox.put_nowait(RESYNC)
+
+    def _on_terminated(self, conn) -> None:
+        if self._closed:
+            return
+        logger.warning("Lost the %s LISTEN connection; reconnecting", CHANNEL)
+        self._wake_all()
+        if self._reconnect_task is None or self._reconnect_task.done():
+            self._reconnect_task = asyncio.create_task(self._reconnect())
+
+    async def _reconnect(self) -> None:
+        while not self._closed:
+            await asyncio.sleep(_RECONNECT_DELAY_SECONDS)
+            try:
+                await self.start()
+            except (OSError, asyncpg.PostgresError):
+                logger.exception("Reconnecting the %s listener failed", CHANNEL)
+                continue
+            self._wake_all()  # anything sent while we were away
+            return
+
+
+_notifier: Optional[ResultsNotifier] = None
+
+
+async def init_results_notifier() -> ResultsNotifier:
+    global _notifier
+    _notifier = ResultsNotifier()
+    await _notifier.start()
+    return _notifier
+
+
+def get_results_notifier() -> ResultsNotifier:
+    if _notifier is None:
+        raise RuntimeError("Results notifier not initialised — call init_results_notifier() first.")
+    return _notifier
+
+
+async def close_results_notifier() -> None:
+    global _notifier
+    if _notifier is not None:
+        await _notifier.close()
+        _notifier = None
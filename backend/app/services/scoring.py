@@ -0,0 +1,58 @@
+from typing import Sequence, Union
+
+from app.models.interview import Difficulty
+from app.models.results import AnswerScore, CategoryScore, ProvisionalAnswerScore, ScoreSummary, score_to_grade
+
+# Weight of an answer in the overall score by its question's category, per
+# difficulty; the categories that probe depth count for more at harder levels.
+# Unlisted categories weigh 1.
+_CATEGORY_WEIGHTS: dict[Difficulty, dict[str, float]] = {
+    Difficulty.EASY: {},
+    Difficulty.MEDIUM: {"Technical": 1.25, "System Design": 1.25},
+    Difficulty.HARD: {"Technical": 1.5, "System Design": 1.5, "Situational": 1.25},
+}
+
+_CATEGORY_LABELS = {
+    "Behavioral": "Behavioural & Teamwork",
+    "Technical": "Technical Depth",
+    "System Design": "System Design",
+    "Situational": "Problem Solving",
+    "HR": "Motivation & Fit",
+}
+
+_UNCATEGORISED = "General"
+
+
+def summarize_scores(
+    answer_scores: Sequence[Union[AnswerScore, ProvisionalAnswerScore]], difficulty: Union[Difficulty, str]
+) -> ScoreSummary:
+    """Overall score, grade and per-category scores for a report, computed from its answer scores.
+
+    Category scores are plain means of the answers in that category, in
+    order of first appearance; the overall score is the mean of all answers
+    weighted by category for the session's difficulty.
+    """
+    weights = _CATEGORY_WEIGHTS.get(Difficulty(difficulty), {})
+    by_category: dict[str, list[int]] = {}
+    weighted_sum = 0.0
+    total_weight = 0.0
+    for answer in answer_scores:
+        category = answer.category or _UNCATEGORISED
+        by_category.setdefault(category, []).append(answer.score)
+        weight = weights.get(category, 1.0)
+        weighted_sum += weight * answer.score
+        total_weight += weight
+
+    overall_score = round(weighted_sum / total_weight) if total_weight else 0
+    return ScoreSummary(
+        overall_score=overall_score,
+        grade=score_to_grade(overall_score),
+        category_scores=[
+            CategoryScore(
+                category=category,
+                score=round(sum(scores) / len(scores)),
+                label=_CATEGORY_LABELS.get(category, category),
+            )
+            for category, scores in by_category.items()
+        ],
+    )
@@ -1,45 +1,202 @@
 import uuid
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Optional
+from typing import NamedTuple, Optional
 
-from app.models.cv import CVProfile
-from app.models.interview import InterviewSession
-from app.models.results import InterviewResults
+from app.models.cv import CVProfile, CVStatus
+from app.models.interview import (
+    Answer,
+    Difficulty,
+    InterviewSession,
+    Question,
+    SessionProgress,
+    SessionStatus,
+)
+from app.models.results import AnswerScore, InterviewResults
 from app.config import get_settings
 from app.db.connection import get_pool
+from app.services.results_notifier import notify
+
+# Profiles are immutable once stored, so this only bounds memory
+_PROFILE_CACHE_SIZE = 512
+
+# Session fields kept in their own columns/table rather than the JSONB document
+_SCALAR_FIELDS = {"answers", "status", "current_question_index"}
+
+_PROGRESS_COLUMNS = """
+    session_id, status, current_question_index,
+    jsonb_array_length(data->'questions') AS questions_available,
+    COALESCE((data->>'questions_complete')::boolean, true) AS questions_complete,
+    (data->>'question_count')::int AS question_count
+"""
+
+# Status changes that end a wait for results; announced on the events channel
+_NOTIFY_STATUSES = {SessionStatus.EVALUATED, SessionStatus.ERROR}
+
+
+class CVTokenState(NamedTuple):
+    status: CVStatus
+    profile_hash: Optional[str]  # set once the status is READY
+    error: Optional[str]
+
+
+class AnsweredQuestions(NamedTuple):
+    status: SessionStatus
+    difficulty: Difficulty
+    pairs: list[tuple[Question, Answer]]  # in answer order
 
 
 class SessionStore:
     """PostgreSQL-backed store for CV tokens, interview sessions, and results."""
 
-    # ── CV Tokens ─────────────────────────────────────────────────────────────
+    # ── CV Profiles & Tokens ──────────────────────────────────────────────────
+    # Each distinct profile is stored once in cv_profiles, keyed by its content
+    # hash; tokens and sessions only carry that hash. Profiles are immutable,
+    # so they are also cached in-process.
+
+    def __init__(self):
+        self._profile_cache: OrderedDict[str, CVProfile] = OrderedDict()
+
+    def _cache_profile(self, profile_hash: str, profile: CVProfile) -> None:
+        self._profile_cache[profile_hash] = profile
+        self._profile_cache.move_to_end(profile_hash)
+        while len(self._profile_cache) > _PROFILE_CACHE_SIZE:
+            self._profile_cache.popitem(last=False)
+
+    async def _insert_profile(self, conn, profile: CVProfile) -> str:
+        profile_hash = profile.content_hash()
+        if profile_hash not in self._profile_cache:
+            await conn.execute(
+                """
+                INSERT INTO cv_profiles (profile_hash, cv_profile) VALUES ($1, $2)
+                ON CONFLICT (profile_hash) DO NOTHING
+                """,
+                profile_hash,
+                profile.model_dump(mode="json"),
+            )
+        return profile_hash
+
+    @staticmethod
+    def _cv_token_expiry() -> datetime:
+        return datetime.now(timezone.utc) + timedelta(seconds=get_settings().cv_session_ttl_seconds)
 
     async def store_cv_profile(self, profile: CVProfile) -> str:
-        settings = get_settings()
         token = str(uuid.uuid4())
-        expires_at = datetime.now(timezone.utc) + timedelta(seconds=settings.cv_session_ttl_seconds)
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                profile_hash = await self._insert_profile(conn, profile)
+                await conn.execute(
+                    "INSERT INTO cv_sessions (token, profile_hash, expires_at) VALUES ($1, $2, $3)",
+                    token,
+                    profile_hash,
+                    self._cv_token_expiry(),
+                )
+        self._cache_profile(profile_hash, profile)
+        return token
+
+    async def create_pending_cv_token(self, raw_text: str) -> str:
+        """Issue a token for a CV whose profile is still to be extracted from `raw_text`."""
+        token = str(uuid.uuid4())
         pool = await get_pool()
         async with pool.acquire() as conn:
             await conn.execute(
-                "INSERT INTO cv_sessions (token, cv_profile, expires_at) VALUES ($1, $2, $3)",
+                "INSERT INTO cv_sessions (token, status, raw_text, expires_at) VALUES ($1, $2, $3, $4)",
                 token,
-                profile.model_dump(mode="json"),
-                expires_at,
+                CVStatus.EXTRACTING.value,
+                raw_text,
+                self._cv_token_expiry(),
             )
         return token
 
-    async def get_cv_profile(self, token: str) -> Optional[CVProfile]:
+    async def get_pending_cv_text(self, token: str) -> Optional[str]:
+        """The parsed text of a CV token still awaiting extraction, or None."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetchval(
+                """
+                SELECT raw_text FROM cv_sessions
+                WHERE token = $1 AND status = $2 AND expires_at > NOW()
+                """,
+                token,
+                CVStatus.EXTRACTING.value,
+            )
+
+    async def complete_cv_token(self, token: str, profile: CVProfile) -> None:
+        """Attach the extracted profile to a pending token and mark it ready."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                profile_hash = await self._insert_profile(conn, profile)
+                await conn.execute(
+                    "UPDATE cv_sessions SET profile_hash = $2, status = $3, raw_text = NULL WHERE token = $1",
+                    token,
+                    profile_hash,
+                    CVStatus.READY.value,
+                )
+                await notify(conn, token, CVStatus.READY.value)
+        self._cache_profile(profile_hash, profile)
+
+    async def fail_cv_token(self, token: str, error: str) -> None:
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                await conn.execute(
+                    "UPDATE cv_sessions SET status = $2, error = $3, raw_text = NULL WHERE token = $1",
+                    token,
+                    CVStatus.FAILED.value,
+                    error,
+                )
+                await notify(conn, token, CVStatus.FAILED.value)
+
+    async def get_cv_token_state(self, token: str) -> Optional[CVTokenState]:
+        """Extraction status of a CV token, or None if unknown/expired."""
         pool = await get_pool()
         async with pool.acquire() as conn:
             row = await conn.fetchrow(
-                "SELECT cv_profile FROM cv_sessions WHERE token = $1 AND expires_at > NOW()",
+                "SELECT status, profile_hash, error FROM cv_sessions WHERE token = $1 AND expires_at > NOW()",
+                token,
+            )
+        if row is None:
+            return None
+        return CVTokenState(CVStatus(row["status"]), row["profile_hash"], row["error"])
+
+    async def resolve_cv_token(self, token: str) -> Optional[str]:
+        """Return the profile hash a CV token points at, or None if unknown/expired/still extracting."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            return await conn.fetchval(
+                "SELECT profile_hash FROM cv_sessions WHERE token = $1 AND expires_at > NOW()",
                 token,
             )
+
+    async def get_profile(self, profile_hash: str) -> Optional[CVProfile]:
+        cached = self._profile_cache.get(profile_hash)
+        if cached is not None:
+            self._profile_cache.move_to_end(profile_hash)
+            return cached
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                "SELECT cv_profile FROM cv_profiles WHERE profile_hash = $1",
+                profile_hash,
+            )
         if row is None:
             return None
-        return CVProfile.model_validate(row["cv_profile"])
+        profile = CVProfile.model_validate(row["cv_profile"])
+        self._cache_profile(profile_hash, profile)
+        return profile
+
+    async def get_cv_profile(self, token: str) -> Optional[CVProfile]:
+        profile_hash = await self.resolve_cv_token(token)
+        if profile_hash is None:
+            return None
+        return await self.get_profile(profile_hash)
 
     # ── Interview Sessions ────────────────────────────────────────────────────
+    # Scalar state (status, current index) lives in plain columns and answers in
+    # the append-only interview_answers table; the JSONB document only holds the
+    # parts that are written once (profile, settings, questions).
 
     async def store_session(self, session: InterviewSession) -> None:
         settings = get_settings()
@@ -48,32 +205,291 @@ class SessionStore:
         )
         pool = await get_pool()
         async with pool.acquire() as conn:
-            await conn.execute(
-                "INSERT INTO interview_sessions (session_id, data, expires_at) VALUES ($1, $2, $3)",
-                session.session_id,
-                session.model_dump(mode="json"),
-                expires_at,
-            )
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    INSERT INTO interview_sessions
+                        (session_id, data, status, current_question_index, expires_at)
+                    VALUES ($1, $2, $3, $4, $5)
+                    """,
+                    session.session_id,
+                    session.model_dump(mode="json", exclude=_SCALAR_FIELDS),
+                    session.status.value,
+                    session.current_question_index,
+                    expires_at,
+                )
+                if session.answers:
+                    await conn.executemany(
+                        """
+                        INSERT INTO interview_answers
+                            (session_id, position, question_id, transcript, duration_seconds)
+                        VALUES ($1, $2, $3, $4, $5)
+                        """,
+                        [
+                            (session.session_id, i, a.question_id, a.transcript, a.duration_seconds)
+                            for i, a in enumerate(session.answers)
+                        ],
+                    )
 
     async def get_session(self, session_id: str) -> Optional[InterviewSession]:
+        """Load the full session, including every answer. Prefer `get_progress` on hot paths."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            row = await conn.fetchrow(
+                """
+                SELECT data, status, current_question_index FROM interview_sessions
+                WHERE session_id = $1 AND expires_at > NOW()
+                """,
+                session_id,
+            )
+            if row is None:
+                return None
+            answers = await conn.fetch(
+                """
+                SELECT question_id, transcript, duration_seconds FROM interview_answers
+                WHERE session_id = $1 ORDER BY position
+                """,
+                session_id,
+            )
+        return InterviewSession.model_validate(
+            {
+                **row["data"],
+                "status": row["status"],
+                "current_question_index": row["current_question_index"],
+                "answers": [dict(a) for a in answers],
+            }
+        )
+
+    async def get_answered_questions(self, session_id: str) -> Optional[AnsweredQuestions]:
+        """Each answer with its question, without decoding the rest of the session document."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT s.status, s.data->>'difficulty' AS difficulty,
+                       a.question_id, a.transcript, a.duration_seconds,
+                       (SELECT q FROM jsonb_array_elements(s.data->'questions') q
+                        WHERE q->>'question_id' = a.question_id LIMIT 1) AS question
+                FROM interview_sessions s
+                LEFT JOIN interview_answers a ON a.session_id = s.session_id
+                WHERE s.session_id = $1 AND s.expires_at > NOW()
+                ORDER BY a.position
+                """,
+                session_id,
+            )
+        if not rows:
+            return None
+        return AnsweredQuestions(
+            status=SessionStatus(rows[0]["status"]),
+            difficulty=Difficulty(rows[0]["difficulty"]),
+            pairs=[
+                (
+                    Question.model_validate(row["question"]),
+                    Answer(
+                        question_id=row["question_id"],
+                        transcript=row["transcript"],
+                        duration_seconds=row["duration_seconds"],
+                    ),
+                )
+                for row in rows
+                if row["question"] is not None
+            ],
+        )
+
+    async def get_progress(self, session_id: str) -> Optional[SessionProgress]:
         pool = await get_pool()
         async with pool.acquire() as conn:
             row = await conn.fetchrow(
-                "SELECT data FROM interview_sessions WHERE session_id = $1 AND expires_at > NOW()",
+                f"""
+                SELECT {_PROGRESS_COLUMNS},
+                       data->'questions'->current_question_index AS current_question
+                FROM interview_sessions
+                WHERE session_id = $1 AND expires_at > NOW()
+                """,
                 session_id,
             )
         if row is None:
             return None
-        return InterviewSession.model_validate(row["data"])
+        return SessionProgress.model_validate(dict(row))
+
+    async def record_answer(self, session_id: str, answer: Answer) -> Optional[SessionProgress]:
+        """Append one answer and advance the session: one INSERT plus one narrow UPDATE.
+
+        Returns the progress after advancing (its `current_question` is the next
+        question, if already generated), or None if the session does not exist.
+        Idempotent: answering a question that already has an answer (a client
+        retry) records nothing and returns the current progress.
+        Raises ValueError if the session is no longer accepting answers or the
+        answer is not for the current question.
+        """
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                row = await conn.fetchrow(
+                    f"""
+                    SELECT {_PROGRESS_COLUMNS},
+                           data->'questions'->current_question_index->>'question_id' AS expected_question_id,
+                           data->'questions'->current_question_index AS question_at_index,
+                           data->'questions'->(current_question_index + 1) AS current_question
+                    FROM interview_sessions
+                    WHERE session_id = $1 AND expires_at > NOW()
+                    FOR UPDATE
+                    """,
+                    session_id,
+                )
+                if row is None:
+                    return None
+                already_answered = await conn.fetchval(
+                    "SELECT EXISTS (SELECT 1 FROM interview_answers WHERE session_id = $1 AND question_id = $2)",
+                    session_id,
+                    answer.question_id,
+                )
+                if already_answered:
+                    return SessionProgress.model_validate({**dict(row), "current_question": row["question_at_index"]})
+                if row["status"] != SessionStatus.ACTIVE.value:
+                    raise ValueError(f"Session is not active (status: {row['status']}).")
+                if row["expected_question_id"] != answer.question_id:
+                    raise ValueError("Answer is not for the current question.")
+
+                progress = SessionProgress.model_validate(dict(row))
+                await conn.execute(
+                    """
+                    INSERT INTO interview_answers
+                        (session_id, position, question_id, transcript, duration_seconds)
+                    VALUES ($1, $2, $3, $4, $5)
+                    """,
+                    session_id,
+                    progress.current_question_index,
+                    answer.question_id,
+                    answer.transcript,
+                    answer.duration_seconds,
+                )
+                progress.current_question_index += 1
+                if progress.current_question is None and progress.questions_complete:
+                    progress.status = SessionStatus.COMPLETED
+                await conn.execute(
+                    """
+                    UPDATE interview_sessions SET current_question_index = $1, status = $2
+                    WHERE session_id = $3
+                    """,
+                    progress.current_question_index,
+                    progress.status.value,
+                    session_id,
+                )
+        return progress
+
+    async def set_status(
+        self,
+        session_id: str,
+        status: SessionStatus,
+        only_if: Optional[SessionStatus] = None,
+    ) -> bool:
+        """Set the session status; with `only_if`, only when it currently has that status.
 
-    async def update_session(self, session: InterviewSession) -> None:
+        Returns False if no session was updated.
+        """
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                result = await conn.execute(
+                    """
+                    UPDATE interview_sessions SET status = $1
+                    WHERE session_id = $2 AND ($3::text IS NULL OR status = $3)
+                    """,
+                    status.value,
+                    session_id,
+                    only_if.value if only_if else None,
+                )
+                updated = result != "UPDATE 0"
+                if status in _NOTIFY_STATUSES and updated:
+                    await notify(conn, session_id, status.value)
+        return updated
+
+    async def append_questions(
+        self, session_id: str, questions: list[Question], complete: bool = False
+    ) -> None:
+        """Atomically append streamed questions and update the completion flag.
+
+        A set that is already complete is left alone, and waiters on the
+        session are notified of the change.
+        """
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                result = await conn.execute(
+                    """
+                    UPDATE interview_sessions
+                    SET data = data || jsonb_build_object(
+                            'questions', (data->'questions') || $1::jsonb,
+                            'questions_complete', $2::boolean
+                        ),
+                        questions_updated_at = NOW()
+                    WHERE session_id = $3 AND NOT COALESCE((data->>'questions_complete')::boolean, true)
+                    """,
+                    [q.model_dump(mode="json") for q in questions],
+                    complete,
+                    session_id,
+                )
+                if result != "UPDATE 0":
+                    await notify(conn, session_id, "questions")
+
+    async def complete_stalled_questions(self, session_id: str, stalled_seconds: float) -> bool:
+        """Mark an incomplete question set complete if nothing was appended for `stalled_seconds`.
+
+        For a set whose generating process died: the interview then ends after
+        the questions already stored. Returns True if the set was marked.
+        """
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            async with conn.transaction():
+                result = await conn.execute(
+                    """
+                    UPDATE interview_sessions
+                    SET data = data || jsonb_build_object('questions_complete', true),
+                        questions_updated_at = NOW()
+                    WHERE session_id = $1
+                      AND NOT COALESCE((data->>'questions_complete')::boolean, true)
+                      AND questions_updated_at < NOW() - make_interval(secs => $2)
+                    """,
+                    session_id,
+                    float(stalled_seconds),
+                )
+                stalled = result != "UPDATE 0"
+                if stalled:
+                    await notify(conn, session_id, "questions")
+        return stalled
+
+    # ── Answer Scores ─────────────────────────────────────────────────────────
+
+    async def store_answer_score(self, session_id: str, score: AnswerScore) -> None:
         pool = await get_pool()
         async with pool.acquire() as conn:
             await conn.execute(
-                "UPDATE interview_sessions SET data = $1 WHERE session_id = $2",
-                session.model_dump(mode="json"),
-                session.session_id,
+                """
+                INSERT INTO answer_scores (session_id, question_id, data)
+                VALUES ($1, $2, $3)
+                ON CONFLICT (session_id, question_id) DO UPDATE SET data = EXCLUDED.data
+                """,
+                session_id,
+                score.question_id,
+                score.model_dump(mode="json"),
+            )
+
+    async def get_answer_scores(self, session_id: str) -> dict[str, AnswerScore]:
+        """Return every stored answer score for a session, keyed by question_id, in answer order."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT s.question_id, s.data FROM answer_scores s
+                LEFT JOIN interview_answers a
+                    ON a.session_id = s.session_id AND a.question_id = s.question_id
+                WHERE s.session_id = $1
+                ORDER BY a.position
+                """,
+                session_id,
             )
+        return {row["question_id"]: AnswerScore.model_validate(row["data"]) for row in rows}
 
     # ── Results ───────────────────────────────────────────────────────────────
 
@@ -87,18 +503,20 @@ class SessionStore:
     ) -> None:
         pool = await get_pool()
         async with pool.acquire() as conn:
-            await conn.execute(
-                """
-                INSERT INTO interview_results (session_id, data, user_id, mode, difficulty)
-                VALUES ($1, $2, $3, $4, $5)
-                ON CONFLICT (session_id) DO UPDATE SET data = EXCLUDED.data
-                """,
-                session_id,
-                results.model_dump(mode="json"),
-                user_id,
-                mode,
-                difficulty,
-            )
+            async with conn.transaction():
+                await conn.execute(
+                    """
+                    INSERT INTO interview_results (session_id, data, user_id, mode, difficulty)
+                    VALUES ($1, $2, $3, $4, $5)
+                    ON CONFLICT (session_id) DO UPDATE SET data = EXCLUDED.data
+                    """,
+                    session_id,
+                    results.model_dump(mode="json"),
+                    user_id,
+                    mode,
+                    difficulty,
+                )
+                await notify(conn, session_id, "results")
 
     async def get_results(self, session_id: str) -> Optional[InterviewResults]:
         pool = await get_pool()
@@ -0,0 +1,158 @@
+import re
+from typing import NamedTuple, Optional
+
+from app.config import get_settings
+from app.models.interview import Answer, Question
+from app.models.results import AnswerScore, ProvisionalAnswerScore, ProvisionalResults
+from app.services.scoring import summarize_scores
+from app.services.session_store import AnsweredQuestions
+
+# Words in any script. Chinese and Japanese are written without spaces, so
+# each of their characters counts as a word rather than a whole clause
+_CJK = "\u3040-\u30ff\u3400-\u4dbf\u4e00-\u9fff\uf900-\ufaff"
+_WORD = re.compile(rf"[{_CJK}]|(?:[^\W{_CJK}]|')+")
+_FILLERS = re.compile(
+    r"\b(?:um+|uh+|er+|ah+|hmm+|like|basically|actually|literally|you know|sort of|kind of|i mean)\b"
+)
+
+# Phrases that mark each part of a Situation-Task-Action-Result answer
+_STAR_MARKERS = [
+    re.compile(p)
+    for p in (
+        r"\b(?:situation|context|background|at the time|when i was|we had|our team|the project)\b",
+        r"\b(?:my role|responsible|task|goal|objective|needed to|had to|asked to|challenge)\b",
+        r"\b(?:i decided|i built|i led|i implemented|i created|i started|i worked|i proposed|approach|so i)\b",
+        r"\b(?:result|outcome|in the end|as a result|improved|reduced|increased|saved|learned|percent)\b|\d+ ?%",
+    )
+]
+
+_STOPWORDS = frozenset(
+    "a about an and are as at be by can did do does for from had has have how i if in is it me of on or "
+    "that the this to was we were what when where which who why will with would you your".split()
+)
+
+# Spoken answers in this range read as neither rushed nor halting
+_PACE_RANGE_WPM = (110.0, 170.0)
+# Answers of this many words or more earn the full length component
+_FULL_LENGTH_WORDS = 150
+
+
+class TranscriptFeatures(NamedTuple):
+    word_count: int
+    words_per_minute: Optional[float]  # None when the answer's duration wasn't recorded
+    filler_ratio: float  # filler words per word
+    structure_coverage: float  # share of the four STAR parts the answer touches
+    hint_overlap: Optional[float]  # share of the follow-up hint's content words used; None without a hint
+
+
+def extract_features(pairs: list[tuple[Question, Answer]]) -> list[TranscriptFeatures]:
+    """Cheap signals from each answer's transcript and duration, in the order given.
+
+    Runs in-process without the provider, in microseconds per answer, so it
+    can be recomputed on every request. Answers to the same question share
+    one tokenised hint.
+    """
+    hints: dict[str, frozenset[str]] = {}
+    features = []
+    for question, answer in pairs:
+        text = answer.transcript.lower()
+        words = _WORD.findall(text)
+        word_count = len(words)
+        minutes = answer.duration_seconds / 60
+        if question.follow_up_hint and question.question_id not in hints:
+            hints[question.question_id] = frozenset(_WORD.findall(question.follow_up_hint.lower())) - _STOPWORDS
+        hint = hints.get(question.question_id)
+        features.append(
+            TranscriptFeatures(
+                word_count=word_count,
+                words_per_minute=word_count / minutes if minutes > 0 and word_count else None,
+                filler_ratio=len(_FILLERS.findall(text)) / word_count if word_count else 0.0,
+                structure_coverage=sum(1 for m in _STAR_MARKERS if m.search(text)) / len(_STAR_MARKERS),
+                hint_overlap=len(hint.intersection(words)) / len(hint) if hint else None,
+            )
+        )
+    return features
+
+
+def provisional_score(features: TranscriptFeatures) -> int:
+    """A 0-100 estimate of an answer's score from its features alone.
+
+    Length, structure and coverage of the follow-up hint make up most of it,
+    with pace and filler words as smaller adjustments. It tracks the
+    provider's scores only roughly and is shown until they arrive.
+    """
+    if is_short_answer(features):
+        return _short_answer_points(features.word_count)
+    score = 15.0
+    score += 35 * min(features.word_count / _FULL_LENGTH_WORDS, 1.0)
+    score += 20 * features.structure_coverage
+    # Without a hint, structure stands in for coverage
+    score += 20 * (features.hint_overlap if features.hint_overlap is not None else features.structure_coverage)
+    low, high = _PACE_RANGE_WPM
+    wpm = features.words_per_minute
+    if wpm is None or low <= wpm <= high:
+        score += 10
+    else:
+        score += 10 * max(0.0, 1 - abs(wpm - (low if wpm < low else high)) / low)
+    score -= min(features.filler_ratio * 150, 15)
+    return max(0, min(100, round(score)))
+
+
+def is_short_answer(features: TranscriptFeatures) -> bool:
+    return features.word_count < get_settings().evaluation_short_answer_words
+
+
+def _short_answer_points(word_count: int) -> int:
+    return min(2 * word_count, 10)
+
+
+def short_answer_score(question: Question, answer: Answer, features: TranscriptFeatures) -> Optional[AnswerScore]:
+    """The final score for an empty or trivially short answer, or None if it needs the provider.
+
+    Answers under EVALUATION_SHORT_ANSWER_WORDS words can only score near
+    zero, so they are scored here rather than with a provider round trip.
+    """
+    if not is_short_answer(features):
+        return None
+    if features.word_count == 0:
+        feedback = "No answer was recorded for this question."
+    else:
+        feedback = "The answer was too short to assess."
+    return AnswerScore(
+        question_id=question.question_id,
+        question_text=question.text,
+        transcript=answer.transcript,
+        score=_short_answer_points(features.word_count),
+        feedback=feedback,
+        improvements=[
+            "Give a complete answer: describe the context, what you did and the outcome.",
+        ],
+        category=question.category,
+    )
+
+
+def provisional_results(
+    session_id: str, answered: AnsweredQuestions, stored: dict[str, AnswerScore]
+) -> ProvisionalResults:
+    """Scores for every answer so far: the provider's where it has scored one, else a provisional one."""
+    answers = []
+    for (question, answer), features in zip(answered.pairs, extract_features(answered.pairs)):
+        final = stored.get(answer.question_id)
+        answers.append(
+            ProvisionalAnswerScore(
+                question_id=question.question_id,
+                question_text=question.text,
+                category=question.category,
+                score=final.score if final is not None else provisional_score(features),
+                final=final is not None,
+                **features._asdict(),
+            )
+        )
+    scores = summarize_scores(answers, answered.difficulty)
+    return ProvisionalResults(
+        session_id=session_id,
+        status=answered.status,
+        overall_score=scores.overall_score,
+        grade=scores.grade,
+        answers=answers,
+    )
@@ -4,7 +4,7 @@ from typing import Optional
 
 import bcrypt
 
-from app.models.user import User
+from app.models.user import User, SessionSummary
 from app.models.results import InterviewResults
 from app.db.connection import get_pool
 
@@ -157,6 +157,77 @@ class UserStore:
             for row in rows
         ]
 
+    async def get_dashboard(
+        self, user_id: str
+    ) -> Optional[tuple[list[SessionSummary], Optional[str], Optional[str]]]:
+        """Everything /me/overview shows, in a single indexed read.
+
+        Returns (sessions oldest first, stored recommendation, session_id the
+        recommendation was generated from), or None if the user doesn't exist.
+        Only the summary fields are pulled out of each result document.
+        """
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            rows = await conn.fetch(
+                """
+                SELECT c.ai_recommendation, c.latest_session_id AS recommendation_session_id,
+                       r.session_id, r.mode, r.difficulty,
+                       (r.data->>'overall_score')::int AS overall_score,
+                       r.data->>'grade' AS grade,
+                       r.data->'top_strengths' AS top_strengths,
+                       r.data->'top_improvements' AS top_improvements,
+                       jsonb_array_length(r.data->'answer_reviews') AS total_questions
+                FROM users u
+                LEFT JOIN user_recommendations c ON c.user_id = u.user_id
+                LEFT JOIN interview_results r ON r.user_id = u.user_id
+                WHERE u.user_id = $1
+                ORDER BY r.created_at ASC
+                """,
+                user_id,
+            )
+        if not rows:
+            return None
+        sessions = [
+            SessionSummary(
+                session_id=row["session_id"],
+                mode=row["mode"] or "",
+                difficulty=row["difficulty"] or "",
+                overall_score=row["overall_score"],
+                grade=row["grade"],
+                total_questions=row["total_questions"],
+                date="",
+                top_strengths=row["top_strengths"],
+                top_improvements=row["top_improvements"],
+            )
+            for row in rows
+            if row["session_id"] is not None
+        ]
+        return sessions, rows[0]["ai_recommendation"], rows[0]["recommendation_session_id"]
+
+    async def store_recommendation(
+        self, user_id: str, latest_session_id: str, results_count: int, ai_recommendation: str
+    ) -> None:
+        """Upsert the coaching text, never replacing it with one built from fewer results."""
+        pool = await get_pool()
+        async with pool.acquire() as conn:
+            await conn.execute(
+                """
+                INSERT INTO user_recommendations
+                    (user_id, latest_session_id, results_count, ai_recommendation)
+                VALUES ($1, $2, $3, $4)
+                ON CONFLICT (user_id) DO UPDATE
+                SET latest_session_id = EXCLUDED.latest_session_id,
+                    results_count = EXCLUDED.results_count,
+                    ai_recommendation = EXCLUDED.ai_recommendation,
+                    updated_at = NOW()
+                WHERE user_recommendations.results_count <= EXCLUDED.results_count
+                """,
+                user_id,
+                latest_session_id,
+                results_count,
+                ai_recommendation,
+            )
+
 
 _store = UserStore()
 
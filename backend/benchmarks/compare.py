@@ -0,0 +1,80 @@
+"""Compare two load-test reports and flag latency/throughput regressions.
+
+    python -m benchmarks.compare baseline.json candidate.json --threshold 0.10
+
+Exits non-zero if any endpoint's p95 or p99 got slower, or throughput got
+lower, by more than the threshold (a fraction, default 10%).
+"""
+import argparse
+import json
+import sys
+from pathlib import Path
+
+_LATENCY_KEYS = ("p50", "p95", "p99")
+_GATED_KEYS = ("p95", "p99")
+
+
+def _change(old: float, new: float) -> float:
+    return (new - old) / old if old else 0.0
+
+
+def compare(baseline: dict, candidate: dict, threshold: float) -> tuple[list[str], list[str]]:
+    """Return (report lines, regression lines)."""
+    lines: list[str] = []
+    regressions: list[str] = []
+
+    old_rps = baseline["throughput"]["requests_per_second"]
+    new_rps = candidate["throughput"]["requests_per_second"]
+    change = _change(old_rps, new_rps)
+    lines.append(f"{'throughput (req/s)':<40} {old_rps:10.1f} → {new_rps:10.1f}  {change:+7.1%}")
+    if change < -threshold:
+        regressions.append(f"throughput dropped {change:+.1%}")
+
+    sections = [("endpoints", name) for name in candidate["endpoints"]]
+    sections += [(key, None) for key in ("db_pool_wait", "event_loop_lag")]
+    for section, name in sections:
+        old = baseline.get(section) or {}
+        new = candidate.get(section) or {}
+        if name is not None:
+            old, new = old.get(name), new.get(name)
+        label = name or section
+        if not old or not new:
+            lines.append(f"{label:<40} (missing from one report)")
+            continue
+        for key in _LATENCY_KEYS:
+            change = _change(old[key], new[key])
+            flag = ""
+            if key in _GATED_KEYS and change > threshold:
+                flag = "  REGRESSION"
+                regressions.append(f"{label} {key} {change:+.1%}")
+            lines.append(
+                f"{label + ' ' + key:<40} {old[key] * 1000:8.1f}ms → {new[key] * 1000:8.1f}ms  {change:+7.1%}{flag}"
+            )
+    return lines, regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Diff two benchmark reports")
+    parser.add_argument("baseline")
+    parser.add_argument("candidate")
+    parser.add_argument("--threshold", type=float, default=0.10, help="Allowed slowdown as a fraction")
+    args = parser.parse_args()
+
+    baseline = json.loads(Path(args.baseline).read_text())
+    candidate = json.loads(Path(args.candidate).read_text())
+    print(f"baseline:  {baseline['meta'].get('commit')}")
+    print(f"candidate: {candidate['meta'].get('commit')}")
+
+    lines, regressions = compare(baseline, candidate, args.threshold)
+    print("\n".join(lines))
+    if regressions:
+        print(f"\n{len(regressions)} regression(s) above {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  - {regression}")
+        return 1
+    print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
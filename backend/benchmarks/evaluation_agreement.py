@@ -0,0 +1,112 @@
+"""Compare batched and per-answer evaluation on real sessions.
+
+Re-scores the answers of recent sessions both ways with the configured
+provider (nothing is written back) and reports input/output tokens, wall
+time, how many batch entries needed a per-answer fallback, and how closely
+the two sets of scores agree.
+
+    python -m benchmarks.evaluation_agreement --sessions 20 --output agreement.json
+"""
+import argparse
+import asyncio
+import json
+import time
+from pathlib import Path
+
+from app.ai.factory import get_ai_provider
+from app.db.connection import init_pool, close_pool, get_pool
+from app.services.metrics import get_metrics
+from app.services.session_store import get_session_store
+
+
+def _tokens(call: str) -> dict[str, float]:
+    counters = get_metrics().snapshot()["counters"]
+    return {
+        "calls": counters.get(f"ai.{call}.calls", 0),
+        "input_tokens": counters.get(f"ai.{call}.input_tokens", 0),
+        "output_tokens": counters.get(f"ai.{call}.output_tokens", 0),
+        "cached_input_tokens": counters.get(f"ai.{call}.cached_input_tokens", 0),
+    }
+
+
+async def _recent_session_ids(limit: int) -> list[str]:
+    pool = await get_pool()
+    async with pool.acquire() as conn:
+        rows = await conn.fetch(
+            """
+            SELECT s.session_id FROM interview_sessions s
+            WHERE EXISTS (SELECT 1 FROM interview_answers a WHERE a.session_id = s.session_id)
+            ORDER BY s.expires_at DESC
+            LIMIT $1
+            """,
+            limit,
+        )
+    return [row["session_id"] for row in rows]
+
+
+async def main(args: argparse.Namespace) -> dict:
+    await init_pool()
+    try:
+        provider = get_ai_provider()
+        store = get_session_store()
+        per_answer_seconds = batch_seconds = 0.0
+        diffs: list[int] = []
+        answers_total = fallbacks = 0
+
+        for session_id in await _recent_session_ids(args.sessions):
+            session = await store.get_session(session_id)
+            profile = await store.get_profile(session.cv_profile_hash) if session else None
+            if session is None or profile is None:
+                continue
+            questions = {q.question_id: q for q in session.questions}
+            pairs = [(questions[a.question_id], a) for a in session.answers if a.question_id in questions]
+            if not pairs:
+                continue
+
+            start = time.perf_counter()
+            single = await asyncio.gather(
+                *(provider.evaluate_answer(q, a, session.mode, profile, session.difficulty) for q, a in pairs)
+            )
+            per_answer_seconds += time.perf_counter() - start
+
+            start = time.perf_counter()
+            batch = await provider.evaluate_answers(pairs, session.mode, profile, session.difficulty)
+            batch_seconds += time.perf_counter() - start
+
+            answers_total += len(pairs)
+            fallbacks += len(pairs) - len(batch)
+            for score in single:
+                if score.question_id in batch:
+                    diffs.append(abs(score.score - batch[score.question_id].score))
+
+        compared = len(diffs)
+        return {
+            "model": provider.model_id,
+            "answers": answers_total,
+            "per_answer": {"seconds": per_answer_seconds, **_tokens("evaluate_answer")},
+            "batch": {
+                "seconds": batch_seconds,
+                "fallbacks": fallbacks,
+                **_tokens("evaluate_answers"),
+            },
+            "agreement": {
+                "compared": compared,
+                "mean_abs_diff": sum(diffs) / compared if compared else None,
+                "within_5": sum(d <= 5 for d in diffs) / compared if compared else None,
+                "within_10": sum(d <= 10 for d in diffs) / compared if compared else None,
+            },
+        }
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Batched vs per-answer evaluation comparison")
+    parser.add_argument("--sessions", type=int, default=20, help="Most recent sessions to re-score")
+    parser.add_argument("--output", default=None, help="Also write the JSON report here")
+    args = parser.parse_args()
+    report = asyncio.run(main(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
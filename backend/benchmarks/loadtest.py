@@ -0,0 +1,368 @@
+"""End-to-end load test of the interview lifecycle.
+
+Each simulated candidate registers, then runs the full flow:
+
+    /api/cv/upload → /api/interview/start → N × /respond (→ /next while pending) → /end
+    → poll /{session_id}/results (or its SSE stream) → /api/users/me/overview
+
+By default this starts its own instrumented API server (benchmarks.server)
+and evaluation workers with AI_PROVIDER=mock, against the Postgres at
+DATABASE_URL (e.g. `make db-up`). Pass --base-url to target a running
+deployment instead; server-side probes are then limited to /metrics.
+
+    python -m benchmarks.loadtest --candidates 1000 --concurrency 200 --output bench.json
+
+The JSON report (per-endpoint p50/p95/p99, throughput, DB pool wait and
+event-loop lag) can be diffed between commits with benchmarks.compare.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from app.services.metrics import _percentile
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent
+
+_SKILL_POOL = ["Python", "SQL", "React", "TypeScript", "AWS", "Docker", "Kubernetes", "Go", "Java", "Postgres"]
+_ANSWER_SENTENCES = [
+    "In that situation our team was behind on a critical migration.",
+    "My task was to coordinate the rollout across three services.",
+    "I broke the work into milestones and paired with the on-call engineer.",
+    "As a result we cut deployment time by forty percent.",
+    "Looking back, I would have involved the stakeholders earlier.",
+    "The main trade-off was consistency versus latency.",
+]
+
+
+class CandidateFailed(Exception):
+    pass
+
+
+@dataclass
+class Recorder:
+    latencies: dict[str, list[float]] = field(default_factory=lambda: defaultdict(list))
+    errors: dict[str, int] = field(default_factory=lambda: defaultdict(int))
+    candidates_completed: int = 0
+    candidates_failed: int = 0
+    requests: int = 0
+
+    def summary(self) -> dict:
+        endpoints = {}
+        for name in sorted(set(self.latencies) | set(self.errors)):
+            ordered = sorted(self.latencies.get(name, []))
+            endpoints[name] = {
+                "count": len(ordered),
+                "errors": self.errors.get(name, 0),
+                "mean": sum(ordered) / len(ordered) if ordered else 0.0,
+                "p50": _percentile(ordered, 50),
+                "p95": _percentile(ordered, 95),
+                "p99": _percentile(ordered, 99),
+                "max": ordered[-1] if ordered else 0.0,
+            }
+        return endpoints
+
+
+async def _call(
+    client: httpx.AsyncClient,
+    rec: Recorder,
+    name: str,
+    method: str,
+    url: str,
+    expect: tuple[int, ...] = (200,),
+    **kwargs,
+) -> httpx.Response:
+    start = time.perf_counter()
+    try:
+        response = await client.request(method, url, **kwargs)
+    except httpx.HTTPError as exc:
+        rec.errors[name] += 1
+        raise CandidateFailed(f"{name}: {exc!r}")
+    finally:
+        rec.requests += 1
+    rec.latencies[name].append(time.perf_counter() - start)
+    if response.status_code not in expect:
+        rec.errors[name] += 1
+        raise CandidateFailed(f"{name}: HTTP {response.status_code} {response.text[:200]}")
+    return response
+
+
+def _make_cv(index: int, distinct_cvs: int) -> bytes:
+    # A bounded set of distinct CVs so repeat uploads exercise the upload cache
+    rng = random.Random(index % distinct_cvs)
+    skills = rng.sample(_SKILL_POOL, 4)
+    return (
+        f"Candidate {index % distinct_cvs}\n"
+        f"Senior engineer with {rng.randint(2, 15)} years of experience.\n"
+        f"Skills: {', '.join(skills)}\n"
+        "Led platform migrations, mentored engineers, and owned on-call for payments.\n"
+    ).encode()
+
+
+async def run_candidate(
+    client: httpx.AsyncClient, rec: Recorder, index: int, run_id: str, args: argparse.Namespace
+) -> None:
+    rng = random.Random(f"{args.seed}:{index}")
+
+    response = await _call(
+        client, rec, "POST /api/auth/register", "POST", "/api/auth/register",
+        json={"email": f"bench-{run_id}-{index}@example.com", "password": "bench-password"},
+    )
+    headers = {"Authorization": f"Bearer {response.json()['access_token']}"}
+
+    response = await _call(
+        client, rec, "POST /api/cv/upload", "POST", "/api/cv/upload",
+        files={"file": (f"cv-{index}.txt", _make_cv(index, args.distinct_cvs), "text/plain")},
+    )
+    token = response.json()["cv_session_token"]
+
+    response = await _call(
+        client, rec, "POST /api/interview/start", "POST", "/api/interview/start", headers=headers,
+        json={
+            "cv_session_token": token,
+            "mode": rng.choice(["behavioral", "technical", "mixed"]),
+            "difficulty": rng.choice(["easy", "medium", "hard"]),
+            "question_count": args.questions,
+        },
+    )
+    body = response.json()
+    session_id, question = body["session_id"], body["question"]
+
+    while question is not None:
+        await asyncio.sleep(args.think_seconds)
+        transcript = " ".join(rng.choices(_ANSWER_SENTENCES, k=rng.randint(1, 6)))
+        response = await _call(
+            client, rec, "POST /api/interview/respond", "POST", "/api/interview/respond",
+            json={
+                "session_id": session_id,
+                "question_id": question["question_id"],
+                "transcript": transcript,
+                "duration_seconds": rng.uniform(20, 120),
+            },
+        )
+        body = response.json()
+        if body.get("pending"):
+            # The next question is still being generated; the answer is recorded, so wait on /next
+            pending_since = time.perf_counter()
+            while body.get("pending"):
+                if time.perf_counter() - pending_since > args.results_timeout:
+                    rec.errors["next question after pending"] += 1
+                    raise CandidateFailed("next question: still pending")
+                response = await _call(
+                    client, rec, "GET /api/interview/{id}/next", "GET", f"/api/interview/{session_id}/next",
+                )
+                body = response.json()
+            rec.latencies["next question after pending"].append(time.perf_counter() - pending_since)
+        question = body.get("next_question")
+
+    await _call(
+        client, rec, "POST /api/interview/end", "POST", "/api/interview/end",
+        json={"session_id": session_id},
+    )
+
+    ended = time.perf_counter()
+    if args.results_mode == "stream":
+        await _stream_results(client, rec, session_id, args)
+        rec.latencies["results ready after /end"].append(time.perf_counter() - ended)
+        await _call(client, rec, "GET /api/users/me/overview", "GET", "/api/users/me/overview", headers=headers)
+        return
+
+    deadline = ended + args.results_timeout
+    while True:
+        response = await _call(
+            client, rec, "GET /api/interview/{id}/results", "GET",
+            f"/api/interview/{session_id}/results", expect=(200, 202),
+        )
+        if response.status_code == 200:
+            rec.latencies["results ready after /end"].append(time.perf_counter() - ended)
+            break
+        if time.perf_counter() > deadline:
+            rec.errors["results ready after /end"] += 1
+            raise CandidateFailed("results: timed out")
+        await asyncio.sleep(args.poll_interval)
+
+    await _call(client, rec, "GET /api/users/me/overview", "GET", "/api/users/me/overview", headers=headers)
+
+
+async def _stream_results(
+    client: httpx.AsyncClient, rec: Recorder, session_id: str, args: argparse.Namespace
+) -> None:
+    name = "GET /api/interview/{id}/results/stream"
+    start = time.perf_counter()
+    event = None
+    try:
+        async with client.stream(
+            "GET", f"/api/interview/{session_id}/results/stream", timeout=args.results_timeout
+        ) as response:
+            async for line in response.aiter_lines():
+                if line.startswith("event: "):
+                    event = line[len("event: "):]
+                    break
+    except httpx.HTTPError as exc:
+        rec.errors[name] += 1
+        raise CandidateFailed(f"{name}: {exc!r}")
+    finally:
+        rec.requests += 1
+    rec.latencies[name].append(time.perf_counter() - start)
+    if event != "results":
+        rec.errors[name] += 1
+        raise CandidateFailed(f"{name}: got {event!r}")
+
+
+async def _wait_healthy(base_url: str, timeout: float = 60.0) -> None:
+    deadline = time.monotonic() + timeout
+    async with httpx.AsyncClient(base_url=base_url) as client:
+        while time.monotonic() < deadline:
+            try:
+                if (await client.get("/health")).status_code == 200:
+                    return
+            except httpx.HTTPError:
+                pass
+            await asyncio.sleep(0.5)
+    raise RuntimeError(f"Server at {base_url} did not become healthy")
+
+
+def _start_stack(args: argparse.Namespace) -> list[subprocess.Popen]:
+    env = {
+        **os.environ,
+        "AI_PROVIDER": "mock",
+        "APP_ENV": "development",
+        "MOCK_SEED": str(args.seed),
+        "MOCK_LATENCY_SCALE": str(args.mock_latency_scale),
+    }
+    procs = [
+        subprocess.Popen(
+            [sys.executable, "-m", "benchmarks.server", "--port", str(args.port)],
+            cwd=BACKEND_DIR,
+            env=env,
+        )
+    ]
+    for _ in range(args.workers):
+        procs.append(subprocess.Popen([sys.executable, "worker.py"], cwd=BACKEND_DIR, env=env))
+    return procs
+
+
+def _git_commit() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "HEAD"], cwd=BACKEND_DIR, text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+async def main(args: argparse.Namespace) -> dict:
+    procs: list[subprocess.Popen] = []
+    base_url = args.base_url
+    if base_url is None:
+        base_url = f"http://127.0.0.1:{args.port}"
+        procs = _start_stack(args)
+    try:
+        await _wait_healthy(base_url)
+        rec = Recorder()
+        run_id = uuid.uuid4().hex[:8]
+        semaphore = asyncio.Semaphore(args.concurrency)
+        limits = httpx.Limits(max_connections=args.concurrency, max_keepalive_connections=args.concurrency)
+
+        async with httpx.AsyncClient(base_url=base_url, limits=limits, timeout=args.request_timeout) as client:
+
+            async def one(index: int) -> None:
+                async with semaphore:
+                    if args.ramp_seconds:
+                        await asyncio.sleep(random.Random(index).uniform(0, args.ramp_seconds))
+                    try:
+                        await run_candidate(client, rec, index, run_id, args)
+                        rec.candidates_completed += 1
+                    except CandidateFailed:
+                        rec.candidates_failed += 1
+
+            started = time.perf_counter()
+            await asyncio.gather(*(one(i) for i in range(args.candidates)))
+            elapsed = time.perf_counter() - started
+
+            stats_path = "/metrics" if args.base_url else "/__bench__/stats"
+            server = (await client.get(stats_path)).json()
+
+        timings = server.get("timings", {})
+        return {
+            "meta": {
+                "commit": _git_commit(),
+                "timestamp": datetime.now(timezone.utc).isoformat(),
+                "base_url": base_url,
+                "config": {
+                    k: v for k, v in vars(args).items() if k not in ("output", "base_url")
+                },
+            },
+            "throughput": {
+                "elapsed_seconds": elapsed,
+                "candidates_completed": rec.candidates_completed,
+                "candidates_failed": rec.candidates_failed,
+                "candidates_per_second": rec.candidates_completed / elapsed if elapsed else 0.0,
+                "requests": rec.requests,
+                "requests_per_second": rec.requests / elapsed if elapsed else 0.0,
+            },
+            "endpoints": rec.summary(),
+            "db_pool_wait": timings.get("bench.db_pool_wait_seconds"),
+            "event_loop_lag": timings.get("bench.event_loop_lag_seconds"),
+            "server_metrics": server,
+        }
+    finally:
+        for proc in procs:
+            proc.terminate()
+        for proc in procs:
+            proc.wait(timeout=30)
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Interview AI end-to-end load test")
+    parser.add_argument("--candidates", type=int, default=200, help="Total simulated candidates")
+    parser.add_argument("--concurrency", type=int, default=50, help="Candidates in flight at once")
+    parser.add_argument("--questions", type=int, default=5, help="question_count per interview")
+    parser.add_argument("--distinct-cvs", type=int, default=50, help="Distinct CV files to rotate through")
+    parser.add_argument("--think-seconds", type=float, default=0.0, help="Pause before each answer")
+    parser.add_argument("--ramp-seconds", type=float, default=0.0, help="Spread candidate starts over this window")
+    parser.add_argument(
+        "--results-mode", choices=["poll", "stream"], default="poll", help="Wait for results by polling or SSE"
+    )
+    parser.add_argument("--poll-interval", type=float, default=2.0, help="Results polling interval")
+    parser.add_argument("--results-timeout", type=float, default=300.0)
+    parser.add_argument("--request-timeout", type=float, default=120.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--base-url", default=None, help="Target a running server instead of starting one")
+    parser.add_argument("--port", type=int, default=8100, help="Port for the self-started server")
+    parser.add_argument("--workers", type=int, default=2, help="Evaluation worker processes to start")
+    parser.add_argument(
+        "--mock-latency-scale", type=float, default=1.0, help="MOCK_LATENCY_SCALE for the self-started stack"
+    )
+    parser.add_argument("--output", default="bench_results.json", help="Where to write the JSON report")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = _parse_args()
+    report = asyncio.run(main(args))
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    throughput = report["throughput"]
+    print(
+        f"{throughput['candidates_completed']} candidates completed "
+        f"({throughput['candidates_failed']} failed) in {throughput['elapsed_seconds']:.1f}s — "
+        f"{throughput['requests_per_second']:.1f} req/s"
+    )
+    for name, stats in report["endpoints"].items():
+        print(
+            f"  {name:<40} n={stats['count']:<6} err={stats['errors']:<4} "
+            f"p50={stats['p50'] * 1000:8.1f}ms p95={stats['p95'] * 1000:8.1f}ms p99={stats['p99'] * 1000:8.1f}ms"
+        )
+    print(f"Report written to {args.output}")
@@ -0,0 +1,76 @@
+"""Instrumented API server for load tests.
+
+Runs the normal FastAPI app under uvicorn with two extra probes that only the
+benchmark needs, exposed at GET /__bench__/stats:
+
+- DB pool wait: time spent in asyncpg's Pool._acquire before a connection is handed out
+- Event-loop lag: how late a 10 ms periodic timer fires
+
+Usage (normally started by benchmarks.loadtest):
+
+    python -m benchmarks.server --port 8100
+"""
+import argparse
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import asyncpg.pool
+import uvicorn
+
+from app.services.metrics import get_metrics
+
+_LAG_INTERVAL_SECONDS = 0.01
+
+
+def _instrument_pool() -> None:
+    original = asyncpg.pool.Pool._acquire
+
+    async def timed_acquire(self, timeout):
+        start = time.perf_counter()
+        try:
+            return await original(self, timeout)
+        finally:
+            get_metrics().observe("bench.db_pool_wait_seconds", time.perf_counter() - start)
+
+    asyncpg.pool.Pool._acquire = timed_acquire
+
+
+async def _sample_loop_lag() -> None:
+    metrics = get_metrics()
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(_LAG_INTERVAL_SECONDS)
+        metrics.observe("bench.event_loop_lag_seconds", time.perf_counter() - start - _LAG_INTERVAL_SECONDS)
+
+
+def build_app():
+    _instrument_pool()
+    from main import app
+
+    inner_lifespan = app.router.lifespan_context
+
+    @asynccontextmanager
+    async def lifespan_with_probes(app_):
+        lag_probe = asyncio.create_task(_sample_loop_lag())
+        try:
+            async with inner_lifespan(app_):
+                yield
+        finally:
+            lag_probe.cancel()
+
+    app.router.lifespan_context = lifespan_with_probes
+
+    @app.get("/__bench__/stats", include_in_schema=False)
+    async def bench_stats():
+        return get_metrics().snapshot()
+
+    return app
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Instrumented Interview AI server for benchmarks")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8100)
+    args = parser.parse_args()
+    uvicorn.run(build_app(), host=args.host, port=args.port, log_level="warning")
@@ -4,10 +4,15 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
 from app.config import get_settings
+from app.ai.factory import get_ai_provider
+from app.ai.usage import usage_summary
 from app.routers import cv, interview
 from app.routers import auth, users
 from app.db.connection import init_pool, close_pool
 from app.db.schema import init_db
+from app.services.metrics import get_metrics
+from app.services.parse_pool import init_parse_pool, close_parse_pool
+from app.services.results_notifier import init_results_notifier, close_results_notifier
 
 settings = get_settings()
 
@@ -16,7 +21,11 @@ settings = get_settings()
 async def lifespan(app: FastAPI):
     await init_pool()
     await init_db()
+    init_parse_pool()
+    await init_results_notifier()
     yield
+    await close_results_notifier()
+    close_parse_pool()
     await close_pool()
 
 
@@ -46,5 +55,12 @@ async def health_check():
     return {
         "status": "ok",
         "ai_provider": settings.ai_provider,
-        "model": settings.claude_model if settings.ai_provider == "claude" else settings.openai_model,
+        "model": get_ai_provider().model_id,
     }
+
+
+@app.get("/metrics")
+async def metrics():
+    """In-process counters, gauges and latency percentiles for this API worker,
+    plus per-call-type token and prompt-cache usage."""
+    return {**get_metrics().snapshot(), "ai_usage": usage_summary()}
@@ -0,0 +1,72 @@
+"""Bulk re-scoring of stored interviews through a vendor batch API.
+
+Re-evaluates every interview in interview_results with the current model and
+prompts and stores the new reports under a version label in
+interview_results_versions, next to the originals. The run is checkpointed:
+interrupt it at any time and start it again with the same --version to
+continue.
+
+    python rescore.py --version claude-sonnet-4-6-rubric-2
+    python rescore.py --version offline-check --backend local --limit 200
+"""
+import argparse
+import asyncio
+import json
+import logging
+from pathlib import Path
+
+from app.ai.batch import create_batch_backend
+from app.config import get_settings
+from app.db.connection import init_pool, close_pool
+from app.db.schema import init_db
+from app.services.rescoring import RescoreJob
+
+# Batch endpoint used for each AI_PROVIDER when --backend is not given
+_DEFAULT_BACKENDS = {"claude": "anthropic", "openai": "openai", "mock": "local"}
+
+
+async def main(args: argparse.Namespace) -> dict:
+    backend = create_batch_backend(args.backend)
+    await init_pool()
+    await init_db()
+    try:
+        job = RescoreJob(
+            backend,
+            version=args.version,
+            batch_size=args.batch_size,
+            max_in_flight=args.max_in_flight,
+            poll_interval=1.0 if args.backend == "local" else args.poll_interval,
+            limit=args.limit,
+            from_start=args.from_start,
+        )
+        return await job.run()
+    finally:
+        await close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Re-score stored interviews with batch APIs")
+    parser.add_argument("--version", required=True, help="Label the new results are stored under")
+    parser.add_argument(
+        "--backend",
+        choices=["anthropic", "openai", "local"],
+        default=_DEFAULT_BACKENDS.get(get_settings().ai_provider.lower(), "local"),
+        help="Batch endpoint (default follows AI_PROVIDER; 'local' runs offline)",
+    )
+    parser.add_argument("--batch-size", type=int, default=500, help="Sessions per submitted batch")
+    parser.add_argument("--max-in-flight", type=int, default=4, help="Batches open at the vendor at once")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="Seconds between batch status checks")
+    parser.add_argument("--limit", type=int, default=None, help="Re-score at most this many more sessions")
+    parser.add_argument(
+        "--from-start",
+        action="store_true",
+        help="Ignore the checkpoint and revisit every session not yet stored under this version",
+    )
+    parser.add_argument("--output", default=None, help="Also write the JSON report here")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    report = asyncio.run(main(args))
+    text = json.dumps(report, indent=2)
+    print(text)
+    if args.output:
+        Path(args.output).write_text(text)
@@ -0,0 +1,69 @@
+"""Standalone evaluation worker.
+
+Runs queued evaluation jobs (and the other background jobs: coaching refreshes,
+asynchronous CV extraction) outside the web process so they never compete with
+request handling. Start as many of these as evaluation load requires:
+
+    python worker.py --concurrency 8
+"""
+import argparse
+import asyncio
+import json
+import logging
+import signal
+
+from app.ai.scheduler import ProcessRole, set_process_role
+from app.config import get_settings
+from app.db.connection import init_pool, close_pool
+from app.db.schema import init_db
+from app.services.evaluation_worker import EvaluationWorker
+from app.services.metrics import get_metrics
+
+logger = logging.getLogger("worker")
+
+
+async def _log_metrics(stop: asyncio.Event, interval: float) -> None:
+    """Log this process's metrics (scheduler queues, job counts, ...) every `interval` seconds.
+
+    Workers serve no HTTP, so this is their counterpart of the API's /metrics.
+    """
+    while not stop.is_set():
+        try:
+            await asyncio.wait_for(stop.wait(), timeout=interval)
+        except asyncio.TimeoutError:
+            pass
+        logger.info("metrics %s", json.dumps(get_metrics().snapshot(), sort_keys=True))
+
+
+async def main(concurrency: int) -> None:
+    # Before the provider is created, so it takes the workers' share of the rate limits
+    set_process_role(ProcessRole.WORKER)
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        loop.add_signal_handler(sig, stop.set)
+
+    await init_pool()
+    await init_db()
+    interval = get_settings().evaluation_worker_metrics_log_interval_seconds
+    metrics_task = asyncio.create_task(_log_metrics(stop, interval)) if interval > 0 else None
+    try:
+        await EvaluationWorker(concurrency=concurrency).run(stop)
+    finally:
+        stop.set()
+        if metrics_task is not None:
+            await metrics_task
+        await close_pool()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Interview AI evaluation worker")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        default=get_settings().evaluation_worker_concurrency,
+        help="Maximum number of jobs to run at once",
+    )
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+    asyncio.run(main(args.concurrency))
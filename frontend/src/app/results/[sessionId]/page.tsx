@@ -4,7 +4,7 @@ import { useEffect, useState } from "react";
 import { useParams, useRouter } from "next/navigation";
 import { useInterviewStore } from "@/context/InterviewContext";
 import { api } from "@/lib/api";
-import type { InterviewResults } from "@/types";
+import type { InterviewResults, ProvisionalResults } from "@/types";
 import { ScoreRing } from "@/components/results/ScoreRing";
 import { CategoryBreakdown } from "@/components/results/CategoryBreakdown";
 import { AnswerReview } from "@/components/results/AnswerReview";
@@ -20,38 +20,61 @@ export default function ResultsPage() {
   const store = useInterviewStore();
   const sessionId = params.sessionId as string;
 
-  // Use results from store if available, else fetch
-  const [results, setResults] = useState<InterviewResults | null>(store.results);
-  const [loading, setLoading] = useState(!store.results);
+  // Use results from store if they belong to this session, else stream them in
+  const stored = store.results?.session_id === sessionId ? store.results : null;
+  const [results, setResults] = useState<InterviewResults | null>(stored);
+  const [loading, setLoading] = useState(!stored);
   const [error, setError] = useState<string | null>(null);
+  // Report fields streamed in while the evaluation is still being written
+  const [partial, setPartial] = useState<Partial<InterviewResults>>({});
+  // Scores estimated from the transcripts, shown until the real ones arrive
+  const [provisional, setProvisional] = useState<ProvisionalResults | null>(null);
+  // Bumped to wait for results again after resuming a failed evaluation
+  const [attempt, setAttempt] = useState(0);
 
   useEffect(() => {
-    if (store.results) {
-      setResults(store.results);
+    if (stored) {
+      setResults(stored);
       setLoading(false);
       return;
     }
 
-    // Poll until results ready
-    const interval = setInterval(async () => {
-      try {
-        const res = await api.getResults(sessionId);
-        if (res) {
-          clearInterval(interval);
-          setResults(res);
-          setLoading(false);
-        }
-      } catch (err) {
-        clearInterval(interval);
+    const controller = new AbortController();
+    api
+      .getProvisionalResults(sessionId)
+      .then((res) => {
+        if (!controller.signal.aborted) setProvisional(res);
+      })
+      .catch(() => {}); // the estimate is optional; the full report still loads
+    api
+      .waitForResults(sessionId, { signal: controller.signal, onPartial: setPartial })
+      .then((res) => {
+        setResults(res);
+        setLoading(false);
+      })
+      .catch((err) => {
         setError(err instanceof Error ? err.message : "Failed to load results");
         setLoading(false);
-      }
-    }, 2000);
+      });
+
+    return () => controller.abort();
+  }, [sessionId, stored, attempt]);
+
+  const resume = async () => {
+    try {
+      await api.resumeEvaluation(sessionId);
+      setError(null);
+      setPartial({});
+      setLoading(true);
+      setAttempt((n) => n + 1);
+    } catch (err) {
+      setError(err instanceof Error ? err.message : "Failed to resume evaluation");
+    }
+  };
 
-    return () => clearInterval(interval);
-  }, [sessionId, store.results]);
+  const streaming = loading && (Object.keys(partial).length > 0 || provisional !== null);
 
-  if (loading) {
+  if (loading && !streaming) {
     return (
       <main className="min-h-screen bg-gray-950 text-white flex items-center justify-center">
         <div className="text-center space-y-4">
@@ -63,19 +86,26 @@ export default function ResultsPage() {
     );
   }
 
-  if (error || !results) {
+  if (error || (!results && !streaming)) {
     return (
       <main className="min-h-screen bg-gray-950 text-white flex items-center justify-center">
         <div className="text-center space-y-4">
           <div className="text-5xl">❌</div>
           <h2 className="text-2xl font-bold">Failed to load results</h2>
           <p className="text-gray-400">{error}</p>
-          <Button onClick={() => router.push("/setup")}>Try Again</Button>
+          <div className="flex justify-center gap-3">
+            <Button variant="secondary" onClick={resume}>Retry Evaluation</Button>
+            <Button onClick={() => router.push("/setup")}>Try Again</Button>
+          </div>
         </div>
       </main>
     );
   }
 
+  const report: Partial<InterviewResults> = results ?? partial;
+  const categoryScores = report.category_scores ?? [];
+  const answerReviews = report.answer_reviews ?? [];
+
   return (
     <main className="min-h-screen bg-gray-950 text-white px-4 py-8">
       <div className="max-w-4xl mx-auto space-y-8">
@@ -90,17 +120,26 @@ export default function ResultsPage() {
         {/* Overall score */}
         <Card glass className="text-center space-y-2">
           <h1 className="text-3xl font-bold">Interview Complete!</h1>
-          <p className="text-gray-400">{results.summary}</p>
+          <p className="text-gray-400">{report.summary ?? "Writing your report..."}</p>
           <div className="flex justify-center py-4 relative">
-            <ScoreRing score={results.overall_score} grade={results.grade} size={180} />
+            {report.overall_score !== undefined && report.grade !== undefined ? (
+              <ScoreRing score={report.overall_score} grade={report.grade} size={180} />
+            ) : provisional ? (
+              <div className="space-y-2 opacity-60">
+                <ScoreRing score={provisional.overall_score} grade={provisional.grade} size={180} />
+                <p className="text-xs text-gray-400">Provisional estimate: final score on its way</p>
+              </div>
+            ) : (
+              <Spinner className="h-12 w-12" />
+            )}
           </div>
         </Card>
 
         {/* Category breakdown */}
-        {results.category_scores.length > 0 && (
+        {categoryScores.length > 0 && (
           <Card>
             <h2 className="font-semibold text-lg mb-4">Category Scores</h2>
-            <CategoryBreakdown categories={results.category_scores} />
+            <CategoryBreakdown categories={categoryScores} />
           </Card>
         )}
 
@@ -108,17 +147,17 @@ export default function ResultsPage() {
         <Card>
           <h2 className="font-semibold text-lg mb-4">Feedback & Resources</h2>
           <ImprovementTips
-            strengths={results.top_strengths}
-            improvements={results.top_improvements}
-            resources={results.recommended_resources}
+            strengths={report.top_strengths ?? []}
+            improvements={report.top_improvements ?? []}
+            resources={report.recommended_resources ?? []}
           />
         </Card>
 
         {/* Per-answer review */}
-        {results.answer_reviews.length > 0 && (
+        {answerReviews.length > 0 && (
           <Card>
             <h2 className="font-semibold text-lg mb-4">Answer Review</h2>
-            <AnswerReview answers={results.answer_reviews} />
+            <AnswerReview answers={answerReviews} />
           </Card>
         )}
 
@@ -118,18 +118,22 @@ export function useInterviewSession() {
     store.setLiveTranscript("");
 
     try {
-      const res = await api.respond({
+      let res = await api.respond({
         session_id: store.sessionId,
         question_id: store.currentQuestion.question_id,
         transcript,
         duration_seconds: store.elapsedSeconds,
       });
+      // The answer is saved; the next question is still being written
+      while (res.pending) {
+        res = await api.nextQuestion(store.sessionId);
+      }
 
       if (res.is_final || !res.next_question) {
         store.setSessionStatus("ending");
         await api.endInterview(store.sessionId);
         store.setSessionStatus("evaluating");
-        _pollForResults(store.sessionId);
+        _waitForResults(store.sessionId);
       } else {
         store.setCurrentQuestion(res.next_question, res.question_number!);
         store.setSessionStatus("active");
@@ -144,23 +148,12 @@ export function useInterviewSession() {
     }
   }, [store, stopListening, speakQuestion]);
 
-  const _pollForResults = useCallback(
+  const _waitForResults = useCallback(
     (sessionId: string) => {
-      const interval = setInterval(async () => {
-        try {
-          const results = await api.getResults(sessionId);
-          if (results) {
-            clearInterval(interval);
-            store.setResults(results);
-            router.push(`/results/${sessionId}`);
-          }
-        } catch {
-          clearInterval(interval);
-          store.setError("Failed to fetch results.");
-        }
-      }, 2000);
+      // The results page streams the report in as it is written
+      router.push(`/results/${sessionId}`);
     },
-    [store, router],
+    [router],
   );
 
   const endSessionEarly = useCallback(async () => {
@@ -172,12 +165,12 @@ export function useInterviewSession() {
         store.setSessionStatus("ending");
         await api.endInterview(store.sessionId);
         store.setSessionStatus("evaluating");
-        _pollForResults(store.sessionId);
+        _waitForResults(store.sessionId);
       } catch {
         store.setError("Failed to end session.");
       }
     }
-  }, [store, stopTTS, stopListening, _pollForResults]);
+  }, [store, stopTTS, stopListening, _waitForResults]);
 
   return { startSession, submitAnswer, startAnswering, endSessionEarly };
 }
@@ -5,6 +5,7 @@ import type {
   RespondRequest,
   RespondResponse,
   InterviewResults,
+  ProvisionalResults,
   TokenResponse,
   UserPublic,
   SessionSummary,
@@ -74,6 +75,9 @@ export const api = {
       body: JSON.stringify(payload),
     }),
 
+  nextQuestion: async (sessionId: string): Promise<RespondResponse> =>
+    request<RespondResponse>(`/api/interview/${sessionId}/next`),
+
   endInterview: async (sessionId: string): Promise<void> => {
     await request("/api/interview/end", {
       method: "POST",
@@ -82,6 +86,15 @@ export const api = {
     });
   },
 
+  /** Re-queue a failed evaluation; answers already scored are kept. */
+  resumeEvaluation: async (sessionId: string): Promise<void> => {
+    await request("/api/interview/resume", {
+      method: "POST",
+      headers: { "Content-Type": "application/json" },
+      body: JSON.stringify({ session_id: sessionId }),
+    });
+  },
+
   /** Returns null while evaluating (202), results when ready. */
   getResults: async (sessionId: string): Promise<InterviewResults | null> => {
     const res = await fetch(`${API_BASE}/api/interview/${sessionId}/results`, {
@@ -95,6 +108,77 @@ export const api = {
     return res.json() as Promise<InterviewResults>;
   },
 
+  getProvisionalResults: async (sessionId: string): Promise<ProvisionalResults> =>
+    request<ProvisionalResults>(`/api/interview/${sessionId}/results/provisional`),
+
+  /**
+   * Resolves as soon as results exist, pushed over server-sent events.
+   * While the report is being written, `onPartial` receives what is known so
+   * far (answer reviews first, then each report field).
+   * Falls back to polling getResults if the stream is unavailable or times out.
+   */
+  waitForResults: (
+    sessionId: string,
+    options: {
+      signal?: AbortSignal;
+      onPartial?: (partial: Partial<InterviewResults>) => void;
+    } = {},
+  ): Promise<InterviewResults> =>
+    new Promise((resolve, reject) => {
+      const { signal, onPartial } = options;
+      let partial: Partial<InterviewResults> = {};
+      let source: EventSource | undefined;
+      let timer: ReturnType<typeof setTimeout> | undefined;
+
+      const poll = async () => {
+        if (signal?.aborted) return;
+        try {
+          const results = await api.getResults(sessionId);
+          if (results) resolve(results);
+          else timer = setTimeout(poll, 2000);
+        } catch (err) {
+          reject(err);
+        }
+      };
+
+      signal?.addEventListener("abort", () => {
+        source?.close();
+        clearTimeout(timer);
+      });
+
+      if (typeof EventSource === "undefined") {
+        poll();
+        return;
+      }
+      source = new EventSource(`${API_BASE}/api/interview/${sessionId}/results/stream`);
+      source.addEventListener("answer_reviews", (e) => {
+        partial = { ...partial, answer_reviews: JSON.parse((e as MessageEvent).data) };
+        onPartial?.(partial);
+      });
+      source.addEventListener("field", (e) => {
+        const { field, value } = JSON.parse((e as MessageEvent).data);
+        partial = { ...partial, [field]: value };
+        onPartial?.(partial);
+      });
+      source.addEventListener("results", (e) => {
+        source?.close();
+        resolve(JSON.parse((e as MessageEvent).data) as InterviewResults);
+      });
+      source.addEventListener("timeout", () => {
+        source?.close();
+        poll();
+      });
+      source.addEventListener("error", (e) => {
+        source?.close();
+        const data = (e as MessageEvent).data;
+        if (data) {
+          reject(new ApiError(500, JSON.parse(data).detail ?? "Evaluation failed"));
+        } else {
+          poll(); // transport error, not an `error` event from the server
+        }
+      });
+    }),
+
   // ── Auth ─────────────────────────────────────────────────────────────────────
   auth: {
     register: (email: string, password: string, displayName?: string): Promise<TokenResponse> =>
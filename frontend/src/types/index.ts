@@ -106,6 +106,8 @@ export interface RespondResponse {
   question_number?: number;
   total_questions?: number;
   is_final: boolean;
+  /** Answer recorded, next question still being generated: poll api.nextQuestion. */
+  pending?: boolean;
 }
 
 // ── Results Types ────────────────────────────────────────────────────────────
@@ -132,6 +134,28 @@ export interface Resource {
   description: string;
 }
 
+export interface ProvisionalAnswerScore {
+  question_id: string;
+  question_text: string;
+  category?: string;
+  score: number;
+  final: boolean;
+  word_count: number;
+  words_per_minute?: number;
+  filler_ratio: number;
+  structure_coverage: number;
+  hint_overlap?: number;
+}
+
+/** Scores estimated from the transcripts while the evaluation runs. */
+export interface ProvisionalResults {
+  session_id: string;
+  status: SessionStatus;
+  overall_score: number;
+  grade: string;
+  answers: ProvisionalAnswerScore[];
+}
+
 export interface InterviewResults {
   session_id: string;
   overall_score: number;